@@ -0,0 +1,186 @@
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+
+COLUNAS_SENTIMENTO = ["sent_vader_score_titulo",
+                      "sent_vader_label_titulo",
+                      "sent_lexical_score_titulo",
+                      "sent_lexical_label_titulo",
+                      "sent_lexical_score_conteudo",
+                      "sent_lexical_label_conteudo",
+                      "sent_bert_score_conteudo",
+                      "sent_bert_label_conteudo",
+                      "sent_score_final"]
+
+TIPOS_SENTIMENTO = {"id": "integer",
+                    "sentimento": "text",
+                    **{c: "double precision" if "score" in c else "text"
+                       for c in COLUNAS_SENTIMENTO}}
+
+# analisador do processo worker (carregado uma vez, no initializer)
+_analisador = None
+
+
+def _inicializar_worker(opcoes):
+    """
+    Carrega os modelos uma única vez por processo do pool.
+    """
+    global _analisador
+
+    from analysis.lexical_parser import LexicalParser
+    from analysis.sentiment_analysis import SentimentAnalyzer
+
+    logger = logging.getLogger(__name__)
+    _analisador = SentimentAnalyzer(
+        logger,
+        db=None,
+        lexical_parser=LexicalParser(logger),
+        **opcoes)
+
+
+def _pontuar_bloco(bloco):
+    """
+    Pontua um bloco [(id, titulo, descricao)] e devolve as linhas
+    (id, sentimento, *COLUNAS_SENTIMENTO) prontas para o UPDATE.
+    """
+    resultados = _analisador.analisar_lote(
+        [{"titulo": titulo, "conteudo": descricao}
+         for _, titulo, descricao in bloco])
+
+    linhas = []
+    for (id_noticia, _, _), resultado in zip(bloco, resultados):
+        valores = [resultado[c] for c in COLUNAS_SENTIMENTO]
+        linhas.append((id_noticia, resultado["sent_label_final"],
+                       *[float(v) if isinstance(v, (int, float))
+                         and not isinstance(v, bool) else v
+                         for v in valores]))
+    return linhas
+
+
+class BackfillSentimento():
+    """
+    Etapa de sentimento: lê as notícias ainda sem `sentimento` de
+    silver.noticias por um cursor no servidor, pontua os blocos em um
+    pool de processos (cada worker carrega os modelos uma vez) e grava
+    os resultados com UPDATE ... FROM VALUES, um commit por bloco.
+
+    É retomável: só linhas com sentimento IS NULL são lidas, e cada
+    bloco gravado deixa de ser pendente.
+    """
+
+    def __init__(self,
+                 logger,
+                 db,
+                 max_workers=2,
+                 tamanho_bloco=256,
+                 usar_bert=True,
+                 backend_bert="fp32",
+                 tamanho_lote_bert=16):
+        self.logger = logger
+        self.db = db
+        self.max_workers = max_workers
+        self.tamanho_bloco = tamanho_bloco
+
+        # divide os núcleos entre os workers, sem sobreassinatura
+        self.opcoes = {
+            "usar_bert": usar_bert,
+            "backend_bert": backend_bert,
+            "tamanho_lote_bert": tamanho_lote_bert,
+            "num_threads": max(1, (os.cpu_count() or 1) // max_workers)}
+
+    def _gravar(self, linhas):
+        return self.db.atualizar_lote(
+            "silver.noticias",
+            ["id", "sentimento", *COLUNAS_SENTIMENTO],
+            linhas,
+            chave=["id"],
+            tipos=TIPOS_SENTIMENTO)
+
+    def executar(self, limite=None):
+        """
+        Pontua as notícias pendentes (até `limite`, se informado).
+
+        Blocos que falham (na pontuação ou na gravação) continuam com
+        sentimento IS NULL e são contados e reportados ao final.
+
+        Returns
+        -------
+            int: número de notícias gravadas.
+        """
+        query = """SELECT id, titulo, descricao FROM silver.noticias
+        WHERE sentimento IS NULL ORDER BY id"""
+        if limite:
+            query += f" LIMIT {int(limite)}"
+
+        inicio = time.perf_counter()
+        gravadas = 0
+        falhas = 0
+        # futuro -> número de notícias do bloco
+        pendentes = {}
+
+        def concluir(futuros):
+            nonlocal gravadas, falhas
+            for futuro in futuros:
+                tamanho = pendentes.pop(futuro)
+                try:
+                    linhas = futuro.result()
+                except Exception as e:
+                    falhas += tamanho
+                    self.logger.error(
+                        f"Falha ao pontuar um bloco de {tamanho} "
+                        f"notícias: {e}")
+                    continue
+
+                if self._gravar(linhas) is False:
+                    falhas += len(linhas)
+                    self.logger.error(
+                        f"Falha ao gravar o sentimento de {len(linhas)} "
+                        "notícias.")
+                else:
+                    gravadas += len(linhas)
+                    decorrido = time.perf_counter() - inicio
+                    self.logger.info(
+                        f"Sentimento: {gravadas} notícias gravadas "
+                        f"({gravadas / max(decorrido, 1e-9):.1f} "
+                        "notícias/s)")
+
+        # spawn: os workers não herdam as conexões nem o estado do torch
+        with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_inicializar_worker,
+                initargs=(self.opcoes,)) as executor:
+
+            with self.db.cursor_servidor(
+                    query, nome="backfill_sentimento",
+                    itersize=self.tamanho_bloco) as cursor:
+
+                while bloco := cursor.fetchmany(self.tamanho_bloco):
+                    futuro = executor.submit(
+                        _pontuar_bloco, [tuple(linha) for linha in bloco])
+                    pendentes[futuro] = len(bloco)
+
+                    # limita os blocos em memória a dois por worker
+                    if len(pendentes) >= self.max_workers * 2:
+                        feitos, _ = wait(
+                            pendentes, return_when=FIRST_COMPLETED)
+                        concluir(feitos)
+
+            feitos, _ = wait(pendentes)
+            concluir(feitos)
+
+        decorrido = time.perf_counter() - inicio
+        self.logger.info(
+            f"Backfill de sentimento finalizado: {gravadas} notícias em "
+            f"{decorrido:.0f}s ({gravadas / max(decorrido, 1e-9):.1f} "
+            "notícias/s).")
+
+        if falhas:
+            self.logger.warning(
+                f"Sentimento: {falhas} notícias falharam e continuam "
+                "pendentes para a próxima execução.")
+
+        return gravadas
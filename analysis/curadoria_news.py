@@ -1,22 +1,42 @@
+import hashlib
+import os
 import spacy
 import unicodedata
 import re
-from fuzzywuzzy import fuzz
-from utils.json_loader import carregar_lista_json
+import numpy as np
+from utils.config_registry import registro_config
+from utils.automato_termos import AutomatoTermos
 
 
 class Curadoria():
     def __init__(self,
                  logger,
                  db,
-                 table_checker):
+                 table_checker,
+                 dir_cache="cache/vetores_base",
+                 batch_size=64,
+                 n_process=1):
         self.logger = logger
         self.db = db
         self.table_checker = table_checker
-        self.sin_dict = carregar_lista_json("config/sinonimos_empresas.json")
-        self.base_news = carregar_lista_json("config/textos_base.json")
+        self.sin_dict = registro_config.sinonimos()
+        self.base_news = registro_config.textos_base()
         self.news_data = spacy.load("pt_core_news_md")
+        self.dir_cache = dir_cache
+        self.batch_size = batch_size
+        self.n_process = n_process
 
+        # um automato de sinônimos por empresa
+        self._automatos = {}
+        for termos in self.sin_dict.values():
+            self._automato(termos)
+
+        # vetores dos textos de referência: texto -> vetor normalizado
+        self.vetores_base = {}
+        for texto in self.base_news.values():
+            self._vetor_base(texto)
+
+    @staticmethod
     def _limpar_texto(
         texto: str
     ) -> str:
@@ -30,24 +50,81 @@ class Curadoria():
 
         return texto.lower()
 
+    @staticmethod
+    def _normalizar(vetor):
+        norma = np.linalg.norm(vetor)
+        return vetor / norma if norma else vetor
+
+    def _versao_modelo(self):
+        meta = self.news_data.meta
+        return f"{meta['lang']}_{meta['name']}-{meta['version']}"
+
+    def _vetor_base(self, noticia_base: str):
+        """
+        Vetor normalizado de um texto de referência. É calculado uma
+        única vez e guardado em disco (np.save), com chave na versão do
+        modelo e no hash do texto; depois fica em memória.
+        """
+        vetor = self.vetores_base.get(noticia_base)
+
+        if vetor is not None:
+            return vetor
+
+        texto_limpo = self._limpar_texto(noticia_base)
+        hash_texto = hashlib.sha256(texto_limpo.encode("utf-8")).hexdigest()
+        caminho = os.path.join(
+            self.dir_cache, f"{self._versao_modelo()}_{hash_texto}.npy")
+
+        try:
+            vetor = np.load(caminho)
+        except (OSError, ValueError):
+            vetor = self._normalizar(
+                self.news_data.make_doc(texto_limpo).vector)
+            try:
+                os.makedirs(self.dir_cache, exist_ok=True)
+                np.save(caminho, vetor)
+            except OSError as e:
+                self.logger.warning(
+                    f"Não foi possível gravar o cache de vetores: {e}")
+
+        self.vetores_base[noticia_base] = vetor
+        return vetor
+
     def _verificar_relevancia_semantica(
         self,
         noticia_nova: str,
         noticia_base: str
     ) -> float:
-
-        nlp = self.news_data
-
+        """
+        Similaridade de cosseno entre a notícia (já limpa) e o texto de
+        referência, cujo vetor vem pré-calculado de _vetor_base().
+        """
         try:
-            doc1 = nlp(noticia_nova)
-            doc2 = nlp(noticia_base)
-            return doc1.similarity(doc2)
+            # só o tokenizador: o vetor do documento é a média dos
+            # vetores estáticos, sem depender dos demais componentes
+            vetor_nova = self._normalizar(
+                self.news_data.make_doc(noticia_nova).vector)
+            return float(np.dot(vetor_nova, self._vetor_base(noticia_base)))
 
         except Exception as e:
             self.logger.info(
                 f"Erro ao calcular similaridade semântica: {e}")
             raise
 
+    def _automato(self, palavras_chave):
+        """
+        Automato de Aho-Corasick dos sinônimos de uma empresa, construído
+        uma única vez por lista de termos (normalizados como o texto).
+        """
+        chave = tuple(palavras_chave or ())
+        automato = self._automatos.get(chave)
+
+        if automato is None:
+            automato = AutomatoTermos(chave, normalizar=self._limpar_texto)
+            self._automatos[chave] = automato
+
+        return automato
+
     def _verificar_relevancia_titulo(
         self,
         titulo: str,
@@ -55,7 +132,8 @@ class Curadoria():
     ):
         try:
             titulo = self._limpar_texto(titulo)
-            return any(term.lower() in titulo for term in palavras_chave)
+            return self._automato(palavras_chave).contem(
+                titulo, palavra_inteira=False)
 
         except Exception as e:
             self.logger.info(
@@ -70,10 +148,9 @@ class Curadoria():
     ) -> bool:
         try:
             if isinstance(noticia_nova, str):
-                texto_splitado = noticia_nova.lower().split()
-                total_palavras = len(noticia_nova.lower().split())
-                ocorrencias = sum(texto_splitado.count(term.lower())
-                                  for term in palavras_chave)
+                texto = noticia_nova.lower()
+                total_palavras = len(texto.split())
+                ocorrencias = self._automato(palavras_chave).contar(texto)
                 freq_relativa = ocorrencias / max(total_palavras, 1)
 
                 return freq_relativa >= limite
@@ -88,9 +165,9 @@ class Curadoria():
             self,
     ):
 
-        termos = carregar_lista_json("config/sinonimos_empresas.json")
-        noticias = carregar_lista_json("config/noticias_teste.json")
-        base_ref = carregar_lista_json("config/textos_base.json")
+        termos = self.sin_dict
+        noticias = registro_config.noticias_teste()
+        base_ref = self.base_news
 
         for i, noticia in enumerate(noticias):
             self.logger.info(f"\n🔎 Notícia {i+1}: {noticia['titulo']}")
@@ -116,54 +193,101 @@ class Curadoria():
         try:
             noticia_nova_limpa = self._limpar_texto(noticia_nova)
 
-            noticia_base_limpa = self._limpar_texto(noticia_base)
-
             relevante_por_termos = self._verificar_relevancia_termos(
                 noticia_nova=noticia_nova_limpa, palavras_chave=termos_empresa)
 
             relevancia_semantica = self._verificar_relevancia_semantica(
-                noticia_nova_limpa, noticia_base_limpa)
+                noticia_nova_limpa, noticia_base)
 
             titulo_relevante = self._verificar_relevancia_titulo(
                 titulo=titulo, palavras_chave=termos_empresa)
 
-            condicao1 = ((titulo_relevante and relevante_por_termos)
-                         and relevancia_semantica > 0.60)
-            condicao2 = ((titulo_relevante or relevante_por_termos)
-                         and relevancia_semantica > 0.85)
-            condicao3 = (not (titulo_relevante or relevante_por_termos)
-                         and relevancia_semantica > 0.90)
-
-            if condicao1:
-                return True
-
-            elif condicao2:
-                return True
-
-            elif condicao3:
-                return True
-
-            else:
-                return False
+            return self._decidir_relevancia(
+                titulo_relevante, relevante_por_termos, relevancia_semantica)
 
         except Exception as e:
             print(
                 f"Houve um problema ao verificar a relevância da notícia {e}")
 
-    def _titulos_sao_similares(
+    @staticmethod
+    def _decidir_relevancia(
+        titulo_relevante: bool,
+        relevante_por_termos: bool,
+        relevancia_semantica: float
+    ) -> bool:
+
+        condicao1 = ((titulo_relevante and relevante_por_termos)
+                     and relevancia_semantica > 0.60)
+        condicao2 = ((titulo_relevante or relevante_por_termos)
+                     and relevancia_semantica > 0.85)
+        condicao3 = (not (titulo_relevante or relevante_por_termos)
+                     and relevancia_semantica > 0.90)
+
+        return bool(condicao1 or condicao2 or condicao3)
+
+    def noticias_relevantes(
         self,
-        titulo1,
-        titulo2,
-        limite=80
-    ):
-        try:
-            if isinstance(titulo1, str) and isinstance(titulo2, str):
-                return fuzz.token_set_ratio(titulo1.lower(),
-                                            titulo2.lower()) > limite
+        batch: list,
+        termos_empresa: list,
+        noticia_base: str,
+        batch_size: int = None,
+        n_process: int = None
+    ) -> list:
+        """
+        Versão em lote de noticia_e_relevante.
+
+        As notícias ({'titulo', 'corpo'}) passam por nlp.pipe com todos
+        os componentes desligados (só o vetor do documento é usado), e a
+        similaridade com o texto de referência é calculada de uma vez
+        para o lote.
+
+        Returns
+        -------
+            list[bool]: máscara de relevância, na ordem do lote.
+        """
+        batch_size = batch_size or self.batch_size
+        n_process = n_process or self.n_process
+
+        mascara = [False] * len(batch)
+        indices = []
+        textos = []
+
+        for i, noticia in enumerate(batch):
+            corpo = noticia.get("corpo")
+            if isinstance(corpo, str) and corpo.strip():
+                indices.append(i)
+                textos.append(self._limpar_texto(corpo))
+
+        if not textos:
+            return mascara
 
-            return False
+        try:
+            vetores = np.vstack([
+                doc.vector for doc in self.news_data.pipe(
+                    textos,
+                    batch_size=batch_size,
+                    n_process=n_process,
+                    disable=self.news_data.pipe_names)])
+
+            normas = np.linalg.norm(vetores, axis=1)
+            normas[normas == 0] = 1
+            similaridades = (vetores / normas[:, None]) @ self._vetor_base(
+                noticia_base)
 
         except Exception as e:
             self.logger.error(
-                f"Problema ao testar a similaridades dos títulos: {e}")
+                f"Erro ao calcular a relevância do lote: {e}")
             raise
+
+        for i, texto, relevancia_semantica in zip(
+                indices, textos, similaridades):
+            titulo = batch[i].get("titulo") or ""
+
+            mascara[i] = self._decidir_relevancia(
+                bool(titulo) and self._verificar_relevancia_titulo(
+                    titulo=titulo, palavras_chave=termos_empresa),
+                bool(self._verificar_relevancia_termos(
+                    noticia_nova=texto, palavras_chave=termos_empresa)),
+                float(relevancia_semantica))
+
+        return mascara
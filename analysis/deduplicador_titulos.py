@@ -0,0 +1,34 @@
+from rapidfuzz import fuzz, process, utils
+
+
+class DeduplicadorTitulos():
+    """
+    Deduplicação de títulos em lote com rapidfuzz (C++).
+
+    Um título novo é pontuado contra todos os títulos conhecidos em uma
+    única chamada vetorizada (`cdist`), com score_cutoff descartando os
+    pares abaixo do limite.
+    """
+
+    def __init__(self,
+                 limite=80,
+                 scorer=fuzz.token_set_ratio):
+        self.limite = limite
+        self.scorer = scorer
+
+    def similares(self, titulo, titulos) -> list:
+        """
+        Índices dos títulos com similaridade acima do limite.
+        """
+        if not isinstance(titulo, str) or not titulos:
+            return []
+
+        scores = process.cdist(
+            [titulo],
+            titulos,
+            scorer=self.scorer,
+            processor=utils.default_process,
+            score_cutoff=self.limite,
+            workers=-1)[0]
+
+        return [i for i, score in enumerate(scores) if score > self.limite]
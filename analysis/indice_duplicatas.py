@@ -0,0 +1,201 @@
+import re
+import threading
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+
+class IndiceDuplicatas():
+    """
+    Índice de quase-duplicatas de notícias baseado em MinHash + LSH.
+
+    Cada texto vira um conjunto de shingles (n-gramas de palavras), do
+    qual se extrai uma assinatura MinHash de `num_perm` valores. A
+    assinatura é dividida em `bandas` faixas; textos que coincidem em
+    ao menos uma faixa caem no mesmo bucket e viram candidatos. Assim a
+    busca é sub-linear no histórico e a similaridade exata só precisa
+    ser calculada para os candidatos.
+
+    As assinaturas são persistidas em silver.noticias_minhash, ao lado
+    de silver.noticias, e recarregadas com carregar().
+    """
+
+    # primo de Mersenne 2^31 - 1: (a * x + b) cabe folgado em uint64
+    PRIMO = np.uint64((1 << 31) - 1)
+
+    def __init__(self,
+                 logger,
+                 num_perm=128,
+                 bandas=32,
+                 tamanho_shingle=3,
+                 semente=42):
+        if num_perm % bandas != 0:
+            raise ValueError("num_perm deve ser múltiplo de bandas.")
+
+        self.logger = logger
+        self.num_perm = num_perm
+        self.bandas = bandas
+        self.linhas_banda = num_perm // bandas
+        self.tamanho_shingle = tamanho_shingle
+
+        gerador = np.random.default_rng(semente)
+        self._a = gerador.integers(
+            1, int(self.PRIMO), size=num_perm, dtype=np.uint64)
+        self._b = gerador.integers(
+            0, int(self.PRIMO), size=num_perm, dtype=np.uint64)
+
+        # (grupo, banda, faixa da assinatura) -> ids
+        self._buckets = defaultdict(list)
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._total
+
+    def _shingles(self, texto: str) -> set:
+        palavras = re.findall(r"\w+", texto.lower())
+        n = self.tamanho_shingle
+
+        if len(palavras) <= n:
+            return {" ".join(palavras)} if palavras else set()
+
+        return {" ".join(palavras[i:i + n])
+                for i in range(len(palavras) - n + 1)}
+
+    def assinatura(self, texto: str):
+        """
+        Assinatura MinHash (np.ndarray de num_perm inteiros) do texto.
+        """
+        shingles = self._shingles(texto)
+
+        if not shingles:
+            return None
+
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles),
+            dtype=np.uint64, count=len(shingles)) % self.PRIMO
+
+        permutados = (np.outer(self._a, hashes)
+                      + self._b[:, None]) % self.PRIMO
+
+        return permutados.min(axis=1)
+
+    def _chaves(self, assinatura, grupo):
+        faixas = assinatura.astype(np.uint32).reshape(
+            self.bandas, self.linhas_banda)
+        return [(grupo, i, faixa.tobytes()) for i, faixa in enumerate(faixas)]
+
+    def adicionar(self, id_noticia, assinatura, grupo=None):
+        """
+        Indexa a assinatura de uma notícia já gravada.
+        """
+        if assinatura is None:
+            return
+
+        with self._lock:
+            for chave in self._chaves(np.asarray(assinatura), grupo):
+                self._buckets[chave].append(id_noticia)
+            self._total += 1
+
+    def candidatos(self, assinatura, grupo=None) -> set:
+        """
+        Ids das notícias que compartilham ao menos um bucket LSH.
+        """
+        if assinatura is None:
+            return set()
+
+        with self._lock:
+            encontrados = set()
+            for chave in self._chaves(assinatura, grupo):
+                encontrados.update(self._buckets.get(chave, ()))
+            return encontrados
+
+    def assinar_historico(self, db, camada="silver",
+                          tabela="noticias_minhash", tamanho_bloco=1000):
+        """
+        Assina e persiste as notícias de silver.noticias que ainda não
+        têm assinatura (o histórico anterior ao índice), lidas em blocos
+        por um cursor no servidor.
+
+        Returns
+        -------
+            int: número de assinaturas gravadas.
+        """
+        query = f"""SELECT n.id, n.cod_bolsa, n.descricao
+        FROM {camada}.noticias AS n
+        LEFT JOIN {camada}.{tabela} AS m ON m.id_noticia = n.id
+        WHERE m.id_noticia IS NULL
+        AND n.descricao IS NOT NULL
+        AND n.descricao <> 'texto_indisponivel'
+        ORDER BY n.id"""
+
+        gravadas = 0
+
+        with db.cursor_servidor(query, nome="assinar_historico",
+                                itersize=tamanho_bloco) as cursor:
+            while bloco := cursor.fetchmany(tamanho_bloco):
+                itens = [(id_noticia, self.assinatura(texto), cod_bolsa)
+                         for id_noticia, cod_bolsa, texto in bloco]
+
+                if self.persistir(db, itens, camada, tabela) is False:
+                    self.logger.error(
+                        "Falha ao gravar as assinaturas do histórico.")
+                    break
+
+                gravadas += sum(a is not None for _, a, _ in itens)
+
+        if gravadas:
+            self.logger.info(
+                f"Histórico de notícias assinado: {gravadas} notícias.")
+
+        return gravadas
+
+    def carregar(self, db, camada="silver", tabela="noticias_minhash"):
+        """
+        Reconstrói os buckets a partir das assinaturas persistidas,
+        assinando antes as notícias do histórico que ainda não têm.
+        """
+        self.assinar_historico(db, camada, tabela)
+
+        dados = db.fetch_data(
+            query=f"""SELECT id_noticia, cod_bolsa, assinatura
+            FROM {camada}.{tabela};""",
+            tipo_fetch="all")
+
+        for id_noticia, cod_bolsa, assinatura in dados or []:
+            if len(assinatura) == self.num_perm:
+                self.adicionar(
+                    id_noticia,
+                    np.asarray(assinatura, dtype=np.uint64),
+                    cod_bolsa)
+
+        self.logger.info(
+            f"Índice de duplicatas carregado: {self._total} notícias.")
+
+    def persistir(self, db, itens, camada="silver",
+                  tabela="noticias_minhash", commit=True):
+        """
+        Grava, em um único upsert, as assinaturas de um lote de notícias
+        (idempotente).
+
+        Parameters
+        ----------
+        itens : list[tuple]
+            Tuplas (id_noticia, assinatura, grupo); assinaturas None são
+            ignoradas.
+
+        Returns
+        -------
+            int or bool: linhas enviadas, ou False em caso de erro.
+        """
+        linhas = [(id_noticia, grupo, [int(v) for v in assinatura])
+                  for id_noticia, assinatura, grupo in itens
+                  if assinatura is not None]
+
+        return db.upsert(
+            f"{camada}.{tabela}",
+            ["id_noticia", "cod_bolsa", "assinatura"],
+            linhas,
+            chave=["id_noticia"],
+            commit=commit)
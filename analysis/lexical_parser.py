@@ -1,5 +1,5 @@
-import re
-from utils.json_loader import carregar_lista_json
+from utils.config_registry import registro_config
+from analysis.motor_lexico import MotorLexico
 
 
 class LexicalParser:
@@ -15,6 +15,12 @@ class LexicalParser:
         self.negadores = self._carregar_palavras(qual="negadores")
         self.inversores = self._carregar_palavras(qual="inversores")
 
+        self.motor = MotorLexico(
+            positivos=self.termos_positivos or set(),
+            negativos=self.termos_negativos or set(),
+            negadores=self.negadores or set(),
+            inversores=self.inversores or set())
+
     def _carregar_palavras(
         self,
         qual: str
@@ -22,46 +28,12 @@ class LexicalParser:
 
         try:
 
-            termos = carregar_lista_json("config/palavras.json")
-
-            return set(termos.get(qual, []))
+            return set(registro_config.lexico().get(qual, ()))
 
         except Exception as e:
             self.logger.error(f"""Não foi possível carregar os
                               termos de avaliação: {qual}, erro: {e}""")
 
-    def _detectar_negacao(
-        self,
-        texto: str,
-        termo: str
-    ) -> bool:
-
-        try:
-            negadores_regex = "|".join(map(re.escape, self.negadores))
-            padrao = rf"({negadores_regex})\s+{re.escape(termo)}"
-
-            return re.search(padrao, texto)
-        except Exception as e:
-            self.logger.error(f"Erro ao avaliar a negação: {e}")
-
-    def _avaliar_inversao_contexto(
-        self,
-        texto: str,
-    ) -> int:
-
-        texto = texto.lower()
-
-        for inversor in self.inversores:
-            if inversor in texto:
-                partes = texto.split(inversor, 1)
-                if len(partes) == 2:
-                    score1, _ = self.analisar_texto(partes[0])
-                    score2, _ = self.analisar_texto(partes[1])
-                    if score1 * score2 < 0:
-                        if abs(score2) > abs(score1):
-                            return 1 if score2 > 0 else -1
-        return 0
-
     def _classifica_label(
         self,
         score: float
@@ -78,25 +50,8 @@ class LexicalParser:
         self,
         texto: str
     ) -> float:
-        texto = texto.lower()
-        score = 0
-
         try:
-            for termo in self.termos_positivos:
-                if re.search(rf"\b{re.escape(termo)}\b", texto):
-                    score += -1 if self._detectar_negacao(texto, termo) else 1
-                    self.logger.debug(
-                        f"""Termo positivo detectado: {termo},
-                        score atual: {score}""")
-
-            for termo in self.termos_negativos:
-                if re.search(rf"\b{re.escape(termo)}\b", texto):
-                    score += 1 if self._detectar_negacao(texto, termo) else -1
-                    self.logger.debug(
-                        f"""Termo negativo detectado: {termo},
-                        score atual: {score}""")
-
-            return self._classifica_label(score)
+            return self._classifica_label(self.motor.analise_lexica(texto))
 
         except Exception as e:
             self.logger.error(f"""Falha ao avaliar os sentimentos do texto:
@@ -108,12 +63,8 @@ class LexicalParser:
     ) -> tuple:
 
         try:
-            texto = texto.lower()
-            score, label = self._analise_lexica(texto)
-            adjust = self._avaliar_inversao_contexto(texto)
-            score += adjust * 0.5
-
-            return self._classifica_label(score)
+            # termos, negação e inversores em uma única passada
+            return self._classifica_label(self.motor.pontuar(texto))
 
         except Exception as e:
             self.logger.error(f"""Falha ao obter o resultado
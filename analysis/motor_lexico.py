@@ -0,0 +1,143 @@
+from bisect import bisect_left
+
+from utils.automato_termos import AutomatoTermos
+
+
+def _e_palavra(caractere):
+    return caractere.isalnum() or caractere == "_"
+
+
+class MotorLexico():
+    """
+    Motor léxico compilado: um único automato (Aho-Corasick) com os
+    termos positivos, negativos, negadores e inversores localiza todas
+    as ocorrências do texto em uma só passada. A pontuação, a negação e
+    a divisão pelos inversores são resolvidas sobre essa lista de
+    ocorrências, sem novas buscas no texto.
+
+    Reproduz exatamente as regras do LexicalParser original:
+        - um termo conta uma vez se aparecer como palavra inteira
+          (equivalente a \\b{termo}\\b), e inverte o sinal se houver,
+          em qualquer ponto do trecho, um negador seguido de espaços e
+          do termo (equivalente a ({negadores})\\s+{termo});
+        - o primeiro inversor presente (na ordem do conjunto) que divida
+          o trecho em partes de sinais opostos ajusta o score em ±0.5,
+          conforme a parte de maior intensidade; as partes são avaliadas
+          recursivamente pelas mesmas regras.
+    """
+
+    def __init__(self, positivos, negativos, negadores, inversores):
+        self.positivos = positivos
+        self.negativos = negativos
+        self.negadores = negadores
+        # a ordem de iteração dos inversores define qual divide o texto
+        self.inversores = list(inversores)
+
+        self._automato = AutomatoTermos(
+            [*positivos, *negativos, *negadores, *self.inversores])
+
+    def _preparar(self, texto):
+        ocorrencias = list(self._automato.ocorrencias(
+            texto, palavra_inteira=False))
+
+        inicios = {}
+        # fim do negador -> maior início entre os que terminam ali
+        negadores = {}
+
+        for inicio, fim, termo in ocorrencias:
+            inicios.setdefault(termo, []).append(inicio)
+            if termo in self.negadores:
+                negadores[fim] = max(negadores.get(fim, -1), inicio)
+
+        # espacos[i]: início da sequência de espaços que termina em i
+        espacos = [0] * (len(texto) + 1)
+        for i, caractere in enumerate(texto, start=1):
+            espacos[i] = espacos[i - 1] if caractere.isspace() else i
+
+        return {
+            "texto": texto,
+            "palavra": [_e_palavra(c) for c in texto],
+            "ocorrencias": ocorrencias,
+            "inicios": inicios,
+            "negadores": negadores,
+            "espacos": espacos,
+            "memo": {}
+        }
+
+    def _palavra_inteira(self, ctx, inicio, fim, a, b):
+        palavra = ctx["palavra"]
+
+        antes = palavra[inicio - 1] if inicio > a else False
+        depois = palavra[fim] if fim < b else False
+
+        return (antes != palavra[inicio]) and (palavra[fim - 1] != depois)
+
+    def _negado(self, ctx, termo, a, b):
+        negadores = ctx["negadores"]
+
+        for inicio in ctx["inicios"].get(termo, ()):
+            if inicio < a:
+                continue
+            if inicio + len(termo) > b:
+                break
+
+            for fim_negador in range(ctx["espacos"][inicio], inicio):
+                if negadores.get(fim_negador, -1) >= a:
+                    return True
+
+        return False
+
+    def _lexica(self, ctx, a, b):
+        encontrados = {termo for inicio, fim, termo in ctx["ocorrencias"]
+                       if a <= inicio and fim <= b
+                       and (termo in self.positivos
+                            or termo in self.negativos)
+                       and self._palavra_inteira(ctx, inicio, fim, a, b)}
+
+        score = 0
+        for termo in encontrados:
+            if termo in self.positivos:
+                score += -1 if self._negado(ctx, termo, a, b) else 1
+            if termo in self.negativos:
+                score += 1 if self._negado(ctx, termo, a, b) else -1
+
+        return score
+
+    def _inversao(self, ctx, a, b):
+        for inversor in self.inversores:
+            inicios = ctx["inicios"].get(inversor)
+            if not inicios:
+                continue
+
+            i = bisect_left(inicios, a)
+            if i == len(inicios) or inicios[i] + len(inversor) > b:
+                continue
+
+            score1 = self._pontuar(ctx, a, inicios[i])
+            score2 = self._pontuar(ctx, inicios[i] + len(inversor), b)
+
+            if score1 * score2 < 0:
+                if abs(score2) > abs(score1):
+                    return 1 if score2 > 0 else -1
+
+        return 0
+
+    def _pontuar(self, ctx, a, b):
+        if (a, b) not in ctx["memo"]:
+            ctx["memo"][(a, b)] = (self._lexica(ctx, a, b)
+                                   + self._inversao(ctx, a, b) * 0.5)
+        return ctx["memo"][(a, b)]
+
+    def analise_lexica(self, texto: str) -> int:
+        """
+        Score dos termos do texto, sem o ajuste pelos inversores.
+        """
+        texto = texto.lower()
+        return self._lexica(self._preparar(texto), 0, len(texto))
+
+    def pontuar(self, texto: str) -> float:
+        """
+        Score final do texto: termos, negação e ajuste dos inversores.
+        """
+        texto = texto.lower()
+        return self._pontuar(self._preparar(texto), 0, len(texto))
@@ -1,37 +1,198 @@
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from transformers import pipeline
+import hashlib
+import json
+import os
 import numpy as np
-from deep_translator import GoogleTranslator
+import torch
+from analysis.tradutor import TradutorCache, TradutorGoogle
+from utils.cache_disco import CacheCamadas, CacheDisco, CacheLRU
 
 
 class SentimentAnalyzer():
+
+    CAMINHO_MODELO = "models/lipaoMai"
+    BACKENDS_BERT = ("fp32", "int8")
+
+    # pesos de _combinar_resultados: [vader, léxico título,
+    # léxico conteúdo] e, com o BERT, [..., bert conteúdo]
+    PESOS_SEM_BERT = (0.15, 0.15, 0.7)
+    PESOS_COM_BERT = (0.1, 0.1, 0.6, 0.2)
+
+    # mudanças na lógica de análise que invalidam os resultados salvos
+    VERSAO_MEMO = 1
+
     def __init__(
             self,
             logger,
             db,
             lexical_parser=None,
-            usar_bert=True):
+            usar_bert=True,
+            tradutor=None,
+            num_threads=None,
+            tamanho_lote_bert=16,
+            backend_bert="fp32",
+            memoizar=True,
+            cache_resultados=None):
         self.logger = logger
         self.db = db
         self.lexical_parser = lexical_parser
         self.usar_berts = usar_bert
+        self.tamanho_lote_bert = tamanho_lote_bert
+
+        if backend_bert not in self.BACKENDS_BERT:
+            raise ValueError(
+                f"Backend inválido: {backend_bert}. "
+                f"Use um de {self.BACKENDS_BERT}.")
+        self.backend_bert = backend_bert
+
+        # threads intra-op do PyTorch (None = padrão do torch)
+        if num_threads:
+            torch.set_num_threads(num_threads)
+
+        # traduções pt -> en com cache persistente em disco
+        self.tradutor = tradutor or TradutorCache(TradutorGoogle("pt", "en"))
 
         self.vader = SentimentIntensityAnalyzer()
 
         if self.usar_berts:
             self.pipe_bert = pipeline(
                 "sentiment-analysis",
-                model="models/lipaoMai",
-                tokenizer="models/lipaoMai",
+                model=self.CAMINHO_MODELO,
+                tokenizer=self.CAMINHO_MODELO,
                 device=-1
             )
 
+            if self.backend_bert == "int8":
+                self.pipe_bert.model = self._modelo_int8(self.pipe_bert.model)
+
+        # resultados já calculados: LRU em memória + SQLite em disco
+        self.cache_resultados = None
+        if memoizar:
+            self.cache_resultados = (
+                cache_resultados if cache_resultados is not None
+                else CacheCamadas(
+                    CacheLRU(max_itens=10_000),
+                    CacheDisco("cache/sentimento.sqlite",
+                               max_itens=500_000)))
+        self.versao_memo = self._versao_memo()
+
+    def _versao_memo(self) -> str:
+        """
+        Impressão digital de tudo que determina o resultado de
+        analisar_noticia: léxico carregado, pesos do BERT (stat do
+        arquivo) e backend, pesos da combinação e tradutor. Qualquer
+        mudança gera novas chaves, invalidando os resultados antigos.
+        """
+        lexico = None
+        if self.lexical_parser:
+            lexico = {qual: sorted(getattr(self.lexical_parser, qual) or ())
+                      for qual in ("termos_positivos", "termos_negativos",
+                                   "negadores", "inversores")}
+
+        pesos_bert = None
+        if self.usar_berts:
+            pesos_bert = []
+            for nome in ("model.safetensors", "pytorch_model.bin"):
+                caminho = os.path.join(self.CAMINHO_MODELO, nome)
+                if os.path.exists(caminho):
+                    st = os.stat(caminho)
+                    pesos_bert.append([nome, st.st_mtime_ns, st.st_size])
+
+        backend_tradutor = getattr(self.tradutor, "backend", self.tradutor)
+
+        componentes = {
+            "versao": self.VERSAO_MEMO,
+            "lexico": lexico,
+            "bert": pesos_bert,
+            "backend_bert": self.backend_bert if self.usar_berts else None,
+            "pesos": [self.PESOS_SEM_BERT, self.PESOS_COM_BERT],
+            "tradutor": type(backend_tradutor).__name__
+        }
+
+        return hashlib.sha256(json.dumps(
+            componentes, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+    def _chave_memo(
+        self,
+        titulo: str,
+        conteudo: str
+    ) -> str:
+
+        entrada = json.dumps([self.versao_memo, titulo, conteudo])
+        return hashlib.sha256(entrada.encode("utf-8")).hexdigest()
+
+    def _versao_pesos(self) -> float:
+        """
+        Momento da última alteração dos pesos do modelo (mtime).
+        """
+        arquivos = [os.path.join(self.CAMINHO_MODELO, nome)
+                    for nome in os.listdir(self.CAMINHO_MODELO)
+                    if nome in ("model.safetensors", "pytorch_model.bin")]
+        return max((os.path.getmtime(a) for a in arquivos), default=0)
+
+    def _modelo_int8(
+        self,
+        modelo
+    ):
+        """
+        Versão do modelo com as camadas lineares quantizadas em int8
+        (quantização dinâmica do PyTorch), para inferência em CPU.
+
+        A estrutura é sempre montada com quantize_dynamic; os pesos int8
+        são gravados ao lado do modelo como state_dict e relidos com
+        weights_only=True (sem unpickle de objetos arbitrários). O
+        arquivo é refeito se os pesos originais forem mais novos.
+        """
+        caminho = os.path.join(self.CAMINHO_MODELO, "modelo_int8.pt")
+
+        def quantizar():
+            return torch.ao.quantization.quantize_dynamic(
+                modelo.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+
+        if (os.path.exists(caminho)
+                and os.path.getmtime(caminho) >= self._versao_pesos()):
+            try:
+                quantizado = quantizar()
+                quantizado.load_state_dict(
+                    torch.load(caminho, weights_only=True))
+                return quantizado
+
+            except Exception as e:
+                self.logger.warning(
+                    f"Não foi possível carregar o modelo int8: {e}")
+
+        self.logger.info("Quantizando o modelo BERT para int8...")
+        quantizado = quantizar()
+
+        try:
+            torch.save(quantizado.state_dict(), caminho)
+        except OSError as e:
+            self.logger.warning(
+                f"Não foi possível gravar o modelo int8: {e}")
+
+        return quantizado
+
     def _traduzir_para_ingles(
         self,
         texto: str
     ) -> str:
 
-        return GoogleTranslator(source='pt', target='en').translate(texto)
+        return self.tradutor.traduzir(texto)
+
+    def preparar_traducoes(
+        self,
+        textos: list
+    ):
+        """
+        Traduz antecipadamente, em chamadas em lote, os textos que ainda
+        não estão no cache (ex.: todos os títulos de um backfill).
+        """
+        try:
+            self.tradutor.traduzir_lote(textos)
+
+        except Exception as e:
+            self.logger.error(f"Erro ao preparar as traduções: {e}")
 
     def _analisar_vader(
         self,
@@ -69,6 +230,90 @@ class SentimentAnalyzer():
 
             return None, 'neutro'
 
+    def _rotulo_bert(
+        self,
+        label: str,
+        score: float
+    ) -> tuple:
+
+        label = label.lower()
+
+        if label == "label_0":  # negativo
+            return -score, "negativo"
+        elif label == "label_1":  # positivo
+            return score, "positivo"
+
+        return score, label
+
+    def _max_tokens(
+        self,
+        pipe
+    ) -> int:
+
+        # alguns tokenizers não declaram o limite (valor sentinela)
+        limite = pipe.tokenizer.model_max_length
+        if not limite or limite > 100_000:
+            limite = getattr(
+                pipe.model.config, "max_position_embeddings", 512)
+        return limite
+
+    def _analisar_bert_lote(
+        self,
+        textos: list,
+        pipe=None
+    ) -> list:
+        """
+        Classifica vários textos com o BERT em lotes.
+
+        Os textos são tokenizados uma vez, truncados no limite de tokens
+        do modelo, e agrupados por tamanho (ordenados pelo número de
+        tokens) para que cada lote tenha o mínimo de padding. Os
+        resultados voltam na ordem de entrada.
+        """
+        pipe = pipe or self.pipe_bert
+        resultados = [(None, 'neutro')] * len(textos)
+
+        indices = [i for i, texto in enumerate(textos)
+                   if isinstance(texto, str) and texto.strip()]
+        if not indices:
+            return resultados
+
+        try:
+            tokenizer = pipe.tokenizer
+            modelo = pipe.model
+
+            codificados = tokenizer(
+                [textos[i] for i in indices],
+                truncation=True,
+                max_length=self._max_tokens(pipe))
+
+            itens = [{chave: codificados[chave][j] for chave in codificados}
+                     for j in range(len(indices))]
+            ordem = sorted(range(len(indices)),
+                           key=lambda j: len(itens[j]["input_ids"]))
+
+            modelo.eval()
+            with torch.inference_mode():
+                for inicio in range(0, len(ordem), self.tamanho_lote_bert):
+                    lote = ordem[inicio:inicio + self.tamanho_lote_bert]
+                    entrada = tokenizer.pad(
+                        [itens[j] for j in lote], return_tensors="pt")
+                    entrada = {chave: valor.to(modelo.device)
+                               for chave, valor in entrada.items()}
+
+                    probs = torch.softmax(modelo(**entrada).logits, dim=-1)
+                    scores, classes = probs.max(dim=-1)
+
+                    for j, score, classe in zip(
+                            lote, scores.tolist(), classes.tolist()):
+                        resultados[indices[j]] = self._rotulo_bert(
+                            modelo.config.id2label[classe], score)
+
+        except Exception as e:
+            self.logger.error(f"Erro no BERT: {e}")
+
+        return resultados
+
     def _analisar_bert(
         self,
         texto: str,
@@ -80,16 +325,7 @@ class SentimentAnalyzer():
             if not texto.strip():
                 return None, 'neutro'
 
-            resultado = pipe(texto[:512])[0]
-            label = resultado['label'].lower()
-            score = resultado['score']
-
-            if label == "label_0":  # negativo
-                return -score, "negativo"
-            elif label == "label_1":  # positivo
-                return score, "positivo"
-
-            return score, label
+            return self._analisar_bert_lote([texto], pipe)[0]
 
         except Exception as e:
             self.logger.error(f"Erro no BERT: {e}")
@@ -103,9 +339,9 @@ class SentimentAnalyzer():
     ) -> tuple:
 
         if len(resultados) == 3:
-            pesos = [0.15, 0.15, 0.7]
+            pesos = list(self.PESOS_SEM_BERT)
         else:
-            pesos = [0.1, 0.1, 0.6, 0.2]
+            pesos = list(self.PESOS_COM_BERT)
 
         scores = [r[0] for r in resultados]
         if all(s is None for s in scores):
@@ -150,58 +386,167 @@ class SentimentAnalyzer():
 
         return media, label
 
-    def analisar_noticia(
+    def _resultado_noticia(
         self,
         titulo: str,
-        conteudo: str
+        conteudo: str,
+        bert: tuple = None
     ) -> dict:
 
-        try:
-            score_vader_titulo, label_vader_titulo = self._analisar_vader(
-                titulo)
-            score_lexical_titulo, label_lexical_titulo = self._analisar_lexical(
-                titulo)
-            score_lexical_conteudo, label_lexical_conteudo = self._analisar_lexical(
-                conteudo)
+        score_vader_titulo, label_vader_titulo = self._analisar_vader(
+            titulo)
+        score_lexical_titulo, label_lexical_titulo = self._analisar_lexical(
+            titulo)
+        score_lexical_conteudo, label_lexical_conteudo = self._analisar_lexical(
+            conteudo)
+
+        resultados = [(score_vader_titulo, label_vader_titulo),
+                      (score_lexical_titulo, label_lexical_titulo),
+                      (score_lexical_conteudo, label_lexical_conteudo)]
+
+        score_bert_conteudo = None
+        label_bert_conteudo = None
+
+        if bert is not None:
+            score_bert_conteudo, label_bert_conteudo = bert
+            resultados.extend([(score_bert_conteudo, label_bert_conteudo)])
+
+        score_final, label_final = self._combinar_resultados(resultados)
+
+        return {
+            "sent_vader_score_titulo": score_vader_titulo,
+            "sent_vader_label_titulo": label_vader_titulo,
+            "sent_lexical_score_titulo": score_lexical_titulo,
+            "sent_lexical_label_titulo": label_lexical_titulo,
+            "sent_lexical_score_conteudo": score_lexical_conteudo,
+            "sent_lexical_label_conteudo": label_lexical_conteudo,
+            "sent_bert_score_conteudo": score_bert_conteudo,
+            "sent_bert_label_conteudo": label_bert_conteudo,
+            "sent_score_final": score_final,
+            "sent_label_final": label_final
+        }
+
+    def _resultado_vazio(self) -> dict:
+        return {
+            "sent_vader_score_titulo": None,
+            "sent_vader_label_titulo": 'neutro',
+            "sent_lexical_score_titulo": None,
+            "sent_lexical_label_titulo": 'neutro',
+            "sent_lexical_score_conteudo": None,
+            "sent_lexical_label_conteudo": 'neutro',
+            "sent_bert_score_conteudo": None,
+            "sent_bert_label_conteudo": None,
+            "sent_score_final": None,
+            "sent_label_final": 'neutro'
+        }
+
+    def _nativo(
+        self,
+        resultado: dict
+    ) -> dict:
 
-            resultados = [(score_vader_titulo, label_vader_titulo),
-                          (score_lexical_titulo, label_lexical_titulo),
-                          (score_lexical_conteudo, label_lexical_conteudo)]
+        # np.float64 -> float, para serializar no cache
+        return {chave: float(valor) if isinstance(valor, np.floating)
+                else valor for chave, valor in resultado.items()}
 
-            score_bert_conteudo = None
-            label_bert_conteudo = None
+    def _memoizavel(
+        self,
+        titulo: str,
+        conteudo: str,
+        resultado: dict
+    ) -> bool:
+
+        # falhas transitórias (tradução, BERT) não ficam no cache
+        def preenchido(texto):
+            return isinstance(texto, str) and bool(texto.strip())
+
+        if (preenchido(titulo)
+                and resultado["sent_vader_score_titulo"] is None):
+            return False
+        if (self.usar_berts and preenchido(conteudo)
+                and resultado["sent_bert_score_conteudo"] is None):
+            return False
+        return True
+
+    def analisar_noticia(
+        self,
+        titulo: str,
+        conteudo: str
+    ) -> dict:
 
+        chave = None
+        if self.cache_resultados is not None:
+            chave = self._chave_memo(titulo, conteudo)
+            em_cache = self.cache_resultados.obter(chave)
+            if em_cache is not None:
+                return dict(em_cache)
+
+        try:
+            bert = None
             if self.usar_berts:
-                score_bert_conteudo, label_bert_conteudo = self._analisar_bert(
-                    conteudo, self.pipe_bert)
-                resultados.extend([(score_bert_conteudo, label_bert_conteudo)])
-
-            score_final, label_final = self._combinar_resultados(resultados)
-
-            return {
-                "sent_vader_score_titulo": score_vader_titulo,
-                "sent_vader_label_titulo": label_vader_titulo,
-                "sent_lexical_score_titulo": score_lexical_titulo,
-                "sent_lexical_label_titulo": label_lexical_titulo,
-                "sent_lexical_score_conteudo": score_lexical_conteudo,
-                "sent_lexical_label_conteudo": label_lexical_conteudo,
-                "sent_bert_score_conteudo": score_bert_conteudo,
-                "sent_bert_label_conteudo": label_bert_conteudo,
-                "sent_score_final": score_final,
-                "sent_label_final": label_final
-            }
+                bert = self._analisar_bert(conteudo, self.pipe_bert)
+
+            resultado = self._nativo(
+                self._resultado_noticia(titulo, conteudo, bert))
 
         except Exception as e:
             self.logger.error(f"Erro ao analisar notícia: {e}")
-            return {
-                "sent_vader_score_titulo": None,
-                "sent_vader_label_titulo": label_vader_titulo,
-                "sent_lexical_score_titulo": score_lexical_titulo,
-                "sent_lexical_label_titulo": label_lexical_titulo,
-                "sent_lexical_score_conteudo": None,
-                "sent_lexical_label_conteudo": label_lexical_conteudo,
-                "sent_bert_score_conteudo": None,
-                "sent_bert_label_conteudo": label_bert_conteudo,
-                "sent_score_final": None,
-                "sent_label_final": label_final
-            }
+            return self._resultado_vazio()
+
+        if chave is not None and self._memoizavel(titulo, conteudo, resultado):
+            self.cache_resultados.gravar(chave, resultado)
+
+        return resultado
+
+    def analisar_lote(
+        self,
+        noticias: list
+    ) -> list:
+        """
+        Analisa um lote de notícias ({'titulo', 'conteudo'}): as já
+        analisadas vêm do cache de resultados; das demais, os títulos
+        são traduzidos em lote e os conteúdos passam pelo BERT em lotes
+        agrupados por tamanho. Os resultados voltam na ordem de entrada.
+        """
+        titulos = [noticia.get("titulo") for noticia in noticias]
+        conteudos = [noticia.get("conteudo", noticia.get("corpo"))
+                     for noticia in noticias]
+
+        resultados = [None] * len(noticias)
+        chaves = [None] * len(noticias)
+
+        if self.cache_resultados is not None:
+            chaves = [self._chave_memo(t, c)
+                      for t, c in zip(titulos, conteudos)]
+            em_cache = self.cache_resultados.obter_muitos(chaves)
+            resultados = [dict(em_cache[c]) if c in em_cache else None
+                          for c in chaves]
+
+        faltantes = [i for i, r in enumerate(resultados) if r is None]
+        if not faltantes:
+            return resultados
+
+        self.preparar_traducoes([titulos[i] for i in faltantes])
+
+        berts = [None] * len(faltantes)
+        if self.usar_berts:
+            berts = self._analisar_bert_lote(
+                [conteudos[i] for i in faltantes])
+
+        novos = {}
+        for i, bert in zip(faltantes, berts):
+            try:
+                resultados[i] = self._nativo(self._resultado_noticia(
+                    titulos[i], conteudos[i], bert))
+                if chaves[i] is not None and self._memoizavel(
+                        titulos[i], conteudos[i], resultados[i]):
+                    novos[chaves[i]] = resultados[i]
+
+            except Exception as e:
+                self.logger.error(f"Erro ao analisar notícia: {e}")
+                resultados[i] = self._resultado_vazio()
+
+        if novos:
+            self.cache_resultados.gravar_muitos(novos)
+
+        return resultados
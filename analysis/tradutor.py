@@ -0,0 +1,146 @@
+import hashlib
+import re
+
+from utils.cache_disco import CacheDisco
+
+
+RE_ESPACOS = re.compile(r"\s+")
+
+
+class TradutorGoogle():
+    """
+    Backend de tradução via deep_translator (Google). O cliente é criado
+    uma única vez.
+
+    O translate_batch do deep_translator faz uma requisição por texto;
+    aqui os textos são unidos por quebra de linha em requisições de até
+    `max_caracteres` e a resposta é dividida de volta. Se o número de
+    linhas traduzidas não bater, o grupo é traduzido texto a texto.
+    """
+
+    SEPARADOR = "\n"
+
+    def __init__(self, origem="pt", destino="en", max_caracteres=4500,
+                 cliente=None):
+        if cliente is None:
+            from deep_translator import GoogleTranslator
+            cliente = GoogleTranslator(source=origem, target=destino)
+
+        self.origem = origem
+        self.destino = destino
+        self.max_caracteres = max_caracteres
+        self._cliente = cliente
+
+    def _grupos(self, textos):
+        grupo, tamanho = [], 0
+
+        for texto in textos:
+            # textos com o separador não podem ser unidos
+            sozinho = self.SEPARADOR in texto
+
+            if grupo and (sozinho or tamanho + len(texto) + 1
+                          > self.max_caracteres):
+                yield grupo
+                grupo, tamanho = [], 0
+
+            grupo.append(texto)
+            tamanho += len(texto) + 1
+
+            if sozinho:
+                yield grupo
+                grupo, tamanho = [], 0
+
+        if grupo:
+            yield grupo
+
+    def _traduzir_grupo(self, grupo):
+        if len(grupo) > 1:
+            traduzido = self._cliente.translate(self.SEPARADOR.join(grupo))
+
+            if isinstance(traduzido, str):
+                partes = traduzido.split(self.SEPARADOR)
+                if len(partes) == len(grupo):
+                    return [parte.strip() for parte in partes]
+
+        return [self._cliente.translate(texto) for texto in grupo]
+
+    def traduzir_lote(self, textos):
+        traduzidos = []
+        for grupo in self._grupos(list(textos)):
+            traduzidos.extend(self._traduzir_grupo(grupo))
+        return traduzidos
+
+
+class TradutorLocal():
+    """
+    Backend local, sem rede: devolve a tradução do dicionário informado
+    ou o próprio texto. Registra as chamadas (útil em testes).
+    """
+
+    def __init__(self, traducoes=None, origem="pt", destino="en"):
+        self.traducoes = traducoes or {}
+        self.origem = origem
+        self.destino = destino
+        self.chamadas = []
+
+    def traduzir_lote(self, textos):
+        textos = list(textos)
+        self.chamadas.append(textos)
+        return [self.traducoes.get(texto, texto) for texto in textos]
+
+
+class TradutorCache():
+    """
+    Tradução com cache persistente endereçado por conteúdo: a chave é o
+    hash do texto normalizado (e do par de idiomas). Só os textos ainda
+    não vistos vão ao backend, agrupados em chamadas em lote.
+    """
+
+    def __init__(self,
+                 backend,
+                 cache=None,
+                 caminho_cache="cache/traducoes.sqlite",
+                 max_itens=200_000,
+                 tamanho_lote=50):
+        self.backend = backend
+        self.cache = (cache if cache is not None
+                      else CacheDisco(caminho_cache, max_itens=max_itens))
+        self.tamanho_lote = tamanho_lote
+
+    @staticmethod
+    def _normalizar(texto):
+        return RE_ESPACOS.sub(" ", texto).strip()
+
+    def _chave(self, texto_normalizado):
+        par = f"{self.backend.origem}>{self.backend.destino}"
+        return hashlib.sha256(
+            f"{par}|{texto_normalizado}".encode("utf-8")).hexdigest()
+
+    def traduzir_lote(self, textos):
+        """
+        Traduz uma lista de textos, preservando a ordem. Textos vazios
+        ou inválidos são devolvidos como vieram.
+        """
+        textos = list(textos)
+        normalizados = [self._normalizar(t) if isinstance(t, str) else ""
+                        for t in textos]
+        chaves = {n: self._chave(n) for n in normalizados if n}
+
+        em_cache = self.cache.obter_muitos(chaves.values())
+        faltantes = [n for n, chave in chaves.items()
+                     if chave not in em_cache]
+
+        for i in range(0, len(faltantes), self.tamanho_lote):
+            parte = faltantes[i:i + self.tamanho_lote]
+            traduzidos = self.backend.traduzir_lote(parte)
+
+            novos = {chaves[n]: t for n, t in zip(parte, traduzidos)
+                     if isinstance(t, str)}
+            self.cache.gravar_muitos(novos)
+            em_cache.update(novos)
+
+        return [em_cache.get(chaves[n], texto) if n else texto
+                for texto, n in zip(textos, normalizados)]
+
+    def traduzir(self, texto):
+        return self.traduzir_lote([texto])[0]
@@ -0,0 +1,70 @@
+"""
+Benchmark do BERT (models/lipaoMai): textos/s do caminho por notícia
+(pipe(texto[:512]), um texto por vez) contra
+SentimentAnalyzer._analisar_bert_lote (tokenização com truncamento,
+lotes agrupados por tamanho e torch.inference_mode).
+
+Uso:
+    python benchmark_bert.py [num_textos] [tamanho_lote] [num_threads]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from analysis.sentiment_analysis import SentimentAnalyzer
+from analysis.tradutor import TradutorCache, TradutorLocal
+from utils.config_registry import registro_config
+from utils.utils import logging
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    tamanho_lote = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    num_threads = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    tradutor = TradutorCache(
+        TradutorLocal(),
+        caminho_cache=os.path.join(tempfile.mkdtemp(), "traducoes.sqlite"))
+
+    analisador = SentimentAnalyzer(
+        logging, db=None, usar_bert=True, tradutor=tradutor,
+        num_threads=num_threads, tamanho_lote_bert=tamanho_lote)
+    pipe = analisador.pipe_bert
+
+    # textos de tamanhos variados, como em um lote real de notícias
+    corpos = [n["corpo"] for n in registro_config.noticias_teste()]
+    random.seed(42)
+    textos = [" ".join(random.choices(corpos, k=random.randint(1, 12)))
+              for _ in range(total)]
+
+    inicio = time.perf_counter()
+    for texto in textos:
+        pipe(texto[:512])
+    segundos_antes = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    unitarios = [analisador._analisar_bert(texto, pipe) for texto in textos]
+    segundos_unitario = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    lote = analisador._analisar_bert_lote(textos)
+    segundos_lote = time.perf_counter() - inicio
+
+    print(f"pipe(texto[:512]) por texto: {total / segundos_antes:.1f} "
+          "textos/s")
+    print(f"_analisar_bert por texto:    {total / segundos_unitario:.1f} "
+          "textos/s")
+    print(f"_analisar_bert_lote (lote={tamanho_lote}): "
+          f"{total / segundos_lote:.1f} textos/s "
+          f"({segundos_antes / segundos_lote:.1f}x)")
+
+    iguais = sum(a[1] == b[1] for a, b in zip(unitarios, lote))
+    desvio = max(abs(a[0] - b[0]) for a, b in zip(unitarios, lote))
+    print(f"Rótulos iguais (unitário x lote): {iguais}/{total}, "
+          f"maior diferença de score: {desvio:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark da curadoria de notícias: docs/s do caminho por notícia
+(nlp() com o pipeline completo) contra Curadoria.noticias_relevantes
+(nlp.pipe, componentes desligados, em lote).
+
+Uso:
+    python benchmark_curadoria.py [num_noticias] [batch_size] [n_process]
+"""
+import sys
+import time
+
+import numpy as np
+
+from analysis.curadoria_news import Curadoria
+from utils.config_registry import registro_config
+from utils.utils import logging
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    n_process = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+
+    curadoria = Curadoria(logging, db=None, table_checker=None)
+    nlp = curadoria.news_data
+
+    ticker = "EMBR3.SA"
+    termos = registro_config.sinonimos_empresa(ticker)
+    base = registro_config.textos_base()[ticker]
+
+    exemplos = registro_config.noticias_teste()
+    lote = [exemplos[i % len(exemplos)] for i in range(total)]
+
+    # caminho anterior: pipeline completo, um documento por vez
+    doc_base = nlp(curadoria._limpar_texto(base))
+    inicio = time.perf_counter()
+    for noticia in lote:
+        nlp(curadoria._limpar_texto(noticia["corpo"])).similarity(doc_base)
+    segundos_antes = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    mascara = curadoria.noticias_relevantes(
+        lote, termos, base, batch_size=batch_size, n_process=n_process)
+    segundos_lote = time.perf_counter() - inicio
+
+    individual = [curadoria.noticia_e_relevante(
+        n["titulo"], n["corpo"], termos, base) for n in exemplos]
+
+    print(f"nlp() por notícia: {total / segundos_antes:,.0f} docs/s")
+    print(f"noticias_relevantes (batch_size={batch_size}, "
+          f"n_process={n_process}): {total / segundos_lote:,.0f} docs/s")
+    print(f"Ganho: {segundos_antes / segundos_lote:.1f}x")
+    print("Máscara igual à do caminho por notícia: "
+          f"{np.array_equal(mascara[:len(exemplos)], individual)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark da extração do corpo das notícias: BeautifulSoup (html.parser)
+x lxml com XPath compilado.
+
+Uso:
+    python benchmark_extrator_html.py [pagina1.html pagina2.html ...]
+
+Sem argumentos, usa páginas sintéticas no layout padrão
+(div.article-content > p) cercadas de navegação, scripts e rodapé.
+"""
+import sys
+import time
+
+from scrapp.extrator_html import ExtratorHTML
+from utils.utils import logging
+
+
+def pagina_sintetica(paragrafos=40, ruido=400):
+    menu = "".join(
+        f'<li><a href="/secao/{i}">Seção {i}</a></li>' for i in range(ruido))
+    corpo = "".join(
+        f"<p>Parágrafo {i}: a empresa divulgou resultado trimestral "
+        f"com <b>lucro</b> de R$ {i},5 bilhões, acima do consenso.</p>"
+        for i in range(paragrafos))
+
+    return (
+        "<html><head><title>Notícia</title>"
+        "<script>var x = 1;</script></head><body>"
+        f"<nav><ul>{menu}</ul></nav>"
+        f'<div class="article-content destaque">{corpo}</div>'
+        "<footer><p>Todos os direitos reservados.</p></footer>"
+        "</body></html>")
+
+
+def medir(extrator, paginas, repeticoes):
+    inicio = time.perf_counter()
+
+    for _ in range(repeticoes):
+        textos = [extrator.extrair(html) for html in paginas]
+
+    return time.perf_counter() - inicio, textos
+
+
+def main():
+    if len(sys.argv) > 1:
+        paginas = []
+        for caminho in sys.argv[1:]:
+            with open(caminho, "r", encoding="utf-8", errors="ignore") as f:
+                paginas.append(f.read())
+    else:
+        paginas = [pagina_sintetica() for _ in range(50)]
+
+    repeticoes = 5
+    megabytes = (sum(len(p.encode("utf-8")) for p in paginas)
+                 * repeticoes / 1024 / 1024)
+
+    resultados = {}
+    for backend in ExtratorHTML.BACKENDS:
+        extrator = ExtratorHTML(logging, backend=backend)
+        extrator.extrair(paginas[0])  # aquecimento
+
+        segundos, textos = medir(extrator, paginas, repeticoes)
+        resultados[backend] = textos
+
+        print(f"{backend:>5}: {megabytes:.2f} MB em {segundos:.3f}s -> "
+              f"{segundos * 1000 / megabytes:.1f} ms/MB")
+
+    iguais = sum(a == b for a, b in zip(*resultados.values()))
+    print(f"Textos idênticos entre backends: {iguais}/{len(paginas)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Paridade e desempenho do backend int8 (quantização dinâmica) do BERT
+contra o pipeline fp32, sobre config/noticias_teste.json.
+
+Uso:
+    python benchmark_quantizacao.py [repeticoes] [tamanho_lote]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from analysis.sentiment_analysis import SentimentAnalyzer
+from analysis.tradutor import TradutorCache, TradutorLocal
+from utils.config_registry import registro_config
+from utils.utils import logging
+
+
+def analisador(backend, tamanho_lote):
+    tradutor = TradutorCache(
+        TradutorLocal(),
+        caminho_cache=os.path.join(tempfile.mkdtemp(), "traducoes.sqlite"))
+
+    return SentimentAnalyzer(
+        logging, db=None, usar_bert=True, tradutor=tradutor,
+        tamanho_lote_bert=tamanho_lote, backend_bert=backend)
+
+
+def latencias(analisador, textos, repeticoes):
+    tempos = []
+
+    for _ in range(repeticoes):
+        for texto in textos:
+            inicio = time.perf_counter()
+            analisador._analisar_bert(texto, analisador.pipe_bert)
+            tempos.append((time.perf_counter() - inicio) * 1000)
+
+    return tempos
+
+
+def vazao(analisador, textos, repeticoes):
+    lote = textos * repeticoes
+
+    inicio = time.perf_counter()
+    analisador._analisar_bert_lote(lote)
+    return len(lote) / (time.perf_counter() - inicio)
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    tamanho_lote = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    noticias = registro_config.noticias_teste()
+    textos = [n["corpo"] for n in noticias]
+
+    fp32 = analisador("fp32", tamanho_lote)
+    int8 = analisador("int8", tamanho_lote)
+
+    # -- paridade
+    ref = fp32._analisar_bert_lote(textos)
+    quant = int8._analisar_bert_lote(textos)
+
+    iguais = sum(a[1] == b[1] for a, b in zip(ref, quant))
+    desvios = [abs(a[0] - b[0]) for a, b in zip(ref, quant)]
+    print(f"Rótulos iguais ao fp32: {iguais}/{len(textos)}")
+    print(f"Diferença de score: média {statistics.mean(desvios):.4f}, "
+          f"máxima {max(desvios):.4f}")
+
+    for noticia, a, b in zip(noticias, ref, quant):
+        if a[1] != b[1]:
+            print(f"  divergência: {noticia['titulo'][:60]!r} "
+                  f"fp32={a} int8={b}")
+
+    # -- latência (um texto por vez) e vazão (em lote)
+    for nome, modelo in (("fp32", fp32), ("int8", int8)):
+        modelo._analisar_bert(textos[0], modelo.pipe_bert)  # aquecimento
+        tempos = sorted(latencias(modelo, textos, repeticoes))
+        p95 = tempos[int(len(tempos) * 0.95) - 1]
+
+        print(f"{nome}: latência p50 {statistics.median(tempos):.1f} ms, "
+              f"p95 {p95:.1f} ms; vazão em lote "
+              f"{vazao(modelo, textos, repeticoes):.1f} textos/s")
+
+    caminho_int8 = os.path.join(
+        SentimentAnalyzer.CAMINHO_MODELO, "modelo_int8.pt")
+    if os.path.exists(caminho_int8):
+        print(f"Modelo int8 em disco: "
+              f"{os.path.getsize(caminho_int8) / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
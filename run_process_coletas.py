@@ -1,4 +1,6 @@
 import argparse
+import threading
+import time
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
@@ -45,15 +47,119 @@ def run_processes(controle=None):
         log.info(f"Processamento finalizado em: {end_time - hora_inicio}")
 
 
+# Reproduz o arquivo `cron` (horário de Brasília).
+AGENDA_DAEMON = {
+    "news": [dict(minute="*/30")],
+    "indices": [dict(day_of_week="mon-fri", hour=7, minute="0,30"),
+                dict(day_of_week="mon-fri", hour=8, minute=0)],
+    "cotacoes": [dict(day_of_week="mon-fri", hour="10-18", minute="*/2")],
+    "fechamentos": [dict(day_of_week="mon-fri", hour=21, minute="0,30"),
+                    dict(day_of_week="mon-fri", hour=22, minute=0)],
+}
+
+
+class LatenciaJobs():
+    """
+    Acumula a latência de execução de cada job do daemon.
+    """
+
+    def __init__(self, logger):
+        self.logger = logger
+        self.lock = threading.Lock()
+        self.stats = {}
+
+    def registrar(self, job, duracao):
+        with self.lock:
+            st = self.stats.setdefault(
+                job, {"execucoes": 0, "total": 0.0, "max": 0.0,
+                      "ultima": 0.0})
+            st["execucoes"] += 1
+            st["total"] += duracao
+            st["max"] = max(st["max"], duracao)
+            st["ultima"] = duracao
+            media = st["total"] / st["execucoes"]
+
+        self.logger.info(
+            f"[daemon] job '{job}': {duracao:.2f}s "
+            f"(média: {media:.2f}s, máx: {st['max']:.2f}s, "
+            f"execuções: {st['execucoes']})")
+
+    def resumo(self):
+        with self.lock:
+            return {job: dict(st) for job, st in self.stats.items()}
+
+
+def run_daemon():
+
+    from apscheduler.events import EVENT_JOB_MAX_INSTANCES
+    from apscheduler.schedulers.blocking import BlockingScheduler
+    from apscheduler.triggers.combining import OrTrigger
+    from apscheduler.triggers.cron import CronTrigger
+
+    log = LoggerCustomizado()
+    tz_brasil = ZoneInfo("America/Sao_Paulo")
+
+    log.info("Iniciando o scrapper em modo daemon...")
+
+    # conexões, DDL e tabelas preparadas uma única vez
+    go_scrapp = ScrapperRun(log, None, persistente=True)
+    go_scrapp.preparar()
+
+    latencias = LatenciaJobs(log)
+
+    def executa_job(controle):
+        inicio = time.perf_counter()
+        try:
+            go_scrapp.executa_scrapping(controle)
+        finally:
+            latencias.registrar(controle, time.perf_counter() - inicio)
+
+    def job_ignorado(evento):
+        log.warning(
+            f"[daemon] job '{evento.job_id}' ainda em execução: "
+            "nova execução ignorada.")
+
+    scheduler = BlockingScheduler(timezone=tz_brasil)
+    scheduler.add_listener(job_ignorado, EVENT_JOB_MAX_INSTANCES)
+
+    for controle, regras in AGENDA_DAEMON.items():
+        gatilhos = [CronTrigger(timezone=tz_brasil, **regra)
+                    for regra in regras]
+        scheduler.add_job(
+            executa_job,
+            args=[controle],
+            trigger=(gatilhos[0] if len(gatilhos) == 1
+                     else OrTrigger(gatilhos)),
+            id=controle,
+            name=controle,
+            # evita execuções sobrepostas do mesmo job
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=60)
+
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        log.info("Encerrando o daemon...")
+    finally:
+        for job, st in latencias.resumo().items():
+            log.info(f"[daemon] resumo '{job}': {st}")
+        go_scrapp.encerrar()
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--news", action="store_true")
     parser.add_argument("--indices", action="store_true")
     parser.add_argument("--cotacoes", action="store_true")
     parser.add_argument("--fechamentos", action="store_true")
+    parser.add_argument("--sentimento", action="store_true")
+    parser.add_argument("--daemon", action="store_true")
     args = parser.parse_args()
 
-    if args.news:
+    if args.daemon:
+        run_daemon()
+    elif args.news:
         run_processes("news")
     elif args.indices:
         run_processes("indices")
@@ -61,3 +167,5 @@ if __name__ == "__main__":
         run_processes("cotacoes")
     elif args.fechamentos:
         run_processes("fechamentos")
+    elif args.sentimento:
+        run_processes("sentimento")
@@ -0,0 +1,170 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class LimitadorTaxa():
+    """
+    Token bucket: até `rajada` requisições imediatas e, depois,
+    `taxa` requisições por segundo.
+    """
+
+    def __init__(self, taxa=1.0, rajada=2):
+        self.taxa = taxa
+        self.rajada = rajada
+        self.tokens = float(rajada)
+        self.ultimo = time.monotonic()
+        self.lock = threading.Lock()
+
+    def aguardar(self):
+        while True:
+            with self.lock:
+                agora = time.monotonic()
+                self.tokens = min(
+                    self.rajada,
+                    self.tokens + (agora - self.ultimo) * self.taxa)
+                self.ultimo = agora
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                espera = (1 - self.tokens) / self.taxa
+
+            time.sleep(espera)
+
+    def penalizar(self, segundos):
+        """
+        Esvazia o bucket após um 403/429 para que o host "descanse".
+        """
+        with self.lock:
+            self.tokens = min(self.tokens, 0) - segundos * self.taxa
+
+
+class BuscadorConteudo():
+    """
+    Busca o HTML de várias URLs com uma sessão HTTP keep-alive
+    compartilhada, concorrência limitada, limite de taxa por host,
+    timeouts e backoff em respostas 403/429.
+    """
+
+    HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0"
+        "Safari/537.36"
+    }
+
+    def __init__(self,
+                 logger,
+                 max_workers=8,
+                 taxa_por_host=1.0,
+                 rajada_por_host=2,
+                 timeout=(5, 20),
+                 tentativas=3,
+                 backoff=2.0):
+        self.logger = logger
+        self.max_workers = max_workers
+        self.taxa_por_host = taxa_por_host
+        self.rajada_por_host = rajada_por_host
+        self.timeout = timeout
+        self.tentativas = tentativas
+        self.backoff = backoff
+
+        self.session = requests.Session()
+        self.session.headers.update(self.HEADERS)
+        adapter = HTTPAdapter(pool_connections=max_workers,
+                              pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._limitadores = {}
+        self._lock = threading.Lock()
+
+    def _limitador(self, url):
+        host = urlparse(url).netloc.lower()
+
+        with self._lock:
+            if host not in self._limitadores:
+                self._limitadores[host] = LimitadorTaxa(
+                    self.taxa_por_host, self.rajada_por_host)
+            return self._limitadores[host]
+
+    def _espera_bloqueio(self, response, tentativa):
+        retry_after = response.headers.get("Retry-After", "")
+
+        if retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * (2 ** tentativa)
+
+    def obter(self, url):
+        """
+        Retorna o HTML da URL, ou None se não for possível obtê-lo.
+        """
+        if not isinstance(url, str):
+            self.logger.error(f"Erro: URL inválida recebida {url}")
+            return None
+
+        limitador = self._limitador(url)
+
+        for tentativa in range(self.tentativas):
+            limitador.aguardar()
+
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+            except requests.RequestException as e:
+                self.logger.warning(
+                    f"Falha ao obter {url} (tentativa {tentativa + 1}): {e}")
+                time.sleep(self.backoff * (2 ** tentativa))
+                continue
+
+            if response.status_code in (403, 429):
+                espera = self._espera_bloqueio(response, tentativa)
+                self.logger.warning(
+                    f"Acesso bloqueado ({response.status_code}) em {url}: "
+                    f"aguardando {espera:.0f}s...")
+                limitador.penalizar(espera)
+                continue
+
+            if response.ok:
+                return response.text
+
+            self.logger.warning(
+                f"Resposta {response.status_code} ao obter {url}.")
+            return None
+
+        return None
+
+    def buscar(self, urls, max_workers=None):
+        """
+        Busca as URLs em paralelo, entregando (url, html) à medida que
+        cada uma termina, para que parsing e deduplicação se sobreponham
+        ao I/O de rede.
+
+        `max_workers` limita as threads desta chamada (padrão: o tamanho
+        do pool de conexões); chamadas concorrentes devem dividi-lo.
+        """
+        urls = list(urls)
+
+        if not urls:
+            return
+
+        with ThreadPoolExecutor(
+                max_workers=min(max_workers or self.max_workers,
+                                self.max_workers,
+                                len(urls))) as executor:
+            futuros = {executor.submit(self.obter, url): url for url in urls}
+
+            for futuro in as_completed(futuros):
+                url = futuros[futuro]
+                try:
+                    yield url, futuro.result()
+                except Exception as e:
+                    self.logger.error(f"Erro ao obter {url}: {e}")
+                    yield url, None
+
+    def fechar(self):
+        self.session.close()
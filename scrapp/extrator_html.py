@@ -0,0 +1,148 @@
+import re
+import threading
+from urllib.parse import urlparse
+
+from utils.config_registry import registro_config
+
+
+# limpeza do texto extraído, compilada uma única vez
+RE_ESPACOS = re.compile(r"\s+")
+RE_RODAPE = re.compile(
+    r"\b(Publicado em|Fonte|Leia mais em|Promoção|Todos os"
+    r"Direitos Reservados)\b.*")
+RE_ESPECIAIS = re.compile(r"[^a-zA-Z0-9À-ÿ\s]")
+# o lxml recusa str com declaração de encoding (ValueError)
+RE_DECLARACAO_XML = re.compile(r"^\ufeff?\s*<\?xml[^>]*\?>", re.IGNORECASE)
+
+PERFIL_PADRAO = {
+    "container": "div.article-content",
+    "paragrafos": "p"
+}
+
+
+def limpar_texto(texto):
+    """
+    Normaliza espaços, corta rodapés e remove caracteres especiais.
+    """
+    texto = RE_ESPACOS.sub(" ", texto)
+    texto = RE_RODAPE.sub("", texto)
+    return RE_ESPECIAIS.sub("", texto)
+
+
+def _seletor_para_xpath(seletor):
+    """
+    Converte um seletor simples 'tag', 'tag.classe' ou '.classe' em
+    XPath (evitando depender do cssselect).
+    """
+    tag, _, classe = seletor.partition(".")
+    xpath = tag or "*"
+
+    if classe:
+        xpath += ("[contains(concat(' ', normalize-space(@class), ' '),"
+                  f" ' {classe} ')]")
+
+    return xpath
+
+
+class ExtratorHTML():
+    """
+    Extrai o corpo das notícias a partir do HTML.
+
+    O perfil de seletores de cada site vem de
+    config/perfis_extracao.json (chave = host, sem 'www.'); sites sem
+    perfil usam o PERFIL_PADRAO. O perfil pode trazer 'container' e
+    'paragrafos' no formato 'tag.classe', ou um 'xpath' completo.
+
+    Backends:
+        'lxml' (padrão): parser em C, com os XPath compilados e
+            mantidos em cache por perfil.
+        'bs4': caminho original, com BeautifulSoup + html.parser.
+    """
+
+    BACKENDS = ("lxml", "bs4")
+
+    def __init__(self, logger, backend="lxml"):
+        if backend not in self.BACKENDS:
+            raise ValueError(
+                f"Backend inválido: {backend}. Use um de {self.BACKENDS}.")
+
+        self.logger = logger
+        self.backend = backend
+        self._xpaths = {}
+        self._lock = threading.Lock()
+
+    def perfil(self, url=None):
+        perfis = registro_config.perfis_extracao()
+
+        if url:
+            host = urlparse(url).netloc.lower()
+            host = host[4:] if host.startswith("www.") else host
+            if host in perfis:
+                return perfis[host]
+
+        return perfis.get("padrao", PERFIL_PADRAO)
+
+    def _xpath(self, perfil):
+        from lxml import etree
+
+        if "xpath" in perfil:
+            expressao = perfil["xpath"]
+        else:
+            expressao = (
+                f"(//{_seletor_para_xpath(perfil['container'])})[1]"
+                f"//{_seletor_para_xpath(perfil['paragrafos'])}")
+
+        with self._lock:
+            if expressao not in self._xpaths:
+                self._xpaths[expressao] = etree.XPath(expressao)
+            return self._xpaths[expressao]
+
+    def _paragrafos_lxml(self, html, perfil):
+        import lxml.html
+
+        if isinstance(html, str):
+            # o texto já foi decodificado: a declaração não se aplica
+            html = RE_DECLARACAO_XML.sub("", html, count=1)
+
+        documento = lxml.html.document_fromstring(html)
+        return [p.text_content() for p in self._xpath(perfil)(documento)]
+
+    def _paragrafos_bs4(self, html, perfil):
+        from bs4 import BeautifulSoup
+
+        tag, _, classe = perfil["container"].partition(".")
+        soup = BeautifulSoup(html, "html.parser")
+        container = soup.find(tag or True, class_=classe or None)
+        paragrafos = perfil["paragrafos"].partition(".")[0]
+
+        if not container:
+            return []
+        return [p.get_text() for p in container.find_all(paragrafos)]
+
+    def paragrafos(self, html, url=None):
+        """
+        Textos dos parágrafos do corpo da notícia.
+        """
+        perfil = self.perfil(url)
+
+        if self.backend == "bs4" and "container" in perfil:
+            return self._paragrafos_bs4(html, perfil)
+        return self._paragrafos_lxml(html, perfil)
+
+    def extrair(self, html, url=None):
+        """
+        Retorna o texto limpo da notícia, ou "" se não for encontrado.
+        """
+        if not html:
+            return ""
+
+        try:
+            paragrafos = self.paragrafos(html, url)
+        except Exception as e:
+            self.logger.error(f"Erro ao obter o texto da notícia: {e}")
+            return ""
+
+        if not paragrafos:
+            return ""
+
+        return limpar_texto(" ".join(paragrafos))
@@ -1,6 +1,6 @@
-from scrapp.scrapp_noticias import ScrappingNoticias
-from scrapp.scrapp_fechamentos import ScrappIndices
-from scrapp.scrapp_cotacoes_intra import ScrappIntra
+# Os scrappers são importados dentro de cada modo em _executa: cada
+# controle paga apenas pelas próprias dependências (ex.: --cotacoes não
+# carrega sklearn, gdeltdoc, bs4, rapidfuzz nem jbridgedf).
 from utils.ddl_loader import CriadorDDL
 from utils.conn_pg import PostGreSQL
 from utils.table_checker import TableChecker
@@ -12,57 +12,134 @@ from datetime import datetime
 class ScrapperRun():
     def __init__(self,
                  logger,
-                 controle):
+                 controle,
+                 persistente=False):
         self.logger = logger
         self.controle = controle
+        # no modo persistente (daemon) conexão, DDL e verificação
+        # de tabelas são preparadas uma única vez e reaproveitadas.
+        self.persistente = persistente
+        self.db = None
+        self.ddl_creator = None
+        self.table_checker = None
+        self.noticias = None
+
+    def preparar(self):
+
+        if self.db is not None:
+            return
+
+        # Obtendo a conexão com o PostgreSQL
+        self.db = PostGreSQL(logger=self.logger)
+        self.db.conectar()
+
+        # criação dinâmica de SQL
+        self.ddl_creator = CriadorDDL("sql/ddl")
+
+        # verificação de tabelas e controle de meta dados
+        self.table_checker = TableChecker(
+            self.logger,
+            self.db,
+            self.ddl_creator
+        )
+
+        title = r"""
+        #################################
+        #   +-+-+-+-+-+-+ +-+-+-+-+-+   #
+        #   |T|a|b|l|e|s| |C|h|e|c|k|   #
+        #   +-+-+-+-+-+-+ +-+-+-+-+-+   #
+        #################################
+        """
+        self.logger.info(title)
+
+        self.table_checker.check_tables()
+
+        if self.persistente:
+            # no daemon o scrapper de notícias (índice de duplicatas,
+            # sessão HTTP e extrator) é criado uma vez e fica aquecido
+            from scrapp.scrapp_noticias import ScrappingNoticias
+
+            self.noticias = ScrappingNoticias(
+                logger=self.logger,
+                db=self.db,
+                table_checker=self.table_checker,
+                ddl_creator=self.ddl_creator
+            )
+
+    def encerrar(self):
+
+        if self.db is not None:
+            self.db.fechar_conexao()
+            self.db = None
+            self.noticias = None
 
-    def executa_scrapping(self):
+    def executa_scrapping(self, controle=None):
+
+        controle = controle or self.controle
 
         try:
 
-            # Obtendo a conexão com o PostgreSQL
-            db = PostGreSQL(logger=self.logger)
-            db.conectar()
+            self.preparar()
 
-            # criação dinâmica de SQL
-            ddl_creator = CriadorDDL("sql/ddl")
+            if self.persistente:
+                # cada job do daemon usa sua própria conexão do pool
+                with self.db.conexao():
+                    self._executa(controle)
+            else:
+                self._executa(controle)
+                self.encerrar()
 
-            # verificação de tabelas e controle de meta dados
-            table_checker = TableChecker(
-                self.logger,
-                db,
-                ddl_creator
-            )
+        except Exception as e:
+            self.logger.error(
+                f"Houve um problema ao adquirir os dados via scrapping: {e}")
 
-            tz_brasil = ZoneInfo("America/Sao_Paulo")
-            hora_inicio = datetime.now(tz=tz_brasil)
+    def _executa(self, controle):
+
+        db = self.db
+        ddl_creator = self.ddl_creator
+
+        if self.persistente:
+            # jobs concorrentes do daemon: cada um com o próprio buffer
+            # de controle, para que o flush de um não grave os registros
+            # ainda incompletos de outro
+            table_checker = TableChecker(self.logger, db, ddl_creator)
+        else:
+            table_checker = self.table_checker
 
+        # uma leitura de meta.controle_populacao por execução
+        table_checker.carregar_controle()
+
+        try:
+            self._executa_controle(controle, db, ddl_creator, table_checker)
+        finally:
+            table_checker.flush_registros()
+
+    def _executa_controle(self, controle, db, ddl_creator, table_checker):
+
+        tz_brasil = ZoneInfo("America/Sao_Paulo")
+        hora_inicio = datetime.now(tz=tz_brasil)
+
+        if controle == 'news':
             title = r"""
-            #################################
-            #   +-+-+-+-+-+-+ +-+-+-+-+-+   #
-            #   |T|a|b|l|e|s| |C|h|e|c|k|   #
-            #   +-+-+-+-+-+-+ +-+-+-+-+-+   #
-            #################################
+            #########################################
+            #        )                              #
+            #     ( /(        )           (         #
+            #     )\())    ( /((     (     )        #
+            #    ((_)\  (  )\())\  ( )\ ( /( (      #
+            #    _((_) )\(_))((_) )((_))(_)))\      #
+            #    | \| |((_) |_ (_)((_|_|(_)_((_)    #
+            #    | .` / _ \  _|| / _|| / _` (_-<    #
+            #    |_|\_\___/\__||_\__||_\__,_/__/    #
+            #                                       #
+            #########################################
             """
             self.logger.info(title)
 
-            table_checker.check_tables()
-
-            if self.controle == 'news':
-                title = r"""
-                #########################################
-                #        )                              #
-                #     ( /(        )           (         #
-                #     )\())    ( /((     (     )        #
-                #    ((_)\  (  )\())\  ( )\ ( /( (      #
-                #    _((_) )\(_))((_) )((_))(_)))\      #
-                #    | \| |((_) |_ (_)((_|_|(_)_((_)    #
-                #    | .` / _ \  _|| / _|| / _` (_-<    #
-                #    |_|\_\___/\__||_\__||_\__,_/__/    #
-                #                                       #
-                #########################################
-                """
-                self.logger.info(title)
+            if self.noticias is not None:
+                scrap = self.noticias
+                scrap.table_checker = table_checker
+            else:
+                from scrapp.scrapp_noticias import ScrappingNoticias
 
                 scrap = ScrappingNoticias(
                     logger=self.logger,
@@ -71,72 +148,87 @@ class ScrapperRun():
                     ddl_creator=ddl_creator
                 )
 
-                # scrap.busca_noticias_historicas()
+            # scrap.busca_noticias_historicas()
 
-                scrap.buscar_noticias()
+            scrap.buscar_noticias()
 
-                hora_fim = datetime.now(tz=tz_brasil)
-                self.logger.info(
-                    f"""Busca de notícias terminada com sucesso em :
-                    {hora_fim-hora_inicio}""")
+            hora_fim = datetime.now(tz=tz_brasil)
+            self.logger.info(
+                f"""Busca de notícias terminada com sucesso em :
+                {hora_fim-hora_inicio}""")
 
-            elif self.controle == 'indices' or self.controle == 'fechamentos':
+        elif controle == 'indices' or controle == 'fechamentos':
 
-                hora_inicio = datetime.now(tz=tz_brasil)
+            hora_inicio = datetime.now(tz=tz_brasil)
 
-                title = r"""
-                ######################################
-                #     __                             #
-                #    |_  _  _ __  _ __  o  _  _  _   #
-                #    |__(_ (_)| |(_)||| | (_ (_)_>   #
-                #                                    #
-                ######################################
-                """
-                self.logger.info(title)
+            title = r"""
+            ######################################
+            #     __                             #
+            #    |_  _  _ __  _ __  o  _  _  _   #
+            #    |__(_ (_)| |(_)||| | (_ (_)_>   #
+            #                                    #
+            ######################################
+            """
+            self.logger.info(title)
 
-                scrap_f = ScrappIndices(
-                    logger=self.logger,
-                    controle=self.controle,
-                    db=db,
-                    table_checker=table_checker,
-                    ddl_creator=ddl_creator
-                )
+            from scrapp.scrapp_fechamentos import ScrappIndices
 
-                scrap_f.colheira_diaria()
+            scrap_f = ScrappIndices(
+                logger=self.logger,
+                controle=controle,
+                db=db,
+                table_checker=table_checker,
+                ddl_creator=ddl_creator,
+                concorrente=True
+            )
 
-                hora_fim = datetime.now(tz=tz_brasil)
-                self.logger.info(
-                    f"""Busca de dados economicos diários:
-                     Terminada com sucesso em : {hora_fim-hora_inicio}""")
+            scrap_f.colheira_diaria()
 
-            elif self.controle == 'cotacoes':
+            hora_fim = datetime.now(tz=tz_brasil)
+            self.logger.info(
+                f"""Busca de dados economicos diários:
+                 Terminada com sucesso em : {hora_fim-hora_inicio}""")
 
-                title = r"""
-                ######################################
-                #     __                             #
-                #    |_  _  _ __  _ __  o  _  _  _   #
-                #    |__(_ (_)| |(_)||| | (_ (_)_>   #
-                #                                    #
-                ######################################
-                """
-                self.logger.info(title)
+        elif controle == 'sentimento':
 
-                scrap_intra = ScrappIntra(
-                    logger=self.logger,
-                    db=db,
-                    table_checker=table_checker,
-                    ddl_creator=ddl_creator
-                )
+            from analysis.backfill_sentimento import BackfillSentimento
 
-                scrap_intra.colheita_cotacao_atual()
+            backfill = BackfillSentimento(
+                logger=self.logger,
+                db=db
+            )
 
-                hora_fim = datetime.now(tz=tz_brasil)
-                self.logger.info(
-                    f"""Busca de dados de cotação:
-                    Terminada com sucesso em : {hora_fim-hora_inicio}""")
+            backfill.executar()
 
-            db.fechar_conexao()
+            hora_fim = datetime.now(tz=tz_brasil)
+            self.logger.info(
+                f"""Pontuação de sentimento das notícias:
+                Terminada com sucesso em : {hora_fim-hora_inicio}""")
 
-        except Exception as e:
-            self.logger.error(
-                f"Houve um problema ao adquirir os dados via scrapping: {e}")
+        elif controle == 'cotacoes':
+
+            title = r"""
+            ######################################
+            #     __                             #
+            #    |_  _  _ __  _ __  o  _  _  _   #
+            #    |__(_ (_)| |(_)||| | (_ (_)_>   #
+            #                                    #
+            ######################################
+            """
+            self.logger.info(title)
+
+            from scrapp.scrapp_cotacoes_intra import ScrappIntra
+
+            scrap_intra = ScrappIntra(
+                logger=self.logger,
+                db=db,
+                table_checker=table_checker,
+                ddl_creator=ddl_creator
+            )
+
+            scrap_intra.colheita_cotacao_atual()
+
+            hora_fim = datetime.now(tz=tz_brasil)
+            self.logger.info(
+                f"""Busca de dados de cotação:
+                Terminada com sucesso em : {hora_fim-hora_inicio}""")
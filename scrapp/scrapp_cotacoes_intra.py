@@ -3,10 +3,27 @@ from datetime import time, datetime
 from zoneinfo import ZoneInfo
 from dateutil.relativedelta import relativedelta
 import pandas as pd
-from utils.json_loader import carregar_lista_json
+from utils.config_registry import registro_config
 
 
 class ScrappIntra():
+    COLUNAS_PREGAO = ["datatime",
+                      "ativo",
+                      "preco_abertura",
+                      "preco_minimo",
+                      "preco_maximo",
+                      "preco_fechamento",
+                      "volume_negociado",
+                      "media_movel_50",
+                      "media_movel_200",
+                      "origem"]
+
+    # tickers por requisição multi-ticker do yfinance
+    TAMANHO_LOTE = 50
+    # linhas mais recentes por ativo cujas médias móveis são
+    # (re)avaliadas a cada atualização em lote
+    RECALCULO_MEDIAS = 50
+
     def __init__(self,
                  logger,
                  db,
@@ -31,22 +48,10 @@ class ScrappIntra():
 
     def colheita_cotacao_atual(self):
 
-        ls_empresas = carregar_lista_json("config/empresas.json")
-
-        ls_moedas = carregar_lista_json("config/moedas_intra.json")
-
-        ls_indices_globais = carregar_lista_json(
-            "config/indices_globais_intra.json")
-
-        ls_commodities = carregar_lista_json("config/commodities_intra.json")
-
-        ls_cripto = carregar_lista_json("config/crypto_intra.json")
-
-        ls_titulos = carregar_lista_json("config/titles_intra.json")
-
         # cotação das empresas e moedas importantes
-        ls_combined = ls_empresas + ls_moedas + \
-            ls_indices_globais + ls_commodities + ls_cripto + ls_titulos
+        ls_combined = registro_config.tickers_intra()
+
+        lote = []
 
         for tik in ls_combined:
 
@@ -65,7 +70,6 @@ class ScrappIntra():
                     Buscando primeira carga...""")
 
                 self._cotacao_pregao(
-                    hoje=False,
                     sigla=tik["ticker"],
                     camada='silver',
                     tabela=tik["tabela"]
@@ -74,12 +78,7 @@ class ScrappIntra():
 
                 if atualizar:
 
-                    self._cotacao_pregao(
-                        hoje=True,
-                        sigla=tik["ticker"],
-                        camada='silver',
-                        tabela=tik["tabela"]
-                    )
+                    lote.append(tik)
 
                 else:
 
@@ -87,7 +86,174 @@ class ScrappIntra():
                         f"""Dados do {tik['tabela'].upper()}:
                         Estão atualizados.""")
 
-    def _cotacao_pregao(self, hoje, sigla, camada, tabela):
+        if lote:
+            self._cotacao_lote(lote)
+
+    def _baixar_lote(self, siglas):
+        """
+        Baixa o último pregão de vários ativos em uma única requisição
+        multi-ticker e devolve um DataFrame por sigla.
+        """
+        df_lote = yf.download(
+            tickers=siglas,
+            period="1d",
+            group_by="ticker",
+            auto_adjust=True,
+            threads=True,
+            progress=False)
+
+        frames = {}
+
+        if df_lote is None or df_lote.empty:
+            return frames
+
+        for sigla in siglas:
+            if isinstance(df_lote.columns, pd.MultiIndex):
+                if sigla not in df_lote.columns.get_level_values(0):
+                    continue
+                df_ativo = df_lote[sigla]
+            else:
+                df_ativo = df_lote
+
+            df_ativo = df_ativo.dropna(subset=["Close"])
+
+            if not df_ativo.empty:
+                frames[sigla] = df_ativo
+
+        return frames
+
+    def _cotacao_lote(self, tiks):
+        """
+        Atualiza a cotação atual de vários ativos: download em lotes
+        multi-ticker e uma única gravação set-based.
+        """
+        br_time = datetime.now(ZoneInfo("America/Sao_Paulo"))
+        hoje_data = br_time.date()
+
+        frames = {}
+        siglas = [tik["ticker"] for tik in tiks]
+
+        for i in range(0, len(siglas), self.TAMANHO_LOTE):
+            pedaco = siglas[i:i + self.TAMANHO_LOTE]
+            try:
+                frames.update(self._baixar_lote(pedaco))
+            except Exception as e:
+                self.logger.error(
+                    f"Não foi possível obter o lote {pedaco}, erro: {e}")
+
+        valores = []
+        atualizados = []
+
+        for tik in tiks:
+            df_ativo = frames.get(tik["ticker"])
+
+            if df_ativo is None:
+                self.logger.warning(
+                    f"Sem cotação atual para {tik['tabela'].upper()}.")
+                continue
+
+            linha = df_ativo.iloc[-1]
+            valores.append((
+                br_time,
+                tik["tabela"],
+                self._to_float(float(linha["Open"])),
+                self._to_float(float(linha["Low"])),
+                self._to_float(float(linha["High"])),
+                self._to_float(float(linha["Close"])),
+                int(linha["Volume"]) if not pd.isna(
+                    linha["Volume"]) else 0,
+                None,
+                None,
+                'yfinance'
+            ))
+            atualizados.append(tik["tabela"])
+
+        if not valores:
+            return
+
+        if self.db.upsert(
+                "silver.cotacao_pregao",
+                self.COLUNAS_PREGAO,
+                valores,
+                chave=["ativo", "datatime"]) is False:
+            self.logger.error(
+                f"Falha ao gravar a cotação atual de "
+                f"{len(atualizados)} ativos.")
+            return
+
+        try:
+            # só as últimas linhas de cada ativo entram na janela (via
+            # índice da chave primária): o custo não cresce com o
+            # histórico. As RECALCULO_MEDIAS linhas mais recentes têm as
+            # 199 anteriores na janela e são as únicas atualizadas.
+            query = """WITH recentes AS (
+                            SELECT r.ativo, r.datatime, r.preco_fechamento,
+                                ROW_NUMBER() OVER
+                                (PARTITION BY r.ativo
+                                ORDER BY r.datatime DESC) AS ordem
+                            FROM unnest(%s::text[]) AS a(ativo)
+                            CROSS JOIN LATERAL (
+                                SELECT ativo, datatime, preco_fechamento
+                                FROM silver.cotacao_pregao
+                                WHERE ativo = a.ativo
+                                ORDER BY datatime DESC
+                                LIMIT %s) AS r
+                        ),
+                        subquery AS (
+                            SELECT ativo, datatime, ordem,
+                                AVG(preco_fechamento) OVER
+                                (PARTITION BY ativo ORDER BY datatime
+                                ROWS BETWEEN 49 PRECEDING AND CURRENT ROW)
+                                AS media_50,
+                                AVG(preco_fechamento) OVER
+                                (PARTITION BY ativo ORDER BY datatime
+                                ROWS BETWEEN 199 PRECEDING AND CURRENT ROW)
+                                AS media_200
+                            FROM recentes
+                        )
+                        UPDATE silver.cotacao_pregao AS p
+                        SET media_movel_50 =
+                        COALESCE(subquery.media_50, p.media_movel_50),
+                            media_movel_200 =
+                            COALESCE(subquery.media_200, p.media_movel_200)
+                        FROM subquery
+                        WHERE p.ativo = subquery.ativo
+                        AND p.datatime = subquery.datatime
+                        AND subquery.ordem <= %s
+                        AND (p.media_movel_50 IS NULL
+                        OR p.media_movel_200 IS NULL);"""
+
+            self.db.executa_query(
+                query,
+                valores=(atualizados,
+                         self.RECALCULO_MEDIAS + 199,
+                         self.RECALCULO_MEDIAS),
+                commit=True)
+        except Exception as e:
+            self.logger.error(
+                (f"Não foi possível calcular as médias"
+                 f" móveis do lote, erro: {e}"))
+
+        for tabela in atualizados:
+            self.table_checker.register_populated(
+                camada='silver',
+                tabela='cotacao_pregao_'+tabela,
+                nome_serie=tabela,
+                inicial=None,
+                data_exec=hoje_data,
+                prox_data=hoje_data,
+                obs="Atualização do valor de fechamento IBOVESPA"
+            )
+
+        self.logger.info(
+            f"Cotação atual de {len(atualizados)} ativos gravada com sucesso.")
+
+    def _cotacao_pregao(self, sigla, camada, tabela):
+        """
+        Carga inicial do histórico intradiário de um ativo (60m até 58
+        dias atrás, 2m daí em diante). A atualização corrente é feita
+        em lote por _cotacao_lote.
+        """
 
         if sigla is None:
             raise TypeError(
@@ -106,166 +272,89 @@ class ScrappIntra():
             br_time = datetime.now(ZoneInfo("America/Sao_Paulo"))
             hoje_data = br_time.date()
 
-            if hoje:
-                data_inicial = None
-                pop_string = "Atualização do valor de fechamento IBOVESPA"
-
-                df_ibov = ibov.history(period="1d")
-
-                df_ibov.index = pd.to_datetime(df_ibov.index)
-                df_ibov.reset_index(inplace=True)
-
-                if not df_ibov.empty:
-                    linha = df_ibov.iloc[-1]
-                    query = """INSERT INTO silver.cotacao_pregao (
-                                                datatime,
-                                                ativo,
-                                                preco_abertura,
-                                                preco_minimo,
-                                                preco_maximo,
-                                                preco_fechamento,
-                                                volume_negociado,
-                                                media_movel_50,
-                                                media_movel_200,
-                                                origem)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-                    valores = [(
-                        br_time,
-                        tabela,
-                        self._to_float(float(linha["Open"])),
-                        self._to_float(float(linha["Low"])),
-                        self._to_float(float(linha["High"])),
-                        self._to_float(float(linha["Close"])),
-                        int(linha["Volume"]) if not pd.isna(
-                            linha["Volume"]) else 0,
+            data_inicial = hoje_data
+            pop_string = f"Obtendo a carga inicial para {tabela}..."
+
+            Dia_inicio_1h = hoje_data - relativedelta(days=700)
+            Dia_fim_1h = hoje_data - relativedelta(days=58)
+            Dia_inicio_2m = hoje_data - relativedelta(days=57)
+
+            df_pregao_1h = ibov.history(
+                start=Dia_inicio_1h,
+                end=Dia_fim_1h,
+                interval='60m',
+                auto_adjust=True,
+                prepost=False)
+            df_pregao_2m = ibov.history(
+                start=Dia_inicio_2m,
+                end=hoje_data,
+                interval='2m',
+                auto_adjust=True,
+                prepost=False)
+            df_pregao_1h.index = pd.to_datetime(df_pregao_1h.index)
+            df_pregao_1h.reset_index(inplace=True)
+            df_pregao_2m.index = pd.to_datetime(df_pregao_2m.index)
+            df_pregao_2m.reset_index(inplace=True)
+
+            df_final = pd.concat(
+                [df_pregao_2m, df_pregao_1h], ignore_index=True)
+
+            if df_final is not None and not df_final.empty:
+                valores = [
+                    (row["Datetime"],
+                     tabela,
+                     self._to_float(float(row["Open"])),
+                     self._to_float(float(row["Low"])),
+                     self._to_float(float(row["High"])),
+                     self._to_float(float(row["Close"])),
+                     int(row["Volume"]) if not pd.isna(
+                        row["Volume"]) else 0,
                         None,
                         None,
-                        'yfinance'
-                    )]
-
-                    self.db.executa_query(query, valores[0], commit=True)
-
-                    try:
-                        query = """WITH subquery AS (
-                                        SELECT datatime,
-                                            AVG(preco_fechamento) OVER
-                                            (ORDER BY datatime ROWS BETWEEN
-                                            49 PRECEDING AND CURRENT ROW)
-                                            AS media_50,
-                                            AVG(preco_fechamento) OVER
-                                            (ORDER BY datatime ROWS BETWEEN
-                                            199 PRECEDING AND CURRENT ROW)
-                                            AS media_200
-                                        FROM silver.cotacao_pregao
-                                        WHERE media_movel_50 IS NULL OR
-                                        media_movel_200 IS NULL
-                                    )
-                                    UPDATE silver.cotacao_pregao AS p
+                        'yfinance')
+                    for _, row in df_final.iterrows()]
+
+                if self.db.bulk_load(
+                        "silver.cotacao_pregao",
+                        self.COLUNAS_PREGAO,
+                        valores,
+                        staging=True,
+                        merge_sql=self.db.clausula_conflito(
+                            ["ativo", "datatime"])) is False:
+                    self.logger.error(
+                        f"Falha ao gravar a carga inicial de {tabela}.")
+                    return
+
+                try:
+                    query = """UPDATE silver.cotacao_pregao AS p
                                     SET media_movel_50 =
-                                    COALESCE(subquery.media_50,
-                                    p.media_movel_50),
-                                        media_movel_200 =
-                                        COALESCE(subquery.media_200,
-                                        p.media_movel_200)
-                                    FROM subquery
+                             COALESCE(subquery.media_50, p.media_movel_50),
+                                        media_movel_200 = COALESCE(
+                                            subquery.media_200,
+                             p.media_movel_200)
+                                    FROM (
+                                        SELECT datatime,
+                                            AVG(preco_fechamento)
+                             OVER (ORDER BY datatime ROWS BETWEEN 49
+                             PRECEDING AND CURRENT ROW) AS media_50,
+                                            AVG(preco_fechamento)
+                             OVER (ORDER BY datatime ROWS BETWEEN 199
+                             PRECEDING AND CURRENT ROW) AS media_200
+                                    FROM silver.cotacao_pregao
+                                    ) AS subquery
                                     WHERE p.datatime = subquery.datatime
-                                    AND ativo = %s;"""
-
-                        self.db.executa_query(
-                            query, valores=[sigla], commit=True)
-                    except Exception as e:
-                        self.logger.error(
-                            (f"Não foi possível calcular as médias"
-                             f" móveis para: {tabela}, erro: {e}"))
-
-            else:
-                data_inicial = hoje_data
-                pop_string = f"Obtendo a carga inicial para {tabela}..."
-
-                Dia_inicio_1h = hoje_data - relativedelta(days=700)
-                Dia_fim_1h = hoje_data - relativedelta(days=58)
-                Dia_inicio_2m = hoje_data - relativedelta(days=57)
-
-                df_pregao_1h = ibov.history(
-                    start=Dia_inicio_1h,
-                    end=Dia_fim_1h,
-                    interval='60m',
-                    auto_adjust=True,
-                    prepost=False)
-                df_pregao_2m = ibov.history(
-                    start=Dia_inicio_2m,
-                    end=hoje_data,
-                    interval='2m',
-                    auto_adjust=True,
-                    prepost=False)
-                df_pregao_1h.index = pd.to_datetime(df_pregao_1h.index)
-                df_pregao_1h.reset_index(inplace=True)
-                df_pregao_2m.index = pd.to_datetime(df_pregao_2m.index)
-                df_pregao_2m.reset_index(inplace=True)
-
-                df_final = pd.concat(
-                    [df_pregao_2m, df_pregao_1h], ignore_index=True)
-
-                if df_final is not None and not df_final.empty:
-                    query = """INSERT INTO silver.cotacao_pregao (
-                                                    datatime,
-                                                    ativo,
-                                                    preco_abertura,
-                                                    preco_minimo,
-                                                    preco_maximo,
-                                                    preco_fechamento,
-                                                    volume_negociado,
-                                                    media_movel_50,
-                                                    media_movel_200,
-                                                    origem)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-                    valores = [
-                        (row["Datetime"],
-                         tabela,
-                         self._to_float(float(row["Open"])),
-                         self._to_float(float(row["Low"])),
-                         self._to_float(float(row["High"])),
-                         self._to_float(float(row["Close"])),
-                         int(row["Volume"]) if not pd.isna(
-                            row["Volume"]) else 0,
-                            None,
-                            None,
-                            'yfinance')
-                        for _, row in df_final.iterrows()]
+                             AND ativo = %s;"""
 
                     self.db.executa_query(
-                        query, valores, commit=True, many=True)
-
-                    try:
-                        query = """UPDATE silver.cotacao_pregao AS p
-                                        SET media_movel_50 =
-                                 COALESCE(subquery.media_50, p.media_movel_50),
-                                            media_movel_200 = COALESCE(
-                                                subquery.media_200,
-                                 p.media_movel_200)
-                                        FROM (
-                                            SELECT datatime,
-                                                AVG(preco_fechamento)
-                                 OVER (ORDER BY datatime ROWS BETWEEN 49
-                                 PRECEDING AND CURRENT ROW) AS media_50,
-                                                AVG(preco_fechamento)
-                                 OVER (ORDER BY datatime ROWS BETWEEN 199
-                                 PRECEDING AND CURRENT ROW) AS media_200
-                                        FROM silver.cotacao_pregao
-                                        ) AS subquery
-                                        WHERE p.datatime = subquery.datatime
-                                 AND ativo = %s;"""
-
-                        self.db.executa_query(
-                            query, valores=[sigla], commit=True)
-
-                    except Exception as e:
-                        self.logger.error(
-                            (f"Não foi possível calcular as médias"
-                             f" móveis para: {tabela}, erro: {e}"))
+                        query, valores=[sigla], commit=True)
 
-                    self.logger.info(
-                        f"Valores para {tabela} obtido com sucesso.")
+                except Exception as e:
+                    self.logger.error(
+                        (f"Não foi possível calcular as médias"
+                         f" móveis para: {tabela}, erro: {e}"))
+
+                self.logger.info(
+                    f"Valores para {tabela} obtido com sucesso.")
 
             self.table_checker.register_populated(
                 camada='silver',
@@ -1,3 +1,6 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 import yfinance as yf
 from datetime import date, datetime, timedelta
 from zoneinfo import ZoneInfo
@@ -5,21 +8,106 @@ from dateutil.relativedelta import relativedelta
 import pandas as pd
 import jbridgedf as jdf
 from config.ambience import EnvConfig
-from utils.json_loader import carregar_lista_json
+from utils.config_registry import registro_config
 
 
 class ScrappIndices():
+    COLUNAS_IBOVESPA = ["data",
+                        "preco_abertura",
+                        "preco_minimo",
+                        "preco_maximo",
+                        "preco_fechamento",
+                        "volume_negociado",
+                        "media_movel_50",
+                        "media_movel_200"]
+
+    # máximo de requisições simultâneas por provedor
+    LIMITES_PROVEDOR = {
+        "bcb": 4,
+        "fred": 2,
+        "awesomeapi": 2,
+        "yahoo": 2
+    }
+
     def __init__(self,
                  logger,
                  db,
                  table_checker,
                  controle,
-                 ddl_creator):
+                 ddl_creator,
+                 concorrente=False,
+                 max_workers=8,
+                 limites_provedor=None):
         self.logger = logger
         self.db = db
         self.table_checker = table_checker
         self.controle = controle
         self.ddl_creator = ddl_creator
+        self.concorrente = concorrente
+        self.max_workers = max_workers
+
+        limites = {**self.LIMITES_PROVEDOR, **(limites_provedor or {})}
+        self._semaforos = {
+            provedor: threading.BoundedSemaphore(limite)
+            for provedor, limite in limites.items()}
+
+        # no modo concorrente só as chamadas de rede rodam em paralelo:
+        # cada worker segura esta trava, liberando-a apenas em _rede().
+        self._lock_escrita = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def _rede(self, provedor):
+        """
+        Delimita uma chamada HTTP a um provedor, respeitando o limite de
+        concorrência dele e liberando a trava de escrita enquanto espera.
+        """
+        segurando = getattr(self._local, "escrita", False)
+
+        if segurando:
+            self._lock_escrita.release()
+        try:
+            with self._semaforos[provedor]:
+                yield
+        finally:
+            if segurando:
+                self._lock_escrita.acquire()
+
+    def _worker(self, funcao, kwargs):
+        with self.db.conexao():
+            with self._lock_escrita:
+                self._local.escrita = True
+                try:
+                    return funcao(**kwargs)
+                finally:
+                    self._local.escrita = False
+
+    def _executa_tarefas(self, tarefas):
+        """
+        Executa as coletas agendadas: em sequência ou, no modo
+        concorrente, em um pool de threads com as gravações serializadas.
+        """
+        if not self.concorrente or len(tarefas) <= 1:
+            for funcao, kwargs in tarefas:
+                funcao(**kwargs)
+            return
+
+        # cada worker empresta uma conexão do pool, além da principal
+        workers = min(self.max_workers,
+                      self.db.max_conexoes - 1,
+                      len(tarefas))
+        self.logger.info(
+            f"Executando {len(tarefas)} coletas com {workers} workers...")
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futuros = [executor.submit(self._worker, funcao, kwargs)
+                       for funcao, kwargs in tarefas]
+
+            for futuro in as_completed(futuros):
+                try:
+                    futuro.result()
+                except Exception as e:
+                    self.logger.error(f"Falha em coleta concorrente: {e}")
 
     def _to_float(self, valor):
         try:
@@ -77,13 +165,15 @@ class ScrappIndices():
 
         try:
 
+            tarefas = []
+
             if self.controle == 'indices':
 
                 # busca os índices que normalmente são divulgados pela manhã
 
-                indicadores = carregar_lista_json("config/indicadores.json")
+                indicadores = registro_config.indicadores()
 
-                juros_eua = carregar_lista_json("config/juros_eua.json")
+                juros_eua = registro_config.juros_eua()
 
                 for ind in indicadores:
 
@@ -101,30 +191,21 @@ class ScrappIndices():
                             (f"Sem dados para {ind['tabela'].upper()},"
                              f" buscando primeira carga..."))
 
-                        self._atualiza_sgs_bacen(
+                    if atualizar is None or atualizar:
+
+                        tarefas.append((self._atualiza_sgs_bacen, dict(
                             codigo_sgs=ind['codigo'],
-                            hoje=False,
+                            hoje=atualizar is not None,
                             camada='silver',
                             tabela=ind['tabela'],
                             frequencia=ind['frequencia']
-                        )
-                    else:
-
-                        if atualizar:
+                        )))
 
-                            self._atualiza_sgs_bacen(
-                                codigo_sgs=ind['codigo'],
-                                hoje=True,
-                                camada='silver',
-                                tabela=ind['tabela'],
-                                frequencia=ind['frequencia']
-                            )
-
-                        else:
+                    else:
 
-                            self.logger.info(
-                                (f"Dados do {ind['tabela'].upper()},"
-                                 f" estão atualizados."))
+                        self.logger.info(
+                            (f"Dados do {ind['tabela'].upper()},"
+                             f" estão atualizados."))
 
                 for juros in juros_eua:
 
@@ -138,31 +219,21 @@ class ScrappIndices():
                         self.logger.info(
                             f"Verificando histórico de {juros['tabela']}...")
 
-                        self._atualiza_juros_eua(
+                    if atualizar is None or atualizar:
+
+                        tarefas.append((self._atualiza_juros_eua, dict(
                             serie=juros['serie'],
-                            hoje=False,
+                            hoje=atualizar is not None,
                             camada='silver',
                             tabela=juros['tabela'],
                             frequencia=juros['frequencia']
-                        )
+                        )))
 
                     else:
 
-                        if atualizar:
-
-                            self._atualiza_juros_eua(
-                                serie=juros['serie'],
-                                hoje=True,
-                                camada='silver',
-                                tabela=juros['tabela'],
-                                frequencia=juros['frequencia']
-                            )
-
-                        else:
-
-                            self.logger.info(
-                                (f"Dados para {juros['tabela']},"
-                                 f" estão atualizados."))
+                        self.logger.info(
+                            (f"Dados para {juros['tabela']},"
+                             f" estão atualizados."))
 
             else:
 
@@ -181,20 +252,17 @@ class ScrappIndices():
                     self.logger.info(
                         "Verificando histórico IBOVESPA...")
 
-                    self._atualiza_serie_ibovespa(hoje=False)
-
-                else:
+                if atualizar is None or atualizar:
 
-                    if atualizar:
+                    tarefas.append((self._atualiza_serie_ibovespa, dict(
+                        hoje=atualizar is not None)))
 
-                        self._atualiza_serie_ibovespa(hoje=True)
-
-                    else:
+                else:
 
-                        self.logger.info(
-                            "Dados para IBOVESPA, estão atualizados.")
+                    self.logger.info(
+                        "Dados para IBOVESPA, estão atualizados.")
 
-                pares_moeda = carregar_lista_json("config/moedas.json")
+                pares_moeda = registro_config.moedas()
 
                 for par in pares_moeda:
 
@@ -206,28 +274,20 @@ class ScrappIndices():
                         tabela='controle_populacao',
                         nome_serie=par['par'])
 
-                    if atualizar is None:
+                    if atualizar is None or atualizar:
 
-                        self._atualiza_cambio(
+                        tarefas.append((self._atualiza_cambio, dict(
                             par_moeda=par['par'],
                             camada='silver',
                             tabela=par['tabela'],
-                            hoje=False)
+                            hoje=atualizar is not None)))
 
                     else:
 
-                        if atualizar:
-
-                            self._atualiza_cambio(
-                                par_moeda=par['par'],
-                                camada='silver',
-                                tabela=par['tabela'],
-                                hoje=True)
-
-                        else:
+                        self.logger.info(
+                            f"Dados para {par['par']}, estão atualizados.")
 
-                            self.logger.info(
-                                f"Dados para {par['par']}, estão atualizados.")
+            self._executa_tarefas(tarefas)
 
             self.logger.info(
                 "Coleta de dados históricos efetuada com sucesso.")
@@ -248,23 +308,14 @@ class ScrappIndices():
                 data_inicial = None
                 pop_string = "Atualização do valor de fechamento IBOVESPA"
 
-                df_ibov = ibov.history(
-                    start=hoje_str, end=hoje_str, interval="1d")
+                with self._rede("yahoo"):
+                    df_ibov = ibov.history(
+                        start=hoje_str, end=hoje_str, interval="1d")
 
                 if (not df_ibov.empty
                     and df_ibov.index[-1].date() == br_time.date()
                         and df_ibov is not None):
                     linha = df_ibov.iloc[-1]
-                    query = """INSERT INTO silver.ibovespa_diario (
-                                                data,
-                                                preco_abertura,
-                                                preco_minimo,
-                                                preco_maximo,
-                                                preco_fechamento,
-                                                volume_negociado,
-                                                media_movel_50,
-                                                media_movel_200)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"""
                     valores = [(
                         linha.name.date(),
                         self._to_float(float(linha["Open"])),
@@ -277,9 +328,17 @@ class ScrappIndices():
                         None
                     )]
 
-                    self.db.executa_query(query, valores, commit=True)
+                    sucesso = self.db.upsert(
+                        "silver.ibovespa_diario",
+                        self.COLUNAS_IBOVESPA,
+                        valores,
+                        chave=["data"],
+                        atualizar=self.COLUNAS_IBOVESPA[1:6]) is not False
 
-                    sucesso = True
+                    if not sucesso:
+                        self.logger.error(
+                            "Falha ao gravar o fechamento do IBOVESPA.")
+                        return
 
                     try:
                         query = """WITH subquery AS (
@@ -331,21 +390,12 @@ class ScrappIndices():
                 data_inicial = hoje_data
                 pop_string = "Carga inicial IBOVESPA"
 
-                historico = ibov.history(period="10y")
+                with self._rede("yahoo"):
+                    historico = ibov.history(period="10y")
                 historico.index = pd.to_datetime(historico.index)
                 historico.reset_index(inplace=True)
 
                 if historico is not None and not historico.empty:
-                    query = """INSERT INTO silver.ibovespa_diario (
-                                                    data,
-                                                    preco_abertura,
-                                                    preco_minimo,
-                                                    preco_maximo,
-                                                    preco_fechamento,
-                                                    volume_negociado,
-                                                    media_movel_50,
-                                                    media_movel_200)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"""
                     valores = [
                         (row["Date"].date(),
                          self._to_float(float(row["Open"])),
@@ -358,10 +408,19 @@ class ScrappIndices():
                             None)
                         for _, row in historico.iterrows()]
 
-                    self.db.executa_query(
-                        query, valores, commit=True, many=True)
+                    sucesso = self.db.bulk_load(
+                        "silver.ibovespa_diario",
+                        self.COLUNAS_IBOVESPA,
+                        valores,
+                        staging=True,
+                        merge_sql=self.db.clausula_conflito(
+                            ["data"])) is not False
 
-                    sucesso = True
+                    if not sucesso:
+                        self.logger.error(
+                            "Falha ao gravar a carga inicial do IBOVESPA. "
+                            "Agendada para retry.")
+                        return
 
                     self.logger.info("Valores IBOVESPA obtido com sucesso.")
 
@@ -555,13 +614,14 @@ class ScrappIndices():
 
             api_client = jdf.APIDataParser(self.logger)
 
-            df_cambio = api_client.get_from_api(
-                url, ['high', 'low', 'varBid', 'pctChange',
-                      'bid', 'ask', 'timestamp'],
-                is_list=is_list,
-                convert_timestamp=True,
-                sanitize=True,
-                frequency='daily')
+            with self._rede("awesomeapi"):
+                df_cambio = api_client.get_from_api(
+                    url, ['high', 'low', 'varBid', 'pctChange',
+                          'bid', 'ask', 'timestamp'],
+                    is_list=is_list,
+                    convert_timestamp=True,
+                    sanitize=True,
+                    frequency='daily')
 
             if df_cambio is not None and not df_cambio.empty:
 
@@ -587,14 +647,11 @@ class ScrappIndices():
 
                 df_cambio.sort_values("data", inplace=True)
 
-                query = f"""INSERT INTO {camada}.{tabela}
-                (data, par_moeda, bid, ask,
-                            high, low, var_bid, pct_change,
-                            preco_medio, spread,
-                            amplitude_pct, fechamento_anterior,
-                            var_dia_real, var_dia_pct)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s,
-                            %s, %s, %s, %s, %s, %s, %s)"""
+                colunas = ["data", "par_moeda", "bid", "ask",
+                           "high", "low", "var_bid", "pct_change",
+                           "preco_medio", "spread",
+                           "amplitude_pct", "fechamento_anterior",
+                           "var_dia_real", "var_dia_pct"]
 
                 valores = []
 
@@ -615,11 +672,26 @@ class ScrappIndices():
                      None)  # var_dia_pct
                     for _, row in df_cambio.iterrows()]
 
-                if not many:
-                    if isinstance(valores, list) and len(valores) == 1:
-                        valores = valores[0]
-
-                self.db.executa_query(query, valores, commit=True, many=many)
+                if many:
+                    gravado = self.db.bulk_load(
+                        f"{camada}.{tabela}",
+                        colunas,
+                        valores,
+                        staging=True,
+                        merge_sql=self.db.clausula_conflito(["data"]))
+                else:
+                    gravado = self.db.upsert(
+                        f"{camada}.{tabela}",
+                        colunas,
+                        valores,
+                        chave=["data"],
+                        atualizar=colunas[2:8])
+
+                if gravado is False:
+                    self.logger.error(
+                        f"Falha ao gravar o par {par_moeda}. "
+                        "Agendado para retry.")
+                    return
 
                 self._recalcula_variacoes_cambio(
                     camada, tabela, hoje, hoje_data)
@@ -748,14 +820,15 @@ class ScrappIndices():
 
             api_client = jdf.APIDataParser(self.logger)
 
-            df_indice = api_client.get_from_api(
-                url, ['data', 'valor'],
-                is_list=True,
-                convert_timestamp=False,
-                sanitize=True,
-                frequency='auto',
-                http_get_timeout=http_get_timeout,
-                date_format="%d/%m/%Y")
+            with self._rede("bcb"):
+                df_indice = api_client.get_from_api(
+                    url, ['data', 'valor'],
+                    is_list=True,
+                    convert_timestamp=False,
+                    sanitize=True,
+                    frequency='auto',
+                    http_get_timeout=http_get_timeout,
+                    date_format="%d/%m/%Y")
 
             if df_indice is not None and not df_indice.empty:
 
@@ -776,16 +849,22 @@ class ScrappIndices():
                     if maior_data > data_last:
 
                         nome_tabela = f"{camada}.{tabela}"
-                        query = (f"INSERT INTO {nome_tabela}"
-                                 f" (data, valor) VALUES (%s, %s);")
                         valores = [
                             (row["data"], self._to_float(row["valor"]))
                             for _, row in df_indice.iterrows()
                             if self._to_float(row["valor"]) is not None
                         ]
 
-                        self.db.executa_query(
-                            query, valores, commit=True, many=True)
+                        if self.db.upsert(
+                                nome_tabela,
+                                ["data", "valor"],
+                                valores,
+                                chave=["data"],
+                                atualizar=["valor"]) is False:
+                            self.logger.error(
+                                f"Falha ao gravar {nome_serie}. "
+                                "Agendado para retry.")
+                            return
 
                         self.logger.info(
                             f"""{nome_serie} histórico obtido
@@ -811,16 +890,23 @@ class ScrappIndices():
 
                 else:
                     nome_tabela = f"{camada}.{tabela}"
-                    query = (f"INSERT INTO {nome_tabela}"
-                             f" (data, valor) VALUES (%s, %s);")
                     valores = [
                         (row["data"], self._to_float(row["valor"]))
                         for _, row in df_indice.iterrows()
                         if self._to_float(row["valor"]) is not None
                     ]
 
-                    self.db.executa_query(
-                        query, valores, commit=True, many=True)
+                    if self.db.bulk_load(
+                            nome_tabela,
+                            ["data", "valor"],
+                            valores,
+                            staging=True,
+                            merge_sql=self.db.clausula_conflito(
+                                ["data"])) is False:
+                        self.logger.error(
+                            f"Falha ao gravar a carga inicial de "
+                            f"{nome_serie}. Agendada para retry.")
+                        return
 
                     self.logger.info(
                         f"{nome_serie} histórico obtido e gravado com sucesso.")
@@ -925,16 +1011,17 @@ class ScrappIndices():
 
             api_client = jdf.APIDataParser(self.logger)
 
-            df_juros = api_client.get_from_api(
-                url,
-                ['date', 'value'],
-                is_list=True,
-                convert_timestamp=False,
-                sanitize=True,
-                frequency='monthly',
-                http_get_timeout=http_get_timeout,
-                data_key='observations',
-                col_freq='date')
+            with self._rede("fred"):
+                df_juros = api_client.get_from_api(
+                    url,
+                    ['date', 'value'],
+                    is_list=True,
+                    convert_timestamp=False,
+                    sanitize=True,
+                    frequency='monthly',
+                    http_get_timeout=http_get_timeout,
+                    data_key='observations',
+                    col_freq='date')
 
             if df_juros is not None and not df_juros.empty:
 
@@ -945,15 +1032,32 @@ class ScrappIndices():
                 )
 
                 nome_tabela = f"{camada}.{tabela}"
-                query = f"""INSERT INTO {nome_tabela} (data, valor)
-                VALUES (%s, %s);"""
                 valores = [
                     (row["date"].date(), self._to_float(row["value"]))
                     for _, row in df_juros.iterrows()
                     if self._to_float(row["value"]) is not None
                 ]
 
-                self.db.executa_query(query, valores, commit=True, many=True)
+                if hoje:
+                    gravado = self.db.upsert(
+                        nome_tabela,
+                        ["data", "valor"],
+                        valores,
+                        chave=["data"],
+                        atualizar=["valor"])
+                else:
+                    gravado = self.db.bulk_load(
+                        nome_tabela,
+                        ["data", "valor"],
+                        valores,
+                        staging=True,
+                        merge_sql=self.db.clausula_conflito(["data"]))
+
+                if gravado is False:
+                    self.logger.error(
+                        f"Falha ao gravar Juros ({serie}) EUA. "
+                        "Agendado para retry.")
+                    return
 
                 self.logger.info(
                     f"{serie} histórico obtido e gravado com sucesso.")
@@ -1,14 +1,21 @@
-import requests
+import hashlib
+import threading
+import time
 import numpy as np
-from datetime import date
+from calendar import monthrange
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
 from gdeltdoc import GdeltDoc, Filters
 import re
-from fuzzywuzzy import fuzz
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from datetime import datetime
-from bs4 import BeautifulSoup
 from config.ambience import EnvConfig
+from utils.config_registry import registro_config
+from analysis.indice_duplicatas import IndiceDuplicatas
+from analysis.deduplicador_titulos import DeduplicadorTitulos
+from scrapp.buscador_conteudo import BuscadorConteudo
+from scrapp.extrator_html import ExtratorHTML
 
 
 class ScrappingNoticias():
@@ -16,11 +23,25 @@ class ScrappingNoticias():
                  logger,
                  db,
                  table_checker,
-                 ddl_creator):
+                 ddl_creator,
+                 backend_html="lxml"):
         self.logger = logger
         self.db = db
         self.table_checker = table_checker
         self.ddl_creator = ddl_creator
+        self.ls_empresas = registro_config.empresas()
+
+        self.deduplicador = DeduplicadorTitulos(limite=80)
+        # sessão HTTP compartilhada, com limite de taxa por host
+        self.buscador = BuscadorConteudo(self.logger)
+        self.extrator = ExtratorHTML(self.logger, backend=backend_html)
+
+        # índice MinHash/LSH do histórico (carregado sob demanda)
+        self.indice = None
+        # textos gravados nesta execução, por id da notícia
+        self._textos_salvos = {}
+        self._lock_indice = threading.Lock()
+        self._local = threading.local()
 
     def _converter_para_nativo(df):
         """
@@ -34,19 +55,6 @@ class ScrappingNoticias():
 
         return df
 
-    def _titulos_sao_similares(self, titulo1, titulo2, limite=80):
-        try:
-            if isinstance(titulo1, str) and isinstance(titulo2, str):
-                return fuzz.token_set_ratio(titulo1.lower(),
-                                            titulo2.lower()) > limite
-
-            return False
-
-        except Exception as e:
-            self.logger.error(
-                f"Problema ao testar a similaridades dos títulos: {e}")
-            raise
-
     def _verificar_similaridade(self, noticia1, noticia2):
 
         if len(noticia1.split()) < 20 or len(noticia2.split()) < 20:
@@ -80,80 +88,186 @@ class ScrappingNoticias():
                 f"Houve um problema aoverificar a relevância da notícia {e}")
             raise
 
-    def _verificar_noticia(self, titulo, texto, noticias_salvas, empresa):
+    def _indice_duplicatas(self):
 
-        for noticia in noticias_salvas:
-            if texto == "texto_indisponivel":
-                if (
-                    self._titulos_sao_similares(titulo, noticia["titulo"])
-                    or self._verificar_relevancia(titulo, empresa)
-                ):
-                    self.logger.info(
-                        "Notícia duplicada ou não relevante encontrada:"
-                        "Ignorando...")
+        with self._lock_indice:
+            if self.indice is None:
+                indice = IndiceDuplicatas(self.logger)
+                indice.carregar(self.db)
+                self.indice = indice
+
+        return self.indice
+
+    def _textos_candidatos(self, ids):
+        """
+        Textos das notícias candidatas: os gravados nesta execução vêm
+        da memória, os demais do banco em uma única consulta.
+        """
+        textos = {i: self._textos_salvos[i]
+                  for i in ids if i in self._textos_salvos}
+        faltantes = [i for i in ids if i not in textos]
+
+        if faltantes:
+            dados = self.db.fetch_data(
+                query="""SELECT id, descricao FROM silver.noticias
+                WHERE id = ANY(%s);""",
+                valores=(faltantes,),
+                tipo_fetch="all")
+            textos.update({id_noticia: texto
+                           for id_noticia, texto in dados or []})
+
+        return textos
+
+    def _e_duplicata(self, texto, sigla, pendentes=(), limite=0.70):
+        """
+        Verifica se o texto é quase-duplicata de alguma notícia do
+        histórico da empresa: o índice LSH seleciona os candidatos e a
+        similaridade exata é calculada apenas para eles (e para os
+        textos ainda pendentes de gravação no lote).
+        """
+        if not isinstance(texto, str):
+            return False
+
+        indice = self._indice_duplicatas()
+        candidatos = indice.candidatos(indice.assinatura(texto), sigla)
+        textos = list(self._textos_candidatos(candidatos).values())
+        textos.extend(pendentes)
+
+        for texto_salvo in textos:
+            if (isinstance(texto_salvo, str)
+                    and self._verificar_similaridade(
+                        texto, texto_salvo) > limite):
+                return True
+
+        return False
+
+    def _verificar_noticia(self, titulo, texto, noticias_salvas, empresa,
+                           sigla=None):
+
+        titulos = [noticia["titulo"] for noticia in noticias_salvas]
+
+        if not all(isinstance(t, str) for t in titulos):
+            self.logger.info(
+                "Notícia com má formação ou incorreta...")
+            return False
+
+        # um único cdist contra todos os títulos já salvos no lote
+        if self.deduplicador.similares(titulo, titulos):
+            self.logger.info(
+                "Notícia duplicada encontrada: Ignorando...")
+            return False
+
+        if texto == "texto_indisponivel":
+            if self._verificar_relevancia(titulo, empresa):
+                self.logger.info(
+                    "Notícia não relevante encontrada: Ignorando...")
+                return False
+        else:
+            pendentes = [noticia["texto"] for noticia in noticias_salvas
+                         if noticia.get("pendente")]
+            if (self._verificar_relevancia(texto, empresa)
+                    or self._e_duplicata(texto, sigla, pendentes)):
+                self.logger.info(
+                    "Notícia duplicada ou não"
+                    " relevante encontrada. Ignorando...")
                 return False
-            else:
-                if (isinstance(noticia["titulo"], str)
-                        and isinstance(noticia["texto"], str)):
-                    if (self._titulos_sao_similares(titulo, noticia["titulo"])
-                        or self._verificar_similaridade(
-                        texto,
-                        noticia["texto"]) > 0.70
-                            or self._verificar_relevancia(texto, empresa)):
-                        self.logger.info(
-                            "Notícia duplicada ou não"
-                            " relevante encontrada. Ignorando...")
-                        return False
-                else:
-                    self.logger.info(
-                        "Notícia com má formação ou incorreta...")
-                    return False
 
         self.logger.info("Nova notícia armazenada.")
         return True
 
-    def _obter_texto_noticia(self, url):
+    def _hash_conteudo(self, titulo, url):
+        """
+        Hash (md5) do título e da URL normalizados: chave de
+        deduplicação de silver.noticias.
+        """
+        partes = [re.sub(r"\s+", " ", str(v or "")).strip().lower()
+                  for v in (titulo, url)]
+        return hashlib.md5("|".join(partes).encode("utf-8")).hexdigest()
 
-        if not isinstance(url, str):
-            self.logger.error(f"Erro: URL inválida recebida {url}")
-            return ""
+    def _hashes_existentes(self, sigla, hashes):
+        """
+        Resolve, em uma única consulta, quais hashes já estão gravados
+        para a empresa.
+        """
+        if not hashes:
+            return set()
 
-        texto_noticia = ""
+        dados = self.db.fetch_data(
+            query="""SELECT hash_conteudo FROM silver.noticias
+            WHERE cod_bolsa = %s AND hash_conteudo = ANY(%s);""",
+            valores=(sigla, list(hashes)),
+            tipo_fetch="all")
 
-        try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-                "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0"
-                "Safari/537.36"
-            }
-            response = requests.get(url, headers=headers)
+        return {linha[0] for linha in dados or []}
+
+    def _inserir_noticias(self, sigla, noticias):
+        """
+        Grava um lote de notícias com INSERT ... ON CONFLICT DO NOTHING
+        e indexa a assinatura MinHash das efetivamente inseridas.
+
+        Parameters
+        ----------
+        noticias : list[dict]
+            Dicionários com titulo, texto, data_historico e url.
+
+        Returns
+        -------
+            list[int] or None: ids das notícias gravadas (vazia se todas
+            já existiam), ou None em caso de erro.
+        """
+        if not noticias:
+            return []
+
+        por_hash = {self._hash_conteudo(n["titulo"], n["url"]): n
+                    for n in noticias}
+
+        linhas = self.db.upsert(
+            "silver.noticias",
+            ["cod_bolsa", "titulo", "descricao",
+             "data_historico", "url", "hash_conteudo"],
+            [(sigla, n["titulo"], n["texto"], n["data_historico"],
+              n["url"], h) for h, n in por_hash.items()],
+            chave=["cod_bolsa", "hash_conteudo"],
+            commit=False,
+            retornar="id, hash_conteudo")
+
+        if linhas is False:
+            self.logger.error(
+                f"Erro ao inserir {len(noticias)} notícias de {sigla}.")
+            return None
 
-            if response.status_code == 403 or response.status_code == 429:
-                raise Exception("Acesso bloqueado, tentando Selenium...")
+        indice = self._indice_duplicatas()
+        assinaturas = []
+        textos = {}
 
-            soup = BeautifulSoup(response.text, "html.parser")
-            container = soup.find("div", class_="article-content")
-            article_body = container.find_all("p") if container else []
+        for id_noticia, hash_conteudo in linhas:
+            texto = por_hash[hash_conteudo]["texto"]
 
-            if article_body:
-                texto_noticia = " ".join([p.get_text() for p in article_body])
-            else:
-                return "texto_indisponivel"
+            if isinstance(texto, str) and texto != "texto_indisponivel":
+                assinaturas.append(
+                    (id_noticia, indice.assinatura(texto), sigla))
+                textos[id_noticia] = texto
 
-        except Exception as e:
-            print(f"Erro ao obter o texto da notícia: {e}")
-
-        # Limpeza do texto extraído
-        if texto_noticia:
-            # Remove espaços extras
-            texto_noticia = re.sub(r"\s+", " ", texto_noticia)
-            texto_noticia = re.sub(
-                r"\b(Publicado em|Fonte|Leia mais em|Promoção|Todos os"
-                r"Direitos Reservados)\b.*",
-                "",
-                texto_noticia)
-            # Remove caracteres especiais
-            texto_noticia = re.sub(r"[^a-zA-Z0-9À-ÿ\s]", "", texto_noticia)
+        # notícias e assinaturas no mesmo commit: se as assinaturas
+        # falharem, o upsert desfaz também as notícias do lote
+        if indice.persistir(self.db, assinaturas, commit=False) is False:
+            self.logger.error(
+                f"Erro ao indexar {len(assinaturas)} notícias de {sigla}.")
+            return None
+
+        self.db.commit()
+
+        for id_noticia, assinatura, grupo in assinaturas:
+            indice.adicionar(id_noticia, assinatura, grupo)
+        self._textos_salvos.update(textos)
+
+        return [id_noticia for id_noticia, _ in linhas]
+
+    def _extrair_texto_noticia(self, html, url=None):
+        """
+        Extrai e limpa o corpo da notícia a partir do HTML já baixado.
+        """
+        texto_noticia = self.extrator.extrair(html, url)
 
         if not texto_noticia.strip():
             self.logger.error(
@@ -163,190 +277,228 @@ class ScrappingNoticias():
 
         return texto_noticia
 
-    def busca_noticias_historicas(self):
+    def _obter_texto_noticia(self, url):
 
-        # Coletar notícias históricas (somente se tabela não estiver populada)
-        self.logger.info("Vericando presença de notícias históricas... ")
+        if not isinstance(url, str):
+            self.logger.error(f"Erro: URL inválida recebida {url}")
+            return ""
 
-        try:
+        return self._extrair_texto_noticia(self.buscador.obter(url), url)
 
-            for sigla, nome in self.ls_empresas:
-                if not self.table_checker.check_populated(camada='silver',
-                                                          tabela='noticias',
-                                                          empresa=sigla,
-                                                          resposta='bool'):
+    def _meses_backfill(self, anos):
+        """
+        Primeiro dia de cada mês, do mês corrente até `anos` atrás.
+        """
+        mes = date.today().replace(day=1)
+        meses = []
 
-                    self.logger.info(
-                        f"Buscando notícias inicias para: '{nome}:{sigla}'")
-
-                    data_inicial = datetime.today().replace(day=1)
-                    data_final = data_inicial.replace(
-                        year=data_inicial.year - 10)
-
-                    while data_inicial >= data_final:
-                        start_date = data_inicial.strftime("%Y-%m-%d")
-                        from calendar import monthrange
-                        end_date = data_inicial.replace(day=monthrange(
-                            data_inicial.year, data_inicial.month)[1]). \
-                            strftime("%Y-%m-%d")
-
-                        self.logger.info(
-                            (f"Buscando notícias de"
-                             f" {start_date} até {end_date}"))
-
-                        filtros = Filters(
-                            keyword=nome,
-                            start_date=start_date,
-                            end_date=end_date,
-                            num_records=100,
-                            language='portuguese'
-                        )
-
-                        # Criar instância do cliente GDELT
-                        gdelt = GdeltDoc()
-                        # Buscar artigos que correspondem aos filtros
-                        artigos = gdelt.article_search(filtros)
-
-                        noticias_salvas = []
-                        # Exibir os resultados
-                        for artigo in artigos.itertuples():
-                            noticia = {}
-
-                            texto_noticia = self._obter_texto_noticia(
-                                artigo.url)
-
-                            if artigo.title:
-                                if (texto_noticia.strip()
-                                        and texto_noticia
-                                        != "texto_indisponivel"):
-                                    if (isinstance(artigo.title, str)
-                                        and isinstance(texto_noticia, str)
-                                            and texto_noticia != ""):
-                                        if self._verificar_noticia(
-                                                artigo.title,
-                                                texto_noticia,
-                                                noticias_salvas,
-                                                nome):
-                                            self.logger.info(
-                                                f"Título: {artigo.title}")
-                                            noticia = {
-                                                "titulo": artigo.title,
-                                                "texto": texto_noticia
-                                            }
-
-                                            query = ("""INSERT INTO
-                                                     silver.noticias
-                                                     (cod_bolsa,
-                                                     titulo,
-                                                     descricao,
-                                                     data_historico,
-                                                     url)
-                                                     VALUES
-                                                     (%s, %s, %s, %s, %s)""")
-                                            valores = (sigla,
-                                                       artigo.title,
-                                                       texto_noticia,
-                                                       datetime.strptime(
-                                                           artigo.seendate,
-                                                           '%Y%m%dT%H%M%SZ')
-                                                       .date(),
-                                                       artigo.url)
-
-                                            try:
-                                                self.db.executa_query(
-                                                    query,
-                                                    valores,
-                                                    commit=True)
-                                            except Exception as e:
-                                                self.logger.error(
-                                                    (f"Erro ao inserir"
-                                                     f" notícia:"
-                                                     f" {artigo.title}."
-                                                     f" Detalhes: {e}"))
-                                            finally:
-                                                noticias_salvas.append(noticia)
-                                else:
-                                    if isinstance(artigo.title, str):
-                                        if self._verificar_noticia(
-                                                artigo.title,
-                                                texto_noticia,
-                                                noticias_salvas,
-                                                nome):
-                                            self.logger.info(
-                                                f"Título: {artigo.title}")
-                                            noticia = {
-                                                "titulo": artigo.title,
-                                                "texto": texto_noticia
-                                            }
-
-                                            query = "INSERT INTO " \
-                                                "silver.noticias (cod_bolsa," \
-                                                "titulo, " \
-                                                "descricao, " \
-                                                "data_historico, " \
-                                                "url) " \
-                                                "VALUES (%s, %s, %s, %s, %s)"
-
-                                            valores = (sigla,
-                                                       artigo.title,
-                                                       texto_noticia,
-                                                       datetime.strptime(
-                                                           artigo.seendate,
-                                                           '%Y%m%dT%H%M%SZ').
-                                                       date(), artigo.url)
-
-                                            try:
-                                                self.db.executa_query(
-                                                    query,
-                                                    valores,
-                                                    commit=True)
-                                            except Exception as e:
-                                                self.logger.error(
-                                                    (f"Erro ao inserir"
-                                                     f" notícia: "
-                                                     f"{artigo.title}. "
-                                                     f"Detalhes: {e}"))
-                                            finally:
-                                                noticias_salvas.append(noticia)
-
-                        mes_anterior = (data_inicial.month - 1) or 12
-                        ano_atualizado = (data_inicial.year
-                                          if data_inicial.month
-                                          > 1 else
-                                          data_inicial.year - 1)
-                        data_inicial = data_inicial.replace(
-                            year=ano_atualizado, month=mes_anterior)
-
-                    query = "Select cod_bolsa " \
-                        "FROM silver.noticias " \
-                        "WHERE cod_bolsa = %s"
-                    valores = sigla
-
-                    resultado = self.db.fetch_data(
-                        self, query, valores=valores, tipo_fetch='one')
-
-                    if resultado is not None:
-
-                        hoje = date.today()
-                        self.table_checker.register_populated(
-                            self,
-                            camada='meta',
-                            tabela='controle_populacao',
-                            empresa=sigla,
-                            status=True,
-                            data_populated=hoje,
-                            observation='Carga Inicial')
+        for _ in range(anos * 12 + 1):
+            meses.append(mes)
+            mes = (mes - timedelta(days=1)).replace(day=1)
 
-                    self.logger.info(
-                        (f"Notícias históricas"
-                         f" cadastradas para '{nome}:{sigla}'..."))
-                else:
-                    self.logger.info("Notícias históricas já presentes.")
+        return meses
+
+    def _planejar_backfill(self, anos=10):
+        """
+        Divide a carga histórica em unidades (empresa, mês) e descarta
+        as já concluídas em meta.backfill_noticias (janelas 'parcial',
+        do mês então em curso, voltam ao plano).
+        """
+        concluidas = self.db.fetch_data(
+            query="""SELECT cod_bolsa, mes FROM meta.backfill_noticias
+            WHERE status = 'concluido';""",
+            tipo_fetch="all")
+
+        feitas = {(cod_bolsa, mes) for cod_bolsa, mes in concluidas or []}
+
+        # meses intercalados entre empresas: as janelas de um mesmo
+        # período são processadas juntas
+        return [(empresa, mes)
+                for mes in self._meses_backfill(anos)
+                for empresa in self.ls_empresas
+                if (empresa['ticker'], mes) not in feitas]
+
+    def _checkpoint_backfill(self, sigla, mes, status, artigos, gravados):
+        return self.db.upsert(
+            "meta.backfill_noticias",
+            ["cod_bolsa", "mes", "status", "artigos",
+             "gravados", "atualizado_em"],
+            [(sigla, mes, status, artigos, gravados, datetime.now())],
+            chave=["cod_bolsa", "mes"],
+            atualizar=["status", "artigos", "gravados", "atualizado_em"])
+
+    def _gdelt(self):
+        # um cliente por thread do pool
+        if getattr(self._local, "gdelt", None) is None:
+            self._local.gdelt = GdeltDoc()
+        return self._local.gdelt
+
+    def _processar_janela(self, empresa, mes, threads_download=None):
+        """
+        Busca, filtra e grava as notícias de uma empresa em um mês,
+        registrando o checkpoint da unidade ao final.
 
+        Returns
+        -------
+            int: número de notícias gravadas.
+
+        Raises
+        ------
+            RuntimeError: se a busca ou a gravação falhar; a unidade fica
+            com status 'erro' e é retomada na próxima execução.
+        """
+        sigla = empresa['ticker']
+        nome = empresa['tabela']
+        fim = mes.replace(day=monthrange(mes.year, mes.month)[1])
+
+        self.logger.info(
+            f"Buscando notícias de '{nome}:{sigla}' de {mes} até {fim}")
+
+        filtros = Filters(
+            keyword=nome,
+            start_date=mes.strftime("%Y-%m-%d"),
+            end_date=fim.strftime("%Y-%m-%d"),
+            num_records=100,
+            language='portuguese'
+        )
+
+        # a conexão do pool é emprestada só em volta das chamadas ao
+        # banco, não durante a busca GDELT nem os downloads
+        try:
+            artigos = self._gdelt().article_search(filtros)
         except Exception as e:
-            self.logger.error(
-                f"Houve um problema ao adquirir as notícias históricas: {e}")
-            raise
+            with self.db.conexao():
+                self._checkpoint_backfill(sigla, mes, "erro", 0, 0)
+            raise RuntimeError(f"falha na busca GDELT: {e}") from e
+
+        validos = {artigo.url: artigo
+                   for artigo in artigos.itertuples()
+                   if isinstance(artigo.title, str)
+                   and artigo.title
+                   and isinstance(artigo.url, str)}
+
+        hashes = {self._hash_conteudo(a.title, url)
+                  for url, a in validos.items()}
+        with self.db.conexao():
+            existentes = self._hashes_existentes(sigla, hashes)
+        validos = {url: a for url, a in validos.items()
+                   if self._hash_conteudo(a.title, url)
+                   not in existentes}
+
+        noticias_salvas = []
+
+        # os corpos são baixados em paralelo; cada um é
+        # parseado e deduplicado assim que chega
+        for url, html in self.buscador.buscar(
+                validos, max_workers=threads_download):
+            artigo = validos[url]
+            texto_noticia = self._extrair_texto_noticia(html, url)
+
+            with self.db.conexao():
+                nova = self._verificar_noticia(
+                    artigo.title,
+                    texto_noticia,
+                    noticias_salvas,
+                    nome,
+                    sigla)
+
+            if nova:
+                self.logger.info(f"Título: {artigo.title}")
+
+                noticias_salvas.append({
+                    "titulo": artigo.title,
+                    "texto": texto_noticia,
+                    "data_historico": datetime.strptime(
+                        artigo.seendate, '%Y%m%dT%H%M%SZ').date(),
+                    "url": url,
+                    "pendente": True
+                })
+
+        with self.db.conexao():
+            ids = self._inserir_noticias(sigla, noticias_salvas)
+
+            # lista vazia é legítima: todas já estavam gravadas
+            if ids is None:
+                self._checkpoint_backfill(
+                    sigla, mes, "erro", len(validos), 0)
+                raise RuntimeError("falha ao gravar as notícias")
+
+            # o mês corrente ainda recebe notícias: fica 'parcial' e é
+            # refeito na próxima execução
+            status = "concluido" if fim < date.today() else "parcial"
+            self._checkpoint_backfill(
+                sigla, mes, status, len(validos), len(ids))
+
+        return len(ids)
+
+    def busca_noticias_historicas(self, anos=10, max_workers=4):
+        """
+        Carga histórica (GDELT) retomável: cada unidade (empresa, mês)
+        concluída é registrada em meta.backfill_noticias, de modo que
+        uma nova execução só processa as janelas pendentes. As unidades
+        rodam em um pool de threads, cada uma com a sua conexão.
+        """
+        self.logger.info("Vericando presença de notícias históricas... ")
+
+        unidades = self._planejar_backfill(anos)
+
+        if not unidades:
+            self.logger.info("Notícias históricas já presentes.")
+            return
+
+        # cada worker empresta uma conexão do pool, além da principal;
+        # os downloads de todas as janelas dividem a mesma sessão HTTP,
+        # e o total de threads não passa do pool de conexões do buscador
+        workers = max(1, min(max_workers,
+                             self.db.max_conexoes - 1,
+                             self.buscador.max_workers,
+                             len(unidades)))
+        threads_download = max(1, self.buscador.max_workers // workers)
+
+        self.logger.info(
+            f"Backfill de notícias: {len(unidades)} janelas pendentes "
+            f"com {workers} workers...")
+
+        inicio = time.monotonic()
+        concluidas = 0
+        gravadas = 0
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futuros = {executor.submit(self._processar_janela, empresa, mes,
+                                       threads_download):
+                       (empresa['ticker'], mes)
+                       for empresa, mes in unidades}
+
+            for futuro in as_completed(futuros):
+                sigla, mes = futuros[futuro]
+                try:
+                    gravadas += futuro.result()
+                    concluidas += 1
+                except Exception as e:
+                    self.logger.error(
+                        f"Falha no backfill de {sigla} em {mes}: {e}")
+
+        decorrido = time.monotonic() - inicio
+        self.logger.info(
+            f"Backfill finalizado: {concluidas}/{len(unidades)} janelas, "
+            f"{gravadas} notícias em {decorrido:.0f}s "
+            f"({concluidas / max(decorrido, 1e-9) * 60:.1f} janelas/min).")
+
+        if concluidas < len(unidades):
+            self.logger.warning(
+                "Backfill incompleto: as janelas restantes serão "
+                "retomadas na próxima execução.")
+            return
+
+        hoje = date.today()
+        self.table_checker.register_populated(
+            camada='silver',
+            tabela='noticias',
+            nome_serie='noticias',
+            inicial=hoje,
+            data_exec=hoje,
+            prox_data=hoje,
+            obs='Carga Inicial')
 
         self.logger.info(
             "Consulta de notícias históricas finalizada com sucesso.")
@@ -355,6 +507,10 @@ class ScrappingNoticias():
 
     def buscar_noticias(self):
 
+        # no daemon a instância é reaproveitada: os textos de execuções
+        # anteriores já estão no banco
+        self._textos_salvos = {}
+
         try:
 
             for tik in self.ls_empresas:
@@ -367,81 +523,55 @@ class ScrappingNoticias():
                 url = (
                     f"https://newsapi.org/v2/everything?q={tik['tabela']}&language=pt&apiKey={API_NEWS}")
 
-                response = requests.get(url)
+                response = self.buscador.session.get(
+                    url, timeout=self.buscador.timeout)
                 data = response.json()
 
+                artigos = [artigo for artigo in
+                           data.get("articles", [])[:10]
+                           if isinstance(artigo.get("title"), str)]
+
+                # pré-checagem da página inteira em uma única consulta
+                hashes = {self._hash_conteudo(a["title"], a["url"])
+                          for a in artigos}
+                existentes = self._hashes_existentes(tik['ticker'], hashes)
+
                 noticias_salvas = []
 
-                for artigo in data.get("articles", [])[:10]:
+                for artigo in artigos:
                     titulo = artigo["title"]
                     url = artigo["url"]
                     conteudo = artigo["content"]
-                    data_pub = artigo["publishedAt"]
+
+                    if self._hash_conteudo(titulo, url) in existentes:
+                        continue
+
                     data_pub = datetime.strptime(
-                        data_pub, '%Y-%m-%dT%H:%M:%SZ').date()
-
-                    # Verificar se a notícia já está no banco
-                    query = """SELECT COUNT(*)
-                    FROM silver.noticias
-                    WHERE titulo = %s AND cod_bolsa = %s"""
-                    valores = (titulo, tik['ticker'])
-                    news = self.db.fetch_data(query, valores, tipo_fetch="one")
-
-                    if news and news[0] == 0:
-                        # verifica se a notícia não é reperida
-                        # dentro desse lote recebido.
-
-                        if len(noticias_salvas) > 0:
-
-                            if self._verificar_noticia(
-                                titulo,
-                                conteudo,
-                                noticias_salvas,
-                                tik['tabela']
-                            ):
-
-                                noticia = {
-                                    "titulo": titulo,
-                                    "texto": conteudo
-                                }
-
-                                query = "INSERT INTO silver.noticias" \
-                                    "(cod_bolsa," \
-                                    "titulo," \
-                                    "descricao," \
-                                    "data_historico," \
-                                    "url)" \
-                                    "VALUES (%s, %s, %s, %s, %s)"
-                                valores = (tik['ticker'], titulo,
-                                           conteudo, data_pub, url)
-
-                                self.db.executa_query(
-                                    query, valores, commit=True)
-
-                                print(f"Nova notícia adicionada: {titulo}")
-
-                                noticias_salvas.append(noticia)
-
-                        else:
-
-                            noticia = {
-                                "titulo": titulo,
-                                "texto": conteudo
-                            }
-
-                            query = "INSERT INTO silver.noticias" \
-                                "(cod_bolsa, titulo, descricao," \
-                                "data_historico, url)" \
-                                "VALUES (%s, %s, %s, %s, %s)"
-                            valores = (tik['ticker'], titulo,
-                                       conteudo, data_pub, url)
-
-                            self.db.executa_query(
-                                query, valores, commit=True)
-
-                            print(f"Nova notícia adicionada: {titulo}")
-
-                            noticias_salvas.append(noticia)
+                        artigo["publishedAt"], '%Y-%m-%dT%H:%M:%SZ').date()
+
+                    # verifica se a notícia não é repetida, dentro
+                    # desse lote ou no histórico da empresa.
+                    if self._verificar_noticia(
+                        titulo,
+                        conteudo,
+                        noticias_salvas,
+                        tik['tabela'],
+                        tik['ticker']
+                    ):
+
+                        noticias_salvas.append({
+                            "titulo": titulo,
+                            "texto": conteudo,
+                            "data_historico": data_pub,
+                            "url": url,
+                            "pendente": True
+                        })
+
+                ids = self._inserir_noticias(tik['ticker'], noticias_salvas)
+
+                if ids is not None:
+                    self.logger.info(
+                        f"{len(ids)} novas notícias adicionadas.")
 
                 self.logger.info(
                     (f"Novas notícias verificas"
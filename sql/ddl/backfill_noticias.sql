@@ -0,0 +1,9 @@
+CREATE TABLE IF NOT EXISTS {camada}.{tabela} (
+                cod_bolsa       TEXT NOT NULL,
+                mes             DATE NOT NULL,
+                status          TEXT NOT NULL,
+                artigos         INTEGER,
+                gravados        INTEGER,
+                atualizado_em   TIMESTAMP,
+                PRIMARY KEY (cod_bolsa, mes)
+            );
@@ -6,4 +6,42 @@ CREATE TABLE IF NOT EXISTS {camada}.{tabela} (
                 descricao TEXT,
                 data_historico DATE NOT NULL,
                 url TEXT,
-                sentimento TEXT);
\ No newline at end of file
+                sentimento TEXT,
+                hash_conteudo TEXT);
+ALTER TABLE {camada}.{tabela}
+                ADD COLUMN IF NOT EXISTS hash_conteudo TEXT;
+CREATE UNIQUE INDEX IF NOT EXISTS {tabela}_hash_conteudo_uq
+                ON {camada}.{tabela} (cod_bolsa, hash_conteudo);
+UPDATE {camada}.{tabela} AS n
+                SET hash_conteudo = h.hash_conteudo
+                FROM (
+                    SELECT DISTINCT ON (s.cod_bolsa, s.hash_conteudo)
+                        s.id, s.hash_conteudo
+                    FROM (
+                        SELECT id, cod_bolsa, md5(
+                            lower(btrim(regexp_replace(
+                                coalesce(titulo, ''), '\s+', ' ', 'g')))
+                            || '|' ||
+                            lower(btrim(regexp_replace(
+                                coalesce(url, ''), '\s+', ' ', 'g'))))
+                            AS hash_conteudo
+                        FROM {camada}.{tabela}
+                        WHERE hash_conteudo IS NULL) AS s
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM {camada}.{tabela} AS e
+                        WHERE e.cod_bolsa = s.cod_bolsa
+                        AND e.hash_conteudo = s.hash_conteudo)
+                    ORDER BY s.cod_bolsa, s.hash_conteudo, s.id) AS h
+                WHERE n.id = h.id;
+ALTER TABLE {camada}.{tabela}
+                ADD COLUMN IF NOT EXISTS sent_vader_score_titulo DOUBLE PRECISION,
+                ADD COLUMN IF NOT EXISTS sent_vader_label_titulo TEXT,
+                ADD COLUMN IF NOT EXISTS sent_lexical_score_titulo DOUBLE PRECISION,
+                ADD COLUMN IF NOT EXISTS sent_lexical_label_titulo TEXT,
+                ADD COLUMN IF NOT EXISTS sent_lexical_score_conteudo DOUBLE PRECISION,
+                ADD COLUMN IF NOT EXISTS sent_lexical_label_conteudo TEXT,
+                ADD COLUMN IF NOT EXISTS sent_bert_score_conteudo DOUBLE PRECISION,
+                ADD COLUMN IF NOT EXISTS sent_bert_label_conteudo TEXT,
+                ADD COLUMN IF NOT EXISTS sent_score_final DOUBLE PRECISION;
+CREATE INDEX IF NOT EXISTS {tabela}_sentimento_pendente_idx
+                ON {camada}.{tabela} (id) WHERE sentimento IS NULL;
\ No newline at end of file
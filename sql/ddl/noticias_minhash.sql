@@ -0,0 +1,4 @@
+CREATE TABLE IF NOT EXISTS {camada}.{tabela} (
+                id_noticia INTEGER PRIMARY KEY,
+                cod_bolsa TEXT,
+                assinatura INTEGER[] NOT NULL);
\ No newline at end of file
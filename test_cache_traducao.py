@@ -0,0 +1,95 @@
+from analysis.tradutor import TradutorCache, TradutorGoogle, TradutorLocal
+from utils.cache_disco import CacheDisco
+
+
+def _tradutor(tmp_path, traducoes=None, max_itens=100):
+    backend = TradutorLocal(traducoes)
+    cache = CacheDisco(str(tmp_path / "traducoes.sqlite"),
+                       max_itens=max_itens)
+    return TradutorCache(backend, cache=cache, tamanho_lote=2), backend
+
+
+def test_traducoes_repetidas_nao_vao_ao_backend(tmp_path):
+    tradutor, backend = _tradutor(
+        tmp_path, {"lucro recorde": "record profit", "queda": "drop"})
+
+    assert tradutor.traduzir_lote(
+        ["lucro recorde", "queda", "lucro  recorde "]) == [
+            "record profit", "drop", "record profit"]
+    assert backend.chamadas == [["lucro recorde", "queda"]]
+
+    assert tradutor.traduzir("queda") == "drop"
+    assert len(backend.chamadas) == 1
+
+
+def test_cache_persiste_entre_instancias(tmp_path):
+    tradutor, _ = _tradutor(tmp_path, {"alta": "rise"})
+    tradutor.traduzir("alta")
+
+    novo, backend = _tradutor(tmp_path)
+    assert novo.traduzir("alta") == "rise"
+    assert backend.chamadas == []
+
+
+def test_faltantes_em_lotes(tmp_path):
+    tradutor, backend = _tradutor(tmp_path)
+
+    tradutor.traduzir_lote(["a", "b", "c", "", None])
+
+    assert backend.chamadas == [["a", "b"], ["c"]]
+
+
+def test_descarte_lru(tmp_path):
+    cache = CacheDisco(str(tmp_path / "lru.sqlite"), max_itens=2)
+
+    cache.gravar("a", 1)
+    cache.gravar("b", 2)
+    cache.obter("a")
+    cache.gravar("c", 3)
+
+    assert len(cache) == 2
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+
+
+def test_leituras_adiam_a_renovacao(tmp_path):
+    cache = CacheDisco(str(tmp_path / "toques.sqlite"), max_toques=2)
+    cache.gravar("a", 1)
+    cache.gravar("b", 2)
+
+    cache.obter("a")
+    assert not cache._conn.in_transaction
+    assert list(cache._toques) == ["a"]
+
+    cache.obter_muitos(["a", "b"])
+    assert cache._toques == {}
+    assert not cache._conn.in_transaction
+
+
+class ClienteFalso():
+    def __init__(self, quebra_linhas=False):
+        self.quebra_linhas = quebra_linhas
+        self.requisicoes = []
+
+    def translate(self, texto):
+        self.requisicoes.append(texto)
+        if self.quebra_linhas:
+            texto = texto.replace("\n", " ")
+        return texto.upper()
+
+
+def test_google_une_os_textos_em_uma_requisicao():
+    cliente = ClienteFalso()
+    google = TradutorGoogle(cliente=cliente, max_caracteres=12)
+
+    assert google.traduzir_lote(["alta", "queda", "lucro recorde"]) == [
+        "ALTA", "QUEDA", "LUCRO RECORDE"]
+    assert cliente.requisicoes == ["alta\nqueda", "lucro recorde"]
+
+
+def test_google_traduz_um_a_um_se_as_linhas_nao_baterem():
+    cliente = ClienteFalso(quebra_linhas=True)
+    google = TradutorGoogle(cliente=cliente)
+
+    assert google.traduzir_lote(["alta", "queda"]) == ["ALTA", "QUEDA"]
+    assert cliente.requisicoes == ["alta\nqueda", "alta", "queda"]
@@ -0,0 +1,26 @@
+import csv
+import logging
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("psycopg2")
+
+from utils.conn_pg import PostGreSQL  # noqa: E402
+
+
+def test_ausentes_viram_nulo_e_string_vazia_e_preservada():
+    db = PostGreSQL.__new__(PostGreSQL)
+    db.logger = logging.getLogger("test_copy_csv")
+
+    dados = pd.DataFrame({
+        "a": pd.array([1, None], dtype="Int64"),
+        "b": [pd.NaT, pd.Timestamp("2024-01-02")],
+        "c": ["", float("nan")]})
+
+    buffer, total = db._linhas_para_csv(dados)
+    linhas = list(csv.reader(buffer))
+
+    assert total == 2
+    assert linhas == [["1", "\\N", ""],
+                      ["\\N", "2024-01-02 00:00:00", "\\N"]]
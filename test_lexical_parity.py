@@ -0,0 +1,101 @@
+import logging
+import re
+
+import pytest
+
+from analysis.lexical_parser import LexicalParser
+from utils.config_registry import registro_config
+
+
+class LexicalParserReferencia(LexicalParser):
+    """
+    Cópia do algoritmo original (uma regex por termo, negação e
+    inversores reavaliando o texto), usada como referência de paridade.
+    """
+
+    def _detectar_negacao(self, texto, termo):
+        negadores_regex = "|".join(map(re.escape, self.negadores))
+        padrao = rf"({negadores_regex})\s+{re.escape(termo)}"
+
+        return re.search(padrao, texto)
+
+    def _avaliar_inversao_contexto(self, texto):
+        texto = texto.lower()
+
+        for inversor in self.inversores:
+            if inversor in texto:
+                partes = texto.split(inversor, 1)
+                if len(partes) == 2:
+                    score1, _ = self.analisar_texto(partes[0])
+                    score2, _ = self.analisar_texto(partes[1])
+                    if score1 * score2 < 0:
+                        if abs(score2) > abs(score1):
+                            return 1 if score2 > 0 else -1
+        return 0
+
+    def _analise_lexica(self, texto):
+        texto = texto.lower()
+        score = 0
+
+        for termo in self.termos_positivos:
+            if re.search(rf"\b{re.escape(termo)}\b", texto):
+                score += -1 if self._detectar_negacao(texto, termo) else 1
+
+        for termo in self.termos_negativos:
+            if re.search(rf"\b{re.escape(termo)}\b", texto):
+                score += 1 if self._detectar_negacao(texto, termo) else -1
+
+        return self._classifica_label(score)
+
+    def analisar_texto(self, texto):
+        texto = texto.lower()
+        score, label = self._analise_lexica(texto)
+        adjust = self._avaliar_inversao_contexto(texto)
+        score += adjust * 0.5
+
+        return self._classifica_label(score)
+
+
+# Casos que exercitam negação, inversores, bordas de palavra e
+# termos de mais de uma palavra.
+CASOS_EXTRAS = [
+    "",
+    "Lucro recorde, porém queda nas vendas e crise no setor.",
+    "A empresa não teve lucro, mas a expansão continua.",
+    "Não   lucro; nunca prejuízo. Jamais queda, contudo alta!",
+    "Demissão em massa apesar de crescimento da dívida.",
+    "lucros altas quedas: nenhum recuo, todavia risco e volatilidade.",
+    "O resultado ficou abaixo do esperado no entanto superou expectativas.",
+    "não-lucro, (queda) [alta] mas mas mas porém porém",
+    "Crescimento, crescimento e mais crescimento; entretanto inflação.",
+]
+
+
+def _textos():
+    textos = list(CASOS_EXTRAS)
+    for noticia in registro_config.noticias_teste():
+        textos.append(noticia["titulo"])
+        textos.append(noticia["corpo"])
+        textos.append(f"{noticia['titulo']}. {noticia['corpo']}")
+    return textos
+
+
+@pytest.fixture(scope="module")
+def parsers():
+    logger = logging.getLogger("test_lexical_parity")
+    novo = LexicalParser(logger)
+    referencia = LexicalParserReferencia(logger)
+
+    # a ordem dos inversores decide a divisão: usa o mesmo conjunto
+    referencia.inversores = novo.inversores
+    assert novo.motor.inversores == list(novo.inversores)
+
+    return novo, referencia
+
+
+@pytest.mark.parametrize("texto", _textos())
+def test_motor_lexico_identico_ao_original(parsers, texto):
+    novo, referencia = parsers
+
+    assert novo.analisar_texto(texto) == referencia.analisar_texto(texto)
+    assert novo._analise_lexica(texto) == referencia._analise_lexica(texto)
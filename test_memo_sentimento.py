@@ -0,0 +1,69 @@
+import logging
+
+import pytest
+
+from analysis.tradutor import TradutorCache, TradutorLocal
+from utils.cache_disco import CacheCamadas, CacheDisco, CacheLRU
+
+
+def test_cache_em_camadas_sobe_itens_do_disco(tmp_path):
+    disco = CacheDisco(str(tmp_path / "memo.sqlite"))
+    disco.gravar("a", {"score": 1.0})
+
+    cache = CacheCamadas(CacheLRU(max_itens=1), disco)
+
+    assert cache.obter("a") == {"score": 1.0}
+    assert "a" in cache.memoria
+
+    cache.gravar("b", {"score": 2.0})
+    assert "a" not in cache.memoria
+    assert cache.obter("a") == {"score": 1.0}
+
+
+@pytest.fixture
+def analisador(tmp_path):
+    pytest.importorskip("vaderSentiment")
+    pytest.importorskip("transformers")
+
+    from analysis.lexical_parser import LexicalParser
+    from analysis.sentiment_analysis import SentimentAnalyzer
+
+    logger = logging.getLogger("test_memo_sentimento")
+
+    def criar(classe=SentimentAnalyzer):
+        tradutor = TradutorCache(
+            TradutorLocal({"Lucro recorde": "Record profit"}),
+            cache=CacheDisco(str(tmp_path / "traducoes.sqlite")))
+        memo = CacheCamadas(CacheLRU(),
+                            CacheDisco(str(tmp_path / "memo.sqlite")))
+
+        return classe(logger, db=None,
+                      lexical_parser=LexicalParser(logger),
+                      usar_bert=False, tradutor=tradutor,
+                      cache_resultados=memo)
+
+    return criar
+
+
+def test_resultado_reaproveitado(analisador, monkeypatch):
+    primeiro = analisador()
+    esperado = primeiro.analisar_noticia("Lucro recorde", "alta e lucro")
+
+    segundo = analisador()
+    monkeypatch.setattr(segundo, "_resultado_noticia",
+                        lambda *a: pytest.fail("não usou o cache"))
+
+    assert segundo.analisar_noticia(
+        "Lucro recorde", "alta e lucro") == esperado
+    assert segundo.analisar_lote(
+        [{"titulo": "Lucro recorde", "conteudo": "alta e lucro"}]) == [
+            esperado]
+
+
+def test_mudanca_nos_pesos_invalida(analisador):
+    from analysis.sentiment_analysis import SentimentAnalyzer
+
+    class OutrosPesos(SentimentAnalyzer):
+        PESOS_SEM_BERT = (0.2, 0.2, 0.6)
+
+    assert analisador().versao_memo != analisador(OutrosPesos).versao_memo
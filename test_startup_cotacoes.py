@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Orçamento de cold start (imports) do modo --cotacoes, em milissegundos.
+BUDGET_MS = int(os.getenv("COTACOES_IMPORT_BUDGET_MS", "2000"))
+
+# Dependências que o modo --cotacoes não deve carregar.
+PROIBIDOS = ("sklearn", "gdeltdoc", "bs4", "rapidfuzz", "jbridgedf",
+             "torch", "transformers", "spacy")
+
+RAIZ = Path(__file__).resolve().parent
+
+# Mesmo caminho de imports de `run_process_coletas.py --cotacoes`.
+SCRIPT = ("import run_process_coletas; "
+          "from scrapp.scrapp_cotacoes_intra import ScrappIntra")
+
+
+def _importtime():
+    """
+    Executa o script em um interpretador limpo com -X importtime e
+    devolve {modulo_topo: tempo_cumulativo_us}.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SCRIPT],
+        cwd=RAIZ, capture_output=True, text=True, timeout=120)
+
+    assert proc.returncode == 0, proc.stderr[-2000:]
+
+    tempos = {}
+    for linha in proc.stderr.splitlines():
+        if not linha.startswith("import time:") or "|" not in linha:
+            continue
+        _, cumulativo, modulo = linha[len("import time:"):].split("|")
+        if not cumulativo.strip().isdigit():
+            continue
+        nome = modulo.rstrip()
+        # só módulos de primeiro nível (sem indentação) somam o total
+        if not nome.startswith("  "):
+            tempos[nome.strip()] = int(cumulativo)
+
+    return tempos, proc.stderr
+
+
+def test_cotacoes_nao_importa_dependencias_de_outros_modos():
+    pytest.importorskip("yfinance")
+    pytest.importorskip("psycopg2")
+
+    _, relatorio = _importtime()
+    carregados = {linha.split("|")[-1].strip().split(".")[0]
+                  for linha in relatorio.splitlines()
+                  if linha.startswith("import time:")}
+
+    assert not carregados.intersection(PROIBIDOS)
+
+
+def test_cotacoes_cold_start_dentro_do_orcamento():
+    pytest.importorskip("yfinance")
+    pytest.importorskip("psycopg2")
+
+    tempos, _ = _importtime()
+    total_ms = sum(tempos.values()) / 1000
+
+    mais_lentos = sorted(tempos.items(), key=lambda t: -t[1])[:10]
+    relatorio = "\n".join(f"{us / 1000:9.1f} ms  {mod}"
+                          for mod, us in mais_lentos)
+    print(f"\nCold start --cotacoes: {total_ms:.1f} ms\n{relatorio}")
+
+    assert total_ms <= BUDGET_MS, (
+        f"Cold start de --cotacoes ({total_ms:.0f} ms) acima do "
+        f"orçamento de {BUDGET_MS} ms:\n{relatorio}")
@@ -1,12 +1,15 @@
 import spacy
 import unicodedata
 import re
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz
 from utils.json_loader import carregar_lista_json
 
 sin_dict = carregar_lista_json("config/sinonimos_empresas.json")
 base_news = carregar_lista_json("config/textos_base.json")
 
+# carregado uma única vez; só o vetor do documento é usado
+nlp = spacy.load("pt_core_news_md")
+
 
 def _limpar_texto(
     texto
@@ -37,11 +40,9 @@ def _verificar_relevancia_semantica(
     noticia_base
 ):
 
-    nlp = spacy.load("pt_core_news_md")
-
     try:
-        doc1 = nlp(noticia_nova)
-        doc2 = nlp(noticia_base)
+        doc1 = nlp.make_doc(noticia_nova)
+        doc2 = nlp.make_doc(noticia_base)
         return doc1.similarity(doc2)
     except Exception as e:
         print(
@@ -0,0 +1,115 @@
+from collections import deque
+
+
+def _e_palavra(caractere):
+    return caractere.isalnum() or caractere == "_"
+
+
+class AutomatoTermos():
+    """
+    Automato de Aho-Corasick para localizar vários termos (inclusive
+    expressões de mais de uma palavra) em uma única passada, linear no
+    tamanho do texto, independentemente da quantidade de termos.
+
+    Os termos passam por `normalizar` (se informado) na construção; o
+    texto pesquisado deve chegar já normalizado da mesma forma.
+    """
+
+    def __init__(self, termos, normalizar=None):
+        self.termos = []
+        self._transicoes = [{}]
+        self._falha = [0]
+        # índices dos termos que terminam em cada estado
+        self._saidas = [[]]
+
+        vistos = set()
+        for termo in termos:
+            if not isinstance(termo, str) or not termo.strip():
+                continue
+            termo = normalizar(termo) if normalizar else termo
+            if termo and termo not in vistos:
+                vistos.add(termo)
+                self._inserir(termo)
+
+        self._construir_falhas()
+
+    def __len__(self):
+        return len(self.termos)
+
+    def _inserir(self, termo):
+        estado = 0
+
+        for caractere in termo:
+            proximo = self._transicoes[estado].get(caractere)
+            if proximo is None:
+                proximo = len(self._transicoes)
+                self._transicoes[estado][caractere] = proximo
+                self._transicoes.append({})
+                self._falha.append(0)
+                self._saidas.append([])
+            estado = proximo
+
+        self._saidas[estado].append(len(self.termos))
+        self.termos.append(termo)
+
+    def _construir_falhas(self):
+        fila = deque(self._transicoes[0].values())
+
+        while fila:
+            estado = fila.popleft()
+
+            for caractere, proximo in self._transicoes[estado].items():
+                fila.append(proximo)
+
+                falha = self._falha[estado]
+                while falha and caractere not in self._transicoes[falha]:
+                    falha = self._falha[falha]
+
+                self._falha[proximo] = self._transicoes[falha].get(
+                    caractere, 0)
+                if self._falha[proximo] == proximo:
+                    self._falha[proximo] = 0
+
+                self._saidas[proximo] = (self._saidas[proximo]
+                                         + self._saidas[self._falha[proximo]])
+
+    def ocorrencias(self, texto, palavra_inteira=True):
+        """
+        Gera (inicio, fim, termo) de cada ocorrência, na ordem em que
+        terminam no texto. Com palavra_inteira=True, só conta termos
+        delimitados por caracteres que não sejam de palavra.
+        """
+        transicoes = self._transicoes
+        falhas = self._falha
+        saidas = self._saidas
+        tamanho = len(texto)
+        estado = 0
+
+        for fim, caractere in enumerate(texto, start=1):
+            while estado and caractere not in transicoes[estado]:
+                estado = falhas[estado]
+            estado = transicoes[estado].get(caractere, 0)
+
+            for indice in saidas[estado]:
+                termo = self.termos[indice]
+                inicio = fim - len(termo)
+
+                if palavra_inteira and (
+                        (inicio > 0 and _e_palavra(texto[inicio - 1]))
+                        or (fim < tamanho and _e_palavra(texto[fim]))):
+                    continue
+
+                yield inicio, fim, termo
+
+    def contar(self, texto, palavra_inteira=True):
+        """
+        Total de ocorrências de todos os termos no texto.
+        """
+        return sum(1 for _ in self.ocorrencias(texto, palavra_inteira))
+
+    def contem(self, texto, palavra_inteira=True):
+        """
+        True se ao menos um dos termos ocorre no texto.
+        """
+        return next(self.ocorrencias(texto, palavra_inteira),
+                    None) is not None
@@ -0,0 +1,223 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheDisco():
+    """
+    Armazenamento chave-valor em disco (SQLite) com limite de itens e
+    descarte LRU: a cada leitura o item tem o seu acesso renovado e,
+    quando o limite é ultrapassado, os menos usados são removidos.
+
+    Os valores são serializados em JSON. As renovações de acesso ficam
+    em memória e são gravadas junto com a próxima escrita (ou a cada
+    `max_toques` leituras), para que leituras não disputem o lock de
+    escrita do arquivo entre processos.
+    """
+
+    def __init__(self, caminho, max_itens=100_000, timeout=30.0,
+                 max_toques=1_000):
+        self.caminho = caminho
+        self.max_itens = max_itens
+        self.max_toques = max_toques
+        self._lock = threading.Lock()
+        self._relogio = 0
+        # chave -> acesso ainda não gravado
+        self._toques = {}
+
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+        # vários processos (ex.: o pool do backfill) dividem o arquivo:
+        # espera o lock de escrita em vez de falhar com "database is
+        # locked"
+        self._conn = sqlite3.connect(
+            caminho, timeout=timeout, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS cache (
+                chave   TEXT PRIMARY KEY,
+                valor   TEXT NOT NULL,
+                acesso  INTEGER NOT NULL
+            );""")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS cache_acesso ON cache (acesso);")
+        self._conn.commit()
+
+    def _agora(self):
+        # estritamente crescente, mesmo com chamadas no mesmo instante
+        self._relogio = max(time.time_ns(), self._relogio + 1)
+        return self._relogio
+
+    def _gravar_toques(self):
+        # chamado com o lock adquirido; o commit fica com quem chama
+        if self._toques:
+            self._conn.executemany(
+                "UPDATE cache SET acesso = ? WHERE chave = ?;",
+                [(acesso, chave) for chave, acesso in self._toques.items()])
+            self._toques = {}
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cache;").fetchone()[0]
+
+    def __contains__(self, chave):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM cache WHERE chave = ?;",
+                (chave,)).fetchone() is not None
+
+    def obter_muitos(self, chaves):
+        """
+        Retorna {chave: valor} das chaves presentes, renovando o acesso
+        (gravado de forma adiada).
+        """
+        chaves = list(dict.fromkeys(chaves))
+        encontrados = {}
+
+        with self._lock:
+            # o SQLite limita o número de parâmetros por consulta
+            for i in range(0, len(chaves), 500):
+                parte = chaves[i:i + 500]
+                marcadores = ", ".join("?" * len(parte))
+                linhas = self._conn.execute(
+                    f"SELECT chave, valor FROM cache "
+                    f"WHERE chave IN ({marcadores});", parte).fetchall()
+                encontrados.update(
+                    {chave: json.loads(valor) for chave, valor in linhas})
+
+            if encontrados:
+                agora = self._agora()
+                self._toques.update(dict.fromkeys(encontrados, agora))
+
+                if len(self._toques) >= self.max_toques:
+                    self._gravar_toques()
+                    self._conn.commit()
+
+        return encontrados
+
+    def obter(self, chave, padrao=None):
+        return self.obter_muitos([chave]).get(chave, padrao)
+
+    def gravar_muitos(self, itens):
+        """
+        Grava {chave: valor} e descarta os itens menos usados se o
+        limite for ultrapassado.
+        """
+        if not itens:
+            return
+
+        with self._lock:
+            self._gravar_toques()
+            agora = self._agora()
+            self._conn.executemany(
+                """INSERT INTO cache (chave, valor, acesso)
+                VALUES (?, ?, ?)
+                ON CONFLICT (chave) DO UPDATE SET
+                    valor = excluded.valor,
+                    acesso = excluded.acesso;""",
+                [(chave, json.dumps(valor, ensure_ascii=False), agora)
+                 for chave, valor in itens.items()])
+
+            excedente = self._conn.execute(
+                "SELECT COUNT(*) FROM cache;").fetchone()[0] - self.max_itens
+            if excedente > 0:
+                self._conn.execute(
+                    """DELETE FROM cache WHERE chave IN (
+                        SELECT chave FROM cache
+                        ORDER BY acesso LIMIT ?);""", (excedente,))
+
+            self._conn.commit()
+
+    def gravar(self, chave, valor):
+        self.gravar_muitos({chave: valor})
+
+    def fechar(self):
+        with self._lock:
+            self._gravar_toques()
+            self._conn.commit()
+            self._conn.close()
+
+
+class CacheLRU():
+    """
+    Cache em memória com limite de itens e descarte LRU.
+    """
+
+    def __init__(self, max_itens=10_000):
+        self.max_itens = max_itens
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._itens)
+
+    def __contains__(self, chave):
+        return chave in self._itens
+
+    def obter_muitos(self, chaves):
+        encontrados = {}
+
+        with self._lock:
+            for chave in chaves:
+                if chave in self._itens:
+                    self._itens.move_to_end(chave)
+                    encontrados[chave] = self._itens[chave]
+
+        return encontrados
+
+    def obter(self, chave, padrao=None):
+        return self.obter_muitos([chave]).get(chave, padrao)
+
+    def gravar_muitos(self, itens):
+        with self._lock:
+            for chave, valor in itens.items():
+                self._itens[chave] = valor
+                self._itens.move_to_end(chave)
+
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def gravar(self, chave, valor):
+        self.gravar_muitos({chave: valor})
+
+
+class CacheCamadas():
+    """
+    Memória (LRU) na frente de um armazenamento persistente: leituras
+    consultam primeiro a memória e só as faltantes vão ao disco; os
+    itens achados no disco sobem para a memória.
+    """
+
+    def __init__(self, memoria, disco):
+        self.memoria = memoria
+        self.disco = disco
+
+    def obter_muitos(self, chaves):
+        chaves = list(dict.fromkeys(chaves))
+        encontrados = self.memoria.obter_muitos(chaves)
+
+        faltantes = [c for c in chaves if c not in encontrados]
+        if faltantes:
+            do_disco = self.disco.obter_muitos(faltantes)
+            self.memoria.gravar_muitos(do_disco)
+            encontrados.update(do_disco)
+
+        return encontrados
+
+    def obter(self, chave, padrao=None):
+        return self.obter_muitos([chave]).get(chave, padrao)
+
+    def gravar_muitos(self, itens):
+        if not itens:
+            return
+        self.memoria.gravar_muitos(itens)
+        self.disco.gravar_muitos(itens)
+
+    def gravar(self, chave, valor):
+        self.gravar_muitos({chave: valor})
@@ -0,0 +1,155 @@
+import json
+import os
+import threading
+from pathlib import Path
+from utils.utils import logging
+
+
+class RegistroConfig():
+    """
+    Registro de configuração compartilhado pelo processo.
+
+    Cada arquivo JSON de `config/` é lido uma única vez e mantido em
+    memória; a cada acesso só o mtime/tamanho do arquivo é conferido,
+    e ele é relido apenas se tiver mudado. Estruturas derivadas (ex.: a
+    lista combinada de tickers intradiários) são recalculadas somente
+    quando algum arquivo de origem muda.
+
+    Os objetos retornados são compartilhados: não devem ser modificados.
+    """
+
+    def __init__(self, base_dir="config"):
+        self.base_dir = Path(base_dir)
+        self._lock = threading.RLock()
+        self._arquivos = {}
+        self._derivados = {}
+
+    def _versao(self, caminho):
+        st = os.stat(caminho)
+        return (st.st_mtime_ns, st.st_size)
+
+    def obter(self, nome_arquivo):
+        """
+        Retorna o conteúdo (já parseado) de um arquivo de configuração.
+        """
+        caminho = self.base_dir / nome_arquivo
+
+        with self._lock:
+            try:
+                versao = self._versao(caminho)
+            except OSError as e:
+                logging.error(
+                    f"""Não foi possível extrair os dados do
+                    aquivo:{caminho}, erro: {e}""")
+                return None
+
+            em_cache = self._arquivos.get(nome_arquivo)
+            if em_cache is not None and em_cache[0] == versao:
+                return em_cache[1]
+
+            try:
+                with open(caminho, 'r', encoding='utf-8') as f:
+                    dados = json.load(f)
+            except Exception as e:
+                logging.error(
+                    f"""Não foi possível extrair os dados do
+                    aquivo:{caminho}, erro: {e}""")
+                return em_cache[1] if em_cache else None
+
+            self._arquivos[nome_arquivo] = (versao, dados)
+            return dados
+
+    def _derivado(self, nome, arquivos, construir):
+        """
+        Memoiza uma estrutura derivada de um ou mais arquivos, refazendo-a
+        apenas quando algum deles mudar.
+        """
+        with self._lock:
+            fontes = [self.obter(arquivo) for arquivo in arquivos]
+            chave = tuple(self._arquivos[a][0] if a in self._arquivos
+                          else None for a in arquivos)
+
+            em_cache = self._derivados.get(nome)
+            if em_cache is not None and em_cache[0] == chave:
+                return em_cache[1]
+
+            valor = construir(*fontes)
+            self._derivados[nome] = (chave, valor)
+            return valor
+
+    def recarregar(self, forcar=False):
+        """
+        Hot-reload: confere todos os arquivos já carregados e relê somente
+        os que mudaram (ou todos, com forcar=True).
+        """
+        with self._lock:
+            if forcar:
+                self._arquivos.clear()
+                self._derivados.clear()
+                return
+
+            for nome_arquivo in list(self._arquivos):
+                self.obter(nome_arquivo)
+
+    # -- acessores tipados
+
+    def schemas(self) -> list:
+        return self.obter("schemas.json") or []
+
+    def empresas(self) -> list:
+        return self.obter("empresas.json") or []
+
+    def sinonimos(self) -> dict:
+        return self.obter("sinonimos_empresas.json") or {}
+
+    def sinonimos_empresa(self, ticker) -> list:
+        return self.sinonimos().get(ticker, [])
+
+    def textos_base(self) -> dict:
+        return self.obter("textos_base.json") or {}
+
+    def noticias_teste(self) -> list:
+        return self.obter("noticias_teste.json") or []
+
+    def indicadores(self) -> list:
+        return self.obter("indicadores.json") or []
+
+    def juros_eua(self) -> list:
+        return self.obter("juros_eua.json") or []
+
+    def moedas(self) -> list:
+        return self.obter("moedas.json") or []
+
+    def perfis_extracao(self) -> dict:
+        return self.obter("perfis_extracao.json") or {}
+
+    def lexico(self) -> dict:
+        """
+        Léxico de sentimento: {categoria: frozenset(termos)}.
+        """
+        return self._derivado(
+            "lexico",
+            ["palavras.json"],
+            lambda termos: {qual: frozenset(lista)
+                            for qual, lista in (termos or {}).items()})
+
+    def tickers_intra(self) -> list:
+        """
+        Lista combinada dos ativos da coleta intradiária: empresas,
+        moedas, índices globais, commodities, cripto e títulos.
+        """
+        arquivos = ["empresas.json",
+                    "moedas_intra.json",
+                    "indices_globais_intra.json",
+                    "commodities_intra.json",
+                    "crypto_intra.json",
+                    "titles_intra.json"]
+
+        return self._derivado(
+            "tickers_intra",
+            arquivos,
+            lambda *listas: [tik for lista in listas for tik in lista or []])
+
+
+# instância única do processo
+registro_config = RegistroConfig()
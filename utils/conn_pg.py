@@ -1,5 +1,13 @@
+import csv
+import io
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import pandas as pd
 import psycopg2
 import psycopg2.extras
+import psycopg2.pool
 
 
 class PostGreSQL():
@@ -10,27 +18,91 @@ class PostGreSQL():
                  host="192.168.0.212",
                  # host="localhost",
                  port="5432",
-                 logger=None):
+                 logger=None,
+                 min_conexoes=1,
+                 max_conexoes=8,
+                 page_size=1000):
         self.dbname = dbname
         self.user = user
         self.password = password
         self.host = host
         self.port = port
         self.logger = logger
+        self.min_conexoes = min_conexoes
+        self.max_conexoes = max_conexoes
+        self.page_size = page_size
+        self.pool = None
         self.conn = None
         self.cursor = None
 
-    def conectar(self):
-        try:
-            self.logger.info(
-                "Conectando com o PostgreSQL...")
-            self.conn = psycopg2.connect(
+        # conexão "emprestada" do pool por thread (ver conexao())
+        self._local = threading.local()
+        # protege a conexão principal quando usada por várias threads
+        self._lock = threading.RLock()
+        # faz a retirada aguardar uma vaga em vez de estourar o pool
+        self._vagas = threading.BoundedSemaphore(max_conexoes)
+
+    def _criar_pool(self):
+        if self.pool is None or self.pool.closed:
+            self.pool = psycopg2.pool.ThreadedConnectionPool(
+                self.min_conexoes,
+                self.max_conexoes,
                 dbname=self.dbname,
                 user=self.user,
                 password=self.password,
                 host=self.host,
                 port=self.port
             )
+        return self.pool
+
+    def _conexao_saudavel(self, conn):
+        """
+        Health check executado a cada retirada de conexão do pool.
+        """
+        if conn is None or conn.closed:
+            return False
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1;")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _retirar_conexao(self):
+        """
+        Retira uma conexão saudável do pool, descartando (e substituindo)
+        as que tiverem caído.
+        """
+        pool = self._criar_pool()
+        self._vagas.acquire()
+
+        try:
+            for _ in range(self.max_conexoes + 1):
+                conn = pool.getconn()
+                if self._conexao_saudavel(conn):
+                    return conn
+                self.logger.warning(
+                    "Conexão inválida encontrada no pool: descartando...")
+                pool.putconn(conn, close=True)
+        except Exception:
+            self._vagas.release()
+            raise
+
+        self._vagas.release()
+        raise psycopg2.OperationalError(
+            "Não foi possível obter uma conexão válida do pool.")
+
+    def _devolver_conexao(self, conn, close=False):
+        self.pool.putconn(conn, close=close)
+        self._vagas.release()
+
+    def conectar(self):
+        try:
+            self.logger.info(
+                "Conectando com o PostgreSQL...")
+            self._criar_pool()
+            self.conn = self._retirar_conexao()
             self.cursor = self.conn.cursor(
                 cursor_factory=psycopg2.extras.DictCursor)
             self.logger.info(
@@ -40,43 +112,412 @@ class PostGreSQL():
             self.logger.error(f"Erro ao conectar ao PostgreSQL: {e}")
             return None, None
 
+    def _reconectar(self):
+        """
+        Substitui a conexão em uso (principal ou da thread) após
+        um OperationalError.
+        """
+        self.logger.warning("Reconectando ao PostgreSQL...")
+
+        local = getattr(self._local, "conn", None)
+
+        if local is not None:
+            self._devolver_conexao(local, close=True)
+            self._local.conn = self._retirar_conexao()
+            self._local.cursor = self._local.conn.cursor(
+                cursor_factory=psycopg2.extras.DictCursor)
+            return
+
+        if self.conn is not None and self.pool is not None:
+            self._devolver_conexao(self.conn, close=True)
+        self.conn = self._retirar_conexao()
+        self.cursor = self.conn.cursor(
+            cursor_factory=psycopg2.extras.DictCursor)
+
+    @contextmanager
+    def conexao(self):
+        """
+        Empresta uma conexão do pool para a thread atual.
+
+        Enquanto o bloco estiver aberto, executa_query/fetch_data
+        chamados nesta thread usam a conexão emprestada, permitindo
+        workers concorrentes sem abrir um socket por tarefa.
+
+        Uso
+        ---
+            with db.conexao() as (conn, cursor):
+                db.executa_query(...)
+        """
+        if getattr(self._local, "conn", None) is not None:
+            # conexão já emprestada (chamada aninhada): reaproveita.
+            yield self._local.conn, self._local.cursor
+            return
+
+        conn = self._retirar_conexao()
+        self._local.conn = conn
+        self._local.cursor = conn.cursor(
+            cursor_factory=psycopg2.extras.DictCursor)
+        try:
+            yield self._local.conn, self._local.cursor
+        except Exception:
+            if not self._local.conn.closed:
+                self._local.conn.rollback()
+            raise
+        finally:
+            conn = self._local.conn
+            self._local.cursor.close()
+            self._local.conn = None
+            self._local.cursor = None
+            self._devolver_conexao(conn, close=bool(conn.closed))
+
+    def _em_uso(self):
+        """
+        Retorna (conn, cursor, lock) da thread atual: a conexão
+        emprestada via conexao(), ou a principal (protegida por lock).
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn, self._local.cursor, nullcontext()
+        return self.conn, self.cursor, self._lock
+
     def fechar_conexao(self):
         self.logger.info(
             "Fechando conexões...")
         if self.cursor:
             self.cursor.close()
-        if self.conn:
+        if self.pool is not None and not self.pool.closed:
+            self.pool.closeall()
+            self.logger.info("Conexão com PostgreSQL fechada.")
+        elif self.conn:
             self.conn.close()
             self.logger.info("Conexão com PostgreSQL fechada.")
 
-    def executa_query(self, query, valores=None, commit=False, many=False):
+    def commit(self):
+        conn, _, lock = self._em_uso()
+        with lock:
+            conn.commit()
+
+    def executa_query(self, query, valores=None, commit=False, many=False,
+                      _tentativa=0):
+        conn, cursor, lock = self._em_uso()
+
         try:
-            if valores:
-                if many:
-                    self.cursor.executemany(query, valores)
-                else:
-                    self.cursor.execute(query, valores)
-            elif not many:
-                self.cursor.execute(query)
+            with lock:
+                if valores:
+                    if many:
+                        cursor.executemany(query, valores)
+                    else:
+                        cursor.execute(query, valores)
+                elif not many:
+                    cursor.execute(query)
 
-            if commit:
-                self.conn.commit()
+                if commit:
+                    conn.commit()
 
             return True
 
         except psycopg2.OperationalError as e:
             self.logger.error(f"Erro de conexão ao executar a query: {e}")
+            if _tentativa == 0 and conn.closed:
+                self._reconectar()
+                return self.executa_query(
+                    query, valores, commit, many, _tentativa=1)
             return False
         except psycopg2.ProgrammingError as e:
-            self.conn.rollback()
+            conn.rollback()
             self.logger.error(f"Erro de sintaxe SQL: {e}")
             return False
         except psycopg2.Error as e:
-            self.conn.rollback()
+            conn.rollback()
             self.logger.error(f"Erro geral do banco de dados: {e}")
             return False
 
-    def fetch_data(self, query, valores=None, tipo_fetch=None, n_linhas=0):
+    # marcador de NULL do COPY: '' fica livre para string vazia
+    NULO_COPY = "\\N"
+
+    def _linhas_para_csv(self, dados):
+        """
+        Serializa as linhas (tuplas ou DataFrame) em um buffer CSV
+        em memória, no formato esperado pelo COPY. Valores ausentes
+        (None, NaN, pd.NA, pd.NaT) viram o marcador NULO_COPY.
+        """
+        if hasattr(dados, "itertuples"):
+            linhas = dados.itertuples(index=False, name=None)
+        else:
+            linhas = dados
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        total = 0
+
+        for linha in linhas:
+            writer.writerow(
+                self.NULO_COPY if pd.api.types.is_scalar(v) and pd.isna(v)
+                else v
+                for v in linha)
+            total += 1
+
+        buffer.seek(0)
+        return buffer, total
+
+    def clausula_conflito(self, chave, atualizar=None):
+        """
+        Monta a cláusula ON CONFLICT para upserts e merges.
+
+        Parameters
+        ----------
+        chave : list[str]
+            Colunas da chave primária/única.
+        atualizar : list[str], optional
+            Colunas a atualizar em caso de conflito. Se vazio,
+            as linhas conflitantes são ignoradas (DO NOTHING).
+        """
+        alvo = ", ".join(chave)
+
+        if not atualizar:
+            return f"ON CONFLICT ({alvo}) DO NOTHING"
+
+        sets = ", ".join(f"{c} = EXCLUDED.{c}" for c in atualizar)
+        return f"ON CONFLICT ({alvo}) DO UPDATE SET {sets}"
+
+    def upsert(self, tabela, colunas, dados, chave, atualizar=None,
+               page_size=None, commit=True, retornar=None):
+        """
+        Grava linhas de forma idempotente com INSERT ... ON CONFLICT,
+        enviadas em páginas via execute_values.
+
+        Parameters
+        ----------
+        tabela : str
+            Tabela destino, qualificada pelo schema.
+        colunas : list[str]
+            Colunas destino, na mesma ordem dos valores das linhas.
+        dados : list[tuple] or pandas.DataFrame
+            Linhas a serem gravadas.
+        chave : list[str]
+            Colunas da chave primária/única usadas no ON CONFLICT.
+        atualizar : list[str], optional
+            Colunas atualizadas em caso de conflito (DO UPDATE).
+            Se omitido, reexecuções viram no-ops (DO NOTHING).
+        page_size : int, optional
+            Linhas por página do execute_values (padrão: self.page_size).
+        commit : bool, default=True
+            Faz commit ao final da gravação.
+        retornar : str, optional
+            Expressão do RETURNING (ex.: 'id'); as linhas efetivamente
+            gravadas são devolvidas no lugar da contagem.
+
+        Returns
+        -------
+        int, list or bool
+            Número de linhas enviadas (ou as linhas do RETURNING),
+            ou False em caso de erro.
+        """
+        if hasattr(dados, "itertuples"):
+            dados = list(dados.itertuples(index=False, name=None))
+        else:
+            dados = list(dados)
+
+        if not dados:
+            return 0
+
+        conn, cursor, lock = self._em_uso()
+
+        query = (f"INSERT INTO {tabela} ({', '.join(colunas)}) VALUES %s "
+                 f"{self.clausula_conflito(chave, atualizar)}")
+
+        if retornar:
+            query += f" RETURNING {retornar}"
+
+        try:
+            with lock:
+                linhas = psycopg2.extras.execute_values(
+                    cursor, query, dados,
+                    page_size=page_size or self.page_size,
+                    fetch=bool(retornar))
+
+                if commit:
+                    conn.commit()
+
+            return linhas if retornar else len(dados)
+
+        except psycopg2.Error as e:
+            if not conn.closed:
+                conn.rollback()
+            self.logger.error(f"Erro no upsert para {tabela}: {e}")
+            return False
+
+    def bulk_load(self, tabela, colunas, dados, staging=False,
+                  merge_sql="", commit=True):
+        """
+        Carrega linhas em massa via COPY FROM STDIN.
+
+        Parameters
+        ----------
+        tabela : str
+            Tabela destino, qualificada pelo schema (ex.: 'silver.selic').
+        colunas : list[str]
+            Colunas destino, na mesma ordem dos valores das linhas.
+        dados : list[tuple] or pandas.DataFrame
+            Linhas a serem carregadas.
+        staging : bool, default=False
+            Se True, carrega em uma tabela temporária e faz o merge
+            na tabela destino com INSERT ... SELECT.
+        merge_sql : str, optional
+            Cláusula acrescentada ao INSERT do merge
+            (ex.: clausula_conflito(...)). Só usada com staging.
+        commit : bool, default=True
+            Faz commit ao final da carga.
+
+        Returns
+        -------
+        int or bool
+            Número de linhas carregadas, ou False em caso de erro.
+        """
+        conn, cursor, lock = self._em_uso()
+        inicio = time.perf_counter()
+        buffer, total = self._linhas_para_csv(dados)
+
+        if total == 0:
+            return 0
+
+        lista_colunas = ", ".join(colunas)
+
+        try:
+            with lock:
+                if staging:
+                    temporaria = "tmp_" + tabela.split(".")[-1]
+                    cursor.execute(
+                        f"""CREATE TEMP TABLE IF NOT EXISTS {temporaria}
+                        (LIKE {tabela} INCLUDING DEFAULTS)
+                        ON COMMIT DROP;""")
+                    destino = temporaria
+                else:
+                    destino = tabela
+
+                cursor.copy_expert(
+                    f"""COPY {destino} ({lista_colunas})
+                    FROM STDIN WITH (FORMAT csv, NULL '{self.NULO_COPY}')""",
+                    buffer)
+
+                if staging:
+                    cursor.execute(
+                        f"""INSERT INTO {tabela} ({lista_colunas})
+                        SELECT {lista_colunas} FROM {temporaria}
+                        {merge_sql};""")
+                    cursor.execute(f"DROP TABLE IF EXISTS {temporaria};")
+
+                if commit:
+                    conn.commit()
+
+            duracao = time.perf_counter() - inicio
+            self.logger.info(
+                f"Carga em massa de {total} linhas em {tabela}: "
+                f"{duracao:.2f}s ({total / max(duracao, 1e-9):.0f} linhas/s)")
+
+            return total
+
+        except psycopg2.Error as e:
+            if not conn.closed:
+                conn.rollback()
+            self.logger.error(
+                f"Erro na carga em massa para {tabela}: {e}")
+            return False
+
+    def atualizar_lote(self, tabela, colunas, dados, chave, tipos=None,
+                       page_size=None, commit=True):
+        """
+        Atualiza várias linhas em uma única operação baseada em conjunto:
+        UPDATE ... FROM (VALUES ...), enviado em páginas via
+        execute_values.
+
+        Parameters
+        ----------
+        tabela : str
+            Tabela destino, qualificada pelo schema.
+        colunas : list[str]
+            Colunas das linhas; as que não estão em `chave` são
+            atualizadas.
+        dados : list[tuple]
+            Linhas, na ordem de `colunas`.
+        chave : list[str]
+            Colunas usadas para casar as linhas com a tabela.
+        tipos : dict, optional
+            Tipo SQL por coluna (ex.: {'id': 'integer'}), aplicado como
+            cast nos VALUES; evita que colunas só com NULL virem text.
+        commit : bool, default=True
+            Faz commit ao final da gravação.
+
+        Returns
+        -------
+        int or bool
+            Número de linhas enviadas, ou False em caso de erro.
+        """
+        dados = list(dados)
+
+        if not dados:
+            return 0
+
+        tipos = tipos or {}
+        conn, cursor, lock = self._em_uso()
+
+        template = "(" + ", ".join(
+            f"%s::{tipos[c]}" if c in tipos else "%s" for c in colunas) + ")"
+        sets = ", ".join(f"{c} = v.{c}" for c in colunas if c not in chave)
+        condicao = " AND ".join(f"t.{c} = v.{c}" for c in chave)
+
+        query = (f"UPDATE {tabela} AS t SET {sets} "
+                 f"FROM (VALUES %s) AS v ({', '.join(colunas)}) "
+                 f"WHERE {condicao}")
+
+        try:
+            with lock:
+                psycopg2.extras.execute_values(
+                    cursor, query, dados, template=template,
+                    page_size=page_size or self.page_size)
+
+                if commit:
+                    conn.commit()
+
+            return len(dados)
+
+        except psycopg2.Error as e:
+            if not conn.closed:
+                conn.rollback()
+            self.logger.error(
+                f"Erro na atualização em lote de {tabela}: {e}")
+            return False
+
+    @contextmanager
+    def cursor_servidor(self, query, valores=None, nome="cursor_servidor",
+                        itersize=None):
+        """
+        Cursor nomeado (server-side) em uma conexão dedicada do pool,
+        para ler resultados grandes em blocos sem trazê-los inteiros para
+        a memória. Como a conexão é separada, gravações feitas durante a
+        leitura (e seus commits) não fecham o cursor.
+
+        Uso
+        ---
+            with db.cursor_servidor(query) as cursor:
+                while bloco := cursor.fetchmany(500):
+                    ...
+        """
+        conn = self._retirar_conexao()
+        cursor = conn.cursor(name=nome)
+        cursor.itersize = itersize or self.page_size
+
+        try:
+            cursor.execute(query, valores)
+            yield cursor
+        finally:
+            if not conn.closed:
+                cursor.close()
+                conn.rollback()
+            self._devolver_conexao(conn, close=bool(conn.closed))
+
+    def fetch_data(self, query, valores=None, tipo_fetch=None, n_linhas=0,
+                   _tentativa=0):
         """
         Executes a SELECT query using the current cursor and 
         fetches the result.
@@ -98,6 +539,7 @@ class PostGreSQL():
             The fetched data, or None/list if nothing is returned.
         """
         dados = None
+        conn, cursor, lock = self._em_uso()
 
         try:
             if tipo_fetch not in ("one", "many", "all"):
@@ -107,23 +549,24 @@ class PostGreSQL():
                 raise ValueError(
                     "Se tipo_fetch == 'many', n_linhas deve ser > que 0")
 
-            if valores:
-                self.cursor.execute(query, valores)
-            else:
-                self.cursor.execute(query)
-
-            if tipo_fetch == "one":
-                dados = self.cursor.fetchone()
-                if not dados:
-                    return None
-            elif tipo_fetch == "many":
-                dados = self.cursor.fetchmany(n_linhas)
-                if not dados:
-                    return []
-            elif tipo_fetch == "all":
-                dados = self.cursor.fetchall()
-                if not dados:
-                    return []
+            with lock:
+                if valores:
+                    cursor.execute(query, valores)
+                else:
+                    cursor.execute(query)
+
+                if tipo_fetch == "one":
+                    dados = cursor.fetchone()
+                    if not dados:
+                        return None
+                elif tipo_fetch == "many":
+                    dados = cursor.fetchmany(n_linhas)
+                    if not dados:
+                        return []
+                elif tipo_fetch == "all":
+                    dados = cursor.fetchall()
+                    if not dados:
+                        return []
 
             if not dados:
                 self.logger.info(
@@ -132,5 +575,12 @@ class PostGreSQL():
 
             return dados
 
+        except psycopg2.OperationalError as e:
+            self.logger.error(f"Erro de conexão ao obter os dados: {e}")
+            if _tentativa == 0 and conn.closed:
+                self._reconectar()
+                return self.fetch_data(
+                    query, valores, tipo_fetch, n_linhas, _tentativa=1)
         except psycopg2.Error as e:
             self.logger.error(f"Erro ao obter os dados: {e}")
+
@@ -1,4 +1,6 @@
-from utils.json_loader import carregar_lista_json
+import hashlib
+import threading
+from utils.config_registry import registro_config
 from datetime import datetime
 
 
@@ -11,12 +13,28 @@ class TableChecker():
         self.db = db
         self.ddl_creator = ddl_creator
 
-    def table_writer(self, camada="", tabela="", sql_file=""):
+        # cache de meta.controle_populacao (ver carregar_controle)
+        self._controle = None
+        self._pendentes = {}
+        self._lock_controle = threading.Lock()
+
+    # comentário do schema 'meta' que guarda a versão do DDL aplicado
+    PREFIXO_FINGERPRINT = "schema_fingerprint:"
+
+    COLUNAS_CONTROLE = ["schema_nome",
+                        "tabela_nome",
+                        "nome_serie",
+                        "carga_inicial",
+                        "ultima_execucao",
+                        "proxima_execucao",
+                        "observacao"]
+
+    def _render_ddl(self, camada="", tabela="", sql_file=""):
         """
-            Renderiza e executa um template SQL com os parâmetros fornecidos.
+            Renderiza um template SQL com os parâmetros fornecidos.
 
             Args:
-                 camada (str): Schema destino (obrigatório).
+                camada (str): Schema destino (obrigatório).
                 sql_file (str): Caminho relativo ao template SQL (obrigatório).
                 tabela (str): Nome da tabela, se aplicável (opcional).
         """
@@ -34,104 +52,139 @@ class TableChecker():
         if tabela:
             params["tabela"] = tabela
 
-        query = self.ddl_creator.render_template(template, **params)
-        self.db.executa_query(query, commit=True)
-
-    def check_tables(self):
-
-        try:
-
-            self.logger.info(
-                "Iniciando verificação das tabelas e SCHEMAS...")
-
-            # -- Criação dos Schemas
-
-            ls_schemas = carregar_lista_json("config/schemas.json")
-
-            for schema in ls_schemas:
-
-                self.logger.info(
-                    f"Criando/verificando schema: {schema}")
-
-                self.table_writer(
-                    camada=schema,
-                    sql_file="schema.sql")
+        return self.ddl_creator.render_template(template, **params)
 
-            # Cotação diária Moedas
+    def table_writer(self, camada="", tabela="", sql_file=""):
+        """
+            Renderiza e executa um template SQL com os parâmetros fornecidos.
 
-            ls_moedas = carregar_lista_json("config/moedas.json")
+            Args:
+                 camada (str): Schema destino (obrigatório).
+                sql_file (str): Caminho relativo ao template SQL (obrigatório).
+                tabela (str): Nome da tabela, se aplicável (opcional).
+        """
 
-            for moeda in ls_moedas:
+        query = self._render_ddl(camada, tabela, sql_file)
+        self.db.executa_query(query, commit=True)
 
-                self.logger.info(
-                    f"Criando/verificando tabela: silver.{moeda['tabela']}")
-                self.table_writer(
+    def _ddl_esperado(self):
+        """
+        Monta a lista (descrição, SQL renderizado) de todos os schemas
+        e tabelas que o projeto espera encontrar no banco.
+        """
+        ddls = []
+
+        # -- Criação dos Schemas
+        for schema in registro_config.schemas():
+            ddls.append((f"schema: {schema}", self._render_ddl(
+                camada=schema,
+                sql_file="schema.sql")))
+
+        # -- Controle de população das séries
+        ddls.append(("tabela: meta.controle_populacao", self._render_ddl(
+            camada="meta",
+            tabela="controle_populacao",
+            sql_file="pop_control.sql")))
+
+        # -- Checkpoints da carga histórica de notícias
+        ddls.append(("tabela: meta.backfill_noticias", self._render_ddl(
+            camada="meta",
+            tabela="backfill_noticias",
+            sql_file="backfill_noticias.sql")))
+
+        # Cotação diária Moedas
+        for moeda in registro_config.moedas():
+            ddls.append((
+                f"tabela: silver.{moeda['tabela']}", self._render_ddl(
                     camada="silver",
                     tabela=moeda["tabela"],
-                    sql_file="cotacao_diaria.sql")
+                    sql_file="cotacao_diaria.sql")))
+
+        # INDICES/INDICADORES e JUROS EUA
+        for indices in (registro_config.indicadores(),
+                        registro_config.juros_eua()):
+            for indice in indices:
+                ddls.append((
+                    f"tabela: silver.{indice['tabela']}", self._render_ddl(
+                        camada="silver",
+                        tabela=indice["tabela"],
+                        sql_file="indice.sql")))
+
+        # -- Tabela: Ibovespa (índice diário de fechamento)
+        # NOTICIAS e Cotações INTRA DIARIO
+        for tabela, sql_file in (
+                ("ibovespa_diario", "ibovespa_diario.sql"),
+                ("noticias", "noticias.sql"),
+                ("noticias_minhash", "noticias_minhash.sql"),
+                ("cotacao_intra_diario", "cotacao_intra_diario.sql")):
+            ddls.append((f"tabela: silver.{tabela}", self._render_ddl(
+                camada="silver",
+                tabela=tabela,
+                sql_file=sql_file)))
 
-            # INDICES/INDICADORES
+        # Versões gold:(tabelas preparadas, normalizadas
+        # e prontas para consumo/ML)
+        ddls.append(("tabela: gold.macro_indicadores", self._render_ddl(
+            camada="gold",
+            tabela="macro_indicadores",
+            sql_file="macro_indicadores.sql")))
 
-            ls_indices = carregar_lista_json("config/indicadores.json")
+        return ddls
 
-            for indice in ls_indices:
+    def fingerprint(self, ddls):
+        """
+        Hash (sha256) do conjunto de DDL renderizado.
+        """
+        conteudo = "\n".join(query for _, query in ddls)
+        return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
 
-                self.logger.info(
-                    f"Criando/verificando tabela: silver.{indice['tabela']}")
-                self.table_writer(
-                    camada="silver",
-                    tabela=indice["tabela"],
-                    sql_file="indice.sql")
+    def _fingerprint_gravado(self):
+        """
+        Lê, em uma única consulta ao catálogo, o fingerprint gravado
+        no comentário do schema 'meta' (None se o schema não existir).
+        """
+        resultado = self.db.fetch_data(
+            query="""SELECT obj_description(
+                        to_regnamespace('meta'), 'pg_namespace');""",
+            tipo_fetch="one")
 
-            # JUROS EUA
+        comentario = resultado[0] if resultado else None
 
-            ls_juros = carregar_lista_json("config/juros_eua.json")
+        if comentario and comentario.startswith(self.PREFIXO_FINGERPRINT):
+            return comentario[len(self.PREFIXO_FINGERPRINT):]
+        return None
 
-            for indice in ls_juros:
+    def check_tables(self):
 
-                self.logger.info(
-                    f"Criando/verificando tabela: silver.{indice['tabela']}")
-                self.table_writer(
-                    camada="silver",
-                    tabela=indice["tabela"],
-                    sql_file="indice.sql")
+        try:
 
-            # -- Tabela: Ibovespa (índice diário de fechamento)
             self.logger.info(
-                "Criando/verificando tabela: silver.ibovespa_diario")
-
-            self.table_writer(
-                camada="silver",
-                tabela="ibovespa_diario",
-                sql_file="ibovespa_diario.sql")
+                "Iniciando verificação das tabelas e SCHEMAS...")
 
-            # NOTICIAS
-            self.logger.info(
-                "Criando/verificando tabela: silver.noticias")
+            ddls = self._ddl_esperado()
+            versao = self.fingerprint(ddls)
 
-            self.table_writer(
-                camada="silver",
-                tabela="noticias",
-                sql_file="noticias.sql")
+            if self._fingerprint_gravado() == versao:
+                self.logger.info(
+                    f"Schema na versão {versao[:12]}: nada a fazer.")
+                return
 
-            # Cotações INTRA DIARIO
             self.logger.info(
-                "Criando/verificando tabela: silver.cotacao_intra_diario")
+                f"Aplicando DDL (versão {versao[:12]}) em uma transação...")
 
-            self.table_writer(
-                camada="silver",
-                tabela="cotacao_intra_diario",
-                sql_file="cotacao_intra_diario.sql")
+            for descricao, query in ddls:
 
-            # Versões gold:(tabelas preparadas, normalizadas
-            # e prontas para consumo/ML)
-            self.logger.info(
-                "Criando/verificando tabela: gold.macro_indicadores")
+                self.logger.info(f"Criando/verificando {descricao}")
+
+                if not self.db.executa_query(query):
+                    raise RuntimeError(
+                        f"Falha ao aplicar o DDL de {descricao}")
 
-            self.table_writer(
-                camada="gold",
-                tabela="macro_indicadores",
-                sql_file="macro_indicadores.sql")
+            if not self.db.executa_query(
+                    "COMMENT ON SCHEMA meta IS %s;",
+                    valores=(self.PREFIXO_FINGERPRINT + versao,),
+                    commit=True):
+                raise RuntimeError("Falha ao gravar a versão do schema")
 
             self.logger.info(
                 "Tabelas e SCHEMAS verificadas com sucesso!")
@@ -190,6 +243,17 @@ class TableChecker():
         self.logger.info(
             f"Atualizando informações sobre população para {camada}.{tabela}")
 
+        valores = (camada, tabela, nome_serie, inicial,
+                   data_exec, prox_data, obs)
+
+        with self._lock_controle:
+            if self._controle is not None:
+                # modo em lote: atualiza o cache e adia a gravação
+                # para flush_registros().
+                self._controle[nome_serie] = prox_data
+                self._pendentes[(camada, tabela)] = valores
+                return True
+
         query = """
                 INSERT INTO meta.controle_populacao (
                 schema_nome,
@@ -207,9 +271,6 @@ class TableChecker():
                     observacao = EXCLUDED.observacao;
                """
 
-        valores = (camada, tabela, nome_serie, inicial,
-                   data_exec, prox_data, obs)
-
         try:
             self.db.executa_query(query, valores=valores, commit=True)
             self.logger.info(
@@ -237,6 +298,13 @@ class TableChecker():
             return: bool or None
         """
 
+        with self._lock_controle:
+            if self._controle is not None:
+                proxima_execucao = self._controle.get(nome_serie)
+                if proxima_execucao is None:
+                    return None
+                return datetime.today().date() >= proxima_execucao
+
         query = f"""SELECT proxima_execucao
         FROM {camada}.{tabela} WHERE nome_serie = %s;"""
         valores = (nome_serie,)
@@ -257,3 +325,65 @@ class TableChecker():
                 f"""Falha ao validar população
                 de {camada}.{tabela}. Detalhes: {e}""")
             return None
+
+    def carregar_controle(self):
+        """
+        Carrega meta.controle_populacao inteira em memória, em uma única
+        consulta. A partir daí last_pop responde pelo cache e
+        register_populated acumula as gravações até flush_registros().
+        """
+
+        dados = self.db.fetch_data(
+            query="""SELECT nome_serie, proxima_execucao
+            FROM meta.controle_populacao;""",
+            tipo_fetch="all")
+
+        if dados is None:
+            self.logger.warning(
+                "Não foi possível carregar o controle de população: "
+                "usando consultas por série.")
+            return False
+
+        with self._lock_controle:
+            self._controle = {
+                nome_serie: proxima for nome_serie, proxima in dados}
+            # registros ainda não gravados prevalecem sobre o banco
+            for valores in self._pendentes.values():
+                self._controle[valores[2]] = valores[5]
+
+        self.logger.info(
+            f"Controle de população carregado: {len(dados)} séries.")
+        return True
+
+    def flush_registros(self):
+        """
+        Grava todos os registros de população acumulados em um único
+        upsert em meta.controle_populacao.
+        """
+
+        with self._lock_controle:
+            pendentes = list(self._pendentes.values())
+            self._pendentes = {}
+
+        if not pendentes:
+            return True
+
+        gravados = self.db.upsert(
+            "meta.controle_populacao",
+            self.COLUNAS_CONTROLE,
+            pendentes,
+            chave=["schema_nome", "tabela_nome"],
+            atualizar=["proxima_execucao", "ultima_execucao", "observacao"])
+
+        if gravados is False:
+            with self._lock_controle:
+                for valores in pendentes:
+                    self._pendentes.setdefault(
+                        (valores[0], valores[1]), valores)
+            self.logger.error(
+                "Erro ao gravar os registros de população em lote.")
+            return False
+
+        self.logger.info(
+            f"{gravados} registros de população gravados em lote.")
+        return True